@@ -3,8 +3,6 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "openai>=1.0.0",
-#     "pydub>=0.25.1",
-#     "audioop-lts>=0.2.1; python_version>='3.13'",
 # ]
 # ///
 
@@ -23,17 +21,38 @@ Verfügbare Stimmen (gpt-4o-mini-tts):
 Anforderungen: siehe ../Anforderungen/fruehsport-audio.md
 """
 
+import argparse
 import asyncio
+import bisect
+import contextlib
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import json
+import math
+import mmap
+import multiprocessing
+import os
 import random
 import re
 import shutil
+import struct
+import subprocess
 import sys
+import tempfile
+import threading
 import time
+import unicodedata
+import weakref
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-
-from openai import AsyncOpenAI
-from pydub import AudioSegment
+from typing import BinaryIO
 
 
 def format_duration(seconds: float) -> str:
@@ -54,7 +73,7 @@ def format_size(bytes_: int) -> str:
 
 
 def check_ffmpeg() -> None:
-    """Prüft ob ffmpeg installiert ist (benötigt von pydub)."""
+    """Prüft ob ffmpeg installiert ist (benötigt für das Zusammenfügen abweichender Formate)."""
     if shutil.which("ffmpeg") is None:
         print("FEHLER: ffmpeg ist nicht installiert.")
         print()
@@ -69,7 +88,23 @@ def check_ffmpeg() -> None:
 
 # Konfiguration
 MAX_CHUNK_SIZE = 4000  # OpenAI TTS Limit
-CONCURRENT_REQUESTS = 5  # Maximale parallele API-Anfragen
+SPEECH_CHARS_PER_SECOND = 15  # Geschätztes Sprechtempo: Zeichen Text je Sekunde Audio
+CONCURRENT_REQUESTS = 5  # Start-Nebenläufigkeit der API-Anfragen (wächst/schrumpft adaptiv)
+MAX_CONCURRENT_REQUESTS = 20  # Obergrenze der adaptiven Nebenläufigkeit
+REQUESTS_PER_MINUTE = 500  # Token-Bucket: API-Anfragen pro Minute
+CHARS_PER_MINUTE = 500_000  # Token-Bucket: Textzeichen pro Minute
+MAX_RETRIES = 6  # Wiederholungen je Chunk bei 429/5xx/Verbindungsfehlern
+BACKOFF_BASE_SECONDS = 1.0  # Exponentielles Backoff: Basis ...
+BACKOFF_MAX_SECONDS = 60.0  # ... und Obergrenze je Wartezeit
+MP3_BITRATE = "96k"  # Bitrate, wenn neu kodiert wird (abweichende Formate, PCM-Pipeline)
+VBR_QUALITY = "V5"  # LAME-VBR-Stufe für mp3-vbr (V0 = beste, V9 = kleinste)
+PCM_SAMPLE_RATE = 24000  # OpenAI "pcm": roh, 24 kHz, 16 bit signed little-endian, mono
+PCM_CHANNELS = 1
+WRITE_QUEUE_SIZE = 8  # Gleichzeitige Datei-Schreibvorgänge in Threads; weitere warten (Gegendruck)
+WATCH_DEBOUNCE_SECONDS = 2.0  # Watch-Modus: so lange Ruhe nach der letzten Änderung, bevor generiert wird
+WATCH_POLL_SECONDS = 1.0  # Watch-Modus ohne inotify: Abstand der stat-Durchläufe
+WORKSPACE_MAX_MEMORY_MB = 256  # Zwischen-Audio eines Laufs im Speicher; darüber Auslagerung auf Platte
+MANIFEST_VERSION = 1  # Format der Sidecar-Manifeste neben den Ausgabedateien
 DEFAULT_VOICE = "nova"  # Standard-Stimme (nur bei Skripten mit #VOICE-Direktiven, für Text vor der ersten Direktive)
 VALID_VOICES = {"alloy", "ash", "ballad", "coral", "echo", "fable", "nova", "onyx", "sage", "shimmer", "verse", "marin", "cedar"}
 PRIMARY_MODEL = "gpt-4o-mini-tts"
@@ -78,18 +113,80 @@ FALLBACK_MODEL = "tts-1"
 # Pfade relativ zum Script
 SCRIPT_DIR = Path(__file__).parent
 SKRIPTE_DIR = SCRIPT_DIR.parent / "Skripte"
+TTS_CACHE_DIR = SCRIPT_DIR.parent / "Cache" / "tts"  # Gemeinsamer Audio-Cache über alle Skripte und Läufe
+TTS_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # Größenlimit, darüber LRU-Verdrängung
+INCLUDE_CACHE_DIR = SCRIPT_DIR.parent / "Cache" / "includes"  # Includes, einmal auf PCM normalisiert
+METRICS_FILE = SCRIPT_DIR.parent / "Logs" / "fruehsport-audio-metriken.jsonl"  # Messwerte aller Läufe (JSONL)
+COST_PER_AUDIO_MINUTE_USD = 0.015  # Richtwert von OpenAI für gpt-4o-mini-tts; für den Trockenlauf
+PLAN_LATENCY_SECONDS = (1.0, 0.5)  # Trockenlauf ohne Messwerte: angenommene Latenz = a + b je 1000 Zeichen
+
+# Regex für alle Direktiven in einem Durchlauf (benannte Gruppe = Art der Direktive):
+# #START (alles darüber wird ignoriert, z.B. Materiallisten), #PAUSE X, #INCLUDE datei, #VOICE name
+DIRECTIVE_PATTERN = re.compile(
+    r"^#(?:(?P<start>START)|PAUSE\s+(?P<pause>\d+)|INCLUDE\s+(?P<include>.+?)|VOICE\s+(?P<voice>\w+))\s*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+# Vorab-Suche, ob (und wo) #START bzw. #VOICE vorkommen, ohne das Skript zu zerlegen
+START_PATTERN = re.compile(r"^#START\s*$", re.MULTILINE | re.IGNORECASE)
+VOICE_PATTERN = re.compile(r"^#VOICE\s+\w+\s*$", re.MULTILINE | re.IGNORECASE)
 
-# Regex für Pause-Anweisung
-PAUSE_PATTERN = re.compile(r"^#PAUSE\s+(\d+)\s*$", re.MULTILINE | re.IGNORECASE)
 
-# Regex für Include-Anweisung
-INCLUDE_PATTERN = re.compile(r"^#INCLUDE\s+(.+?)\s*$", re.MULTILINE | re.IGNORECASE)
+@dataclass(frozen=True)
+class OutputCodec:
+    """Ein wählbarer Ausgabe-Codec für die abschließende Kodierung."""
+    encoder: str  # ffmpeg-Encoder
+    suffix: str  # Dateiendung der Ausgabe
+    container: str  # ffmpeg-Muxer
+    vbr: bool = False  # Rate ist eine Qualitätsstufe ("V5") statt einer Bitrate
 
-# Regex für Voice-Anweisung
-VOICE_PATTERN = re.compile(r"^#VOICE\s+(\w+)\s*$", re.MULTILINE | re.IGNORECASE)
+    def ffmpeg_args(self, rate: str) -> list[str]:
+        quality = ["-q:a", rate.lstrip("Vv")] if self.vbr else ["-b:a", rate]
+        return ["-c:a", self.encoder, *quality, "-f", self.container]
 
-# Regex für Start-Marker (alles darüber wird ignoriert, z.B. Materiallisten)
-START_PATTERN = re.compile(r"^#START\s*$", re.MULTILINE | re.IGNORECASE)
+
+OUTPUT_CODECS = {
+    "mp3": OutputCodec("libmp3lame", ".mp3", "mp3"),
+    "mp3-vbr": OutputCodec("libmp3lame", ".mp3", "mp3", vbr=True),
+    "opus": OutputCodec("libopus", ".opus", "ogg"),
+    "aac": OutputCodec("aac", ".m4a", "ipod"),
+}
+
+
+@dataclass(frozen=True)
+class AudioSettings:
+    """Internes Zwischenformat und Ausgabe-Codec einer Generierung.
+
+    ``internal_format="mp3"``: TTS liefert MP3, gleiche Formate werden
+    frame-genau ohne Neukodierung zusammengefügt. ``"pcm"``: TTS liefert
+    rohes PCM, alles bleibt bis zur Ausgabe unkomprimiert und wird genau
+    einmal mit ``codec``/``bitrate`` kodiert.
+
+    ``extra_outputs`` sind weitere Formate als ``(codec, rate)``, die aus
+    demselben PCM-Strom entstehen (z.B. Opus fürs Telefon neben MP3).
+    Maßgeblich für Manifest und "bereits konvertiert" ist ``codec``.
+
+    ``chunk_chars``/``chunk_seconds`` begrenzen die Größe der TTS-Chunks;
+    kleinere Chunks laufen parallel und senken die Latenz langer Segmente.
+    """
+    internal_format: str = "mp3"
+    codec: str = "mp3"
+    bitrate: str = MP3_BITRATE
+    chunk_chars: int = MAX_CHUNK_SIZE
+    chunk_seconds: float | None = None
+    extra_outputs: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def suffix(self) -> str:
+        return OUTPUT_CODECS[self.codec].suffix
+
+    @property
+    def outputs(self) -> tuple[tuple[str, str], ...]:
+        """Alle Ausgabeformate als ``(codec, rate)``, das primäre zuerst."""
+        return ((self.codec, self.bitrate), *self.extra_outputs)
+
+    @property
+    def suffixes(self) -> tuple[str, ...]:
+        return tuple(OUTPUT_CODECS[codec].suffix for codec, _ in self.outputs)
 
 
 @dataclass
@@ -109,275 +206,2561 @@ def get_md_files() -> list[Path]:
     return sorted(SKRIPTE_DIR.glob("*.md"))
 
 
-def get_missing_mp3s(md_files: list[Path]) -> list[Path]:
-    """Filtert MD-Dateien, die noch keine zugehörige MP3 haben."""
+def get_missing_mp3s(md_files: list[Path], suffixes: tuple[str, ...] = (".mp3",)) -> list[Path]:
+    """Filtert MD-Dateien, denen mindestens eine zugehörige Audiodatei (``suffixes``) fehlt."""
     missing = []
     for md_file in md_files:
-        mp3_file = md_file.with_suffix(".mp3")
-        if not mp3_file.exists():
+        if not all(md_file.with_suffix(suffix).exists() for suffix in suffixes):
             missing.append(md_file)
     return missing
 
 
-def parse_script(text: str, default_voice: str = DEFAULT_VOICE) -> list[Segment]:
-    """Parst ein Skript und extrahiert Text-Segmente, Pausen und Includes."""
-    segments: list[Segment] = []
+class ScriptTokenizer:
+    """Zerlegt ein Skript in einem Durchlauf in Segmente (Text, Pausen, Includes).
+
+    Alle Direktiven werden mit einem einzigen Regex-Durchlauf gefunden; die
+    Segmente entstehen lazy, sodass die Synthese beginnen kann, bevor ein
+    großes Skript fertig geparst ist. Ob es ein ``#START`` und danach eine
+    ``#VOICE``-Direktive gibt, klärt vorab je eine Regex-Suche — so steht die
+    Stimme für Text vor der ersten Direktive (``initial_voice``) von Anfang
+    an fest, und nur Text vor dem ``#START`` wird zurückgehalten (und verworfen).
+
+    ``has_voice`` sagt, ob das Skript eine ``#VOICE``-Direktive enthält.
+    """
+
+    def __init__(self, text: str, default_voice: str = DEFAULT_VOICE, fallback_voice: str | None = None) -> None:
+        self.text = text
+        self.default_voice = default_voice
+        self.fallback_voice = fallback_voice
+        self.has_voice = False
+        self.warnings: list[str] = []
+
+    @property
+    def initial_voice(self) -> str:
+        """Stimme für Text vor der ersten #VOICE-Direktive (bzw. für das ganze Skript ohne)."""
+        if self.has_voice or self.fallback_voice is None:
+            return self.default_voice
+        return self.fallback_voice
+
+    def __iter__(self) -> Iterator[Segment]:
+        text = self.text
+        first_start = START_PATTERN.search(text)
+        self.has_voice = VOICE_PATTERN.search(text, first_start.end() if first_start else 0) is not None
+        voice = self.initial_voice
+        pending: list[Segment] = []  # bis zum ersten #START zurückgehalten
+        started = first_start is None
+        current_voice: str | None = None  # None: noch keine #VOICE-Direktive, also Standardstimme
+        pos = 0
+        for m in DIRECTIVE_PATTERN.finditer(text):
+            kind = m.lastgroup
+            if kind == "start" and not started:
+                # Alles vor dem ersten #START verwerfen, inkl. dort gesehener Direktiven
+                started = True
+                pending.clear()
+                self.warnings.clear()
+                current_voice = None
+                pos = m.end()
+                continue
+
+            text_before = text[pos:m.start()].strip()
+            if text_before:
+                pending.append(Segment(content=text_before, is_pause=False, voice=current_voice or voice))
+            pos = m.end()
+
+            if kind == "pause":
+                if (seconds := int(m.group("pause"))) > 0:
+                    pending.append(Segment(content=seconds, is_pause=True))
+            elif kind == "include":
+                pending.append(Segment(content=m.group("include"), is_pause=False, is_include=True))
+            elif kind == "voice":  # ein weiteres #START trennt nur Text
+                current_voice = m.group("voice").lower()
+                if current_voice not in VALID_VOICES:
+                    self.warnings.append(f"Unbekannte Stimme '{current_voice}', verwende '{self.default_voice}'")
+                    current_voice = self.default_voice
+
+            if started:
+                yield from pending
+                pending.clear()
+
+        remaining = text[pos:].strip()
+        if remaining:
+            pending.append(Segment(content=remaining, is_pause=False, voice=current_voice or voice))
+        yield from pending
 
-    # Falls #START vorhanden, nur den Teil danach verwenden
-    start_match = START_PATTERN.search(text)
-    if start_match:
-        text = text[start_match.end():]
-
-    # Alle Direktiven mit Positionen finden
-    directives = []
-    for m in PAUSE_PATTERN.finditer(text):
-        directives.append((m.start(), m.end(), "pause", int(m.group(1))))
-    for m in INCLUDE_PATTERN.finditer(text):
-        directives.append((m.start(), m.end(), "include", m.group(1)))
-    for m in VOICE_PATTERN.finditer(text):
-        voice_name = m.group(1).lower()
-        if voice_name not in VALID_VOICES:
-            print(f"    WARNUNG: Unbekannte Stimme '{voice_name}', verwende '{default_voice}'")
-            voice_name = default_voice
-        directives.append((m.start(), m.end(), "voice", voice_name))
-    directives.sort(key=lambda x: x[0])
-
-    # Text zwischen Direktiven verarbeiten
-    current_voice = default_voice
-    pos = 0
-    for start, end, dtype, value in directives:
-        text_before = text[pos:start].strip()
-        if text_before:
-            segments.append(Segment(content=text_before, is_pause=False, voice=current_voice))
-
-        if dtype == "pause":
-            if value > 0:
-                segments.append(Segment(content=value, is_pause=True))
-        elif dtype == "include":
-            segments.append(Segment(content=value, is_pause=False, is_include=True))
-        elif dtype == "voice":
-            current_voice = value
-
-        pos = end
-
-    # Restlicher Text nach der letzten Direktive
-    remaining = text[pos:].strip()
-    if remaining:
-        segments.append(Segment(content=remaining, is_pause=False, voice=current_voice))
 
+def parse_script(text: str, default_voice: str = DEFAULT_VOICE) -> list[Segment]:
+    """Parst ein Skript vollständig und extrahiert Text-Segmente, Pausen und Includes."""
+    tokenizer = ScriptTokenizer(text, default_voice)
+    segments = list(tokenizer)
+    for warning in tokenizer.warnings:
+        print(f"    WARNUNG: {warning}")
     return segments
 
 
-def split_text_into_chunks(text: str) -> list[str]:
-    """Teilt langen Text in Chunks auf (max. 4000 Zeichen)."""
-    if len(text) <= MAX_CHUNK_SIZE:
-        return [text]
-
-    paragraphs = text.split("\n\n")
-    chunks = []
-    current_chunk = ""
-
-    for paragraph in paragraphs:
-        if len(paragraph) > MAX_CHUNK_SIZE:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-            # Paragraph in Sätze aufteilen
-            sentences = paragraph.replace(". ", ".\n").split("\n")
-            for sentence in sentences:
-                if len(current_chunk) + len(sentence) + 1 > MAX_CHUNK_SIZE:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                    current_chunk = sentence + " "
-                else:
-                    current_chunk += sentence + " "
-        elif len(current_chunk) + len(paragraph) + 2 > MAX_CHUNK_SIZE:
-            chunks.append(current_chunk.strip())
-            current_chunk = paragraph + "\n\n"
+# Kandidaten für Satzenden: Satzzeichen (plus schließende Anführungszeichen/Klammern) vor
+# Leerraum, oder eine Leerzeile (Absatz)
+SENTENCE_END_PATTERN = re.compile(r"[.!?…]+[\"'»«“”‘’)\]]*(?=\s)|\n[ \t]*\n")
+
+# Nebensatzgrenzen für den Notfall-Split überlanger Sätze
+CLAUSE_PATTERN = re.compile(r"[,;:–—](?=\s)|\s-\s")
+
+# Abkürzungen, nach deren Punkt kein Satz endet (kleingeschrieben, ohne Punkt);
+# einzelne Buchstaben ("z. B.", "d. h.") und Zahlen ("3. Mai") gelten immer als Abkürzung
+GERMAN_ABBREVIATIONS = frozenset({
+    "abb", "abs", "allg", "bspw", "bzgl", "bzw", "ca", "dr", "evtl", "fr", "ggf", "ggfs", "hr", "inkl",
+    "jh", "kap", "max", "min", "mio", "mrd", "nr", "prof", "sek", "sog", "std", "str", "tel", "vgl",
+    "wdh", "zzgl", "zb", "dh", "ua", "uä", "usw", "etc",
+})
+
+
+def _is_sentence_end(text: str, match: re.Match) -> bool:
+    """Ob ein Kandidat aus ``SENTENCE_END_PATTERN`` wirklich ein Satzende ist."""
+    punctuation = match.group()
+    if punctuation[0] in "\n!?":
+        return True
+    if punctuation[0] == "." and not punctuation.startswith(".."):
+        # Wort vor dem Punkt (begrenzter Rückblick, damit der Scan linear bleibt)
+        before = text[max(0, match.start() - 12):match.start()].split()
+        word = before[-1].lstrip("(\"'»«“„‘").replace(".", "").lower() if before else ""
+        if len(word) <= 1 or word.isdigit() or word in GERMAN_ABBREVIATIONS:
+            return False
+    # Nach einem echten Satzende (auch nach Auslassungspunkten) geht es nicht kleingeschrieben weiter
+    following = text[match.end():match.end() + 8].lstrip()
+    return not following[:1].islower()
+
+
+def split_text_into_chunks(text: str, max_chars: int = MAX_CHUNK_SIZE, max_seconds: float | None = None) -> list[str]:
+    """Teilt langen Text an Satzgrenzen in möglichst volle Chunks auf.
+
+    Die Grenze ist ``max_chars`` bzw., falls kleiner, die für ``max_seconds``
+    geschätzte Textmenge (``SPEECH_CHARS_PER_SECOND``). Satzenden erkennen
+    deutsche Abkürzungen, Ordinalzahlen und !/?; ein Satz, der allein zu lang
+    ist, wird an einer Nebensatzgrenze, sonst an Leerraum, notfalls hart
+    geteilt. Linear in der Textlänge: Chunks sind Ausschnitte des Originals.
+    """
+    limit = max_chars
+    if max_seconds is not None:
+        limit = min(limit, int(max_seconds * SPEECH_CHARS_PER_SECOND))
+    limit = max(1, limit)
+    text = text.strip()
+    if len(text) <= limit:
+        return [text] if text else []
+
+    # Kandidaten einmal per Regex sammeln; geprüft wird nur vom Fensterende rückwärts,
+    # bis ein echtes Satzende gefunden ist
+    candidates = list(SENTENCE_END_PATTERN.finditer(text))
+    boundaries = [m.start() if m.group().startswith("\n") else m.end() for m in candidates]
+    chunks: list[str] = []
+    start = 0
+    while len(text) - start > limit:
+        window_end = start + limit
+        # Letzte Satzgrenze im Fenster: so voll wie möglich packen
+        cut = None
+        i = bisect.bisect_right(boundaries, window_end) - 1
+        while i >= 0 and boundaries[i] > start:
+            if _is_sentence_end(text, candidates[i]):
+                cut = boundaries[i]
+                break
+            i -= 1
+        if cut is None:
+            cut = _hard_split(text, start, window_end, limit)
+        chunk = text[start:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = cut
+        while start < len(text) and text[start].isspace():
+            start += 1
+    rest = text[start:].strip()
+    if rest:
+        chunks.append(rest)
+    return chunks
+
+
+def _hard_split(text: str, start: int, window_end: int, limit: int) -> int:
+    """Schnittstelle für einen Satz, der nicht in einen Chunk passt."""
+    # Nebensatzgrenze in der zweiten Hälfte des Fensters, damit keine Mini-Chunks entstehen
+    clause = None
+    for m in CLAUSE_PATTERN.finditer(text, start + limit // 2, window_end):
+        clause = m.end()
+    if clause is not None:
+        return clause
+    space = max(text.rfind(" ", start + 1, window_end + 1), text.rfind("\n", start + 1, window_end + 1))
+    return space if space > start else window_end
+
+
+def normalize_tts_text(text: str) -> str:
+    """Normalisiert Chunk-Text für den Cache-Schlüssel (Unicode NFC, Whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TTSCache:
+    """Content-adressierter Audio-Cache für TTS-Chunks, geteilt über Skripte und Läufe.
+
+    Schlüssel ist ein SHA-256 über Modell, Stimme, Antwortformat und normalisierten
+    Text. Einträge werden atomar geschrieben (temporäre Datei + ``os.replace``);
+    überschreitet der Cache ``max_bytes``, werden die am längsten nicht genutzten
+    Einträge verdrängt (LRU über die mtime, die bei jedem Treffer erneuert wird).
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = TTS_CACHE_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index: dict[Path, tuple[float, int]] | None = None  # Pfad -> (mtime, Größe)
+        self._lock = threading.Lock()  # get/put laufen in Worker-Threads
+
+    @staticmethod
+    def key(model: str, voice: str, response_format: str, text: str) -> str:
+        material = json.dumps([model, voice, response_format, normalize_tts_text(text)], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def path(self, key: str, response_format: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{response_format}"
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size in self._load_index().values())
+
+    def contains(self, key: str, response_format: str) -> bool:
+        """Ob ein Eintrag vorhanden ist (ohne ihn zu lesen oder als Zugriff zu zählen)."""
+        with self._lock:
+            return self.path(key, response_format) in self._load_index()
+
+    def get(self, key: str, response_format: str) -> bytes | None:
+        """Inhalt eines Cache-Eintrags; None bei Cache-Miss."""
+        entry = self.path(key, response_format)
+        try:
+            data = entry.read_bytes()
+            os.utime(entry)  # LRU: Zugriff vermerken
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self._load_index()[entry] = (time.time(), len(data))
+            self.hits += 1
+        return data
+
+    def put(self, key: str, response_format: str, data: bytes) -> None:
+        """Legt ``data`` atomar als Cache-Eintrag ab und verdrängt bei Bedarf."""
+        entry = self.path(key, response_format)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=entry.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._load_index()[entry] = (time.time(), entry.stat().st_size)
+            self._evict()
+
+    def _load_index(self) -> dict[Path, tuple[float, int]]:
+        if self._index is None:
+            self._index = {}
+            if self.directory.exists():
+                for entry in self.directory.glob("??/*"):
+                    if entry.name.startswith(".tmp-"):
+                        continue
+                    st = entry.stat()
+                    self._index[entry] = (st.st_mtime, st.st_size)
+        return self._index
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        total = sum(size for _, size in index.values())
+        if total <= self.max_bytes:
+            return
+        # Auf 90 % des Limits herunter, damit nicht jeder weitere Eintrag verdrängt
+        target = self.max_bytes * 9 // 10
+        for entry, (_, size) in sorted(index.items(), key=lambda e: e[1][0]):
+            if total <= target:
+                break
+            entry.unlink(missing_ok=True)
+            del index[entry]
+            total -= size
+            self.evictions += 1
+
+
+_file_hashes: dict[Path, tuple[int, int, str]] = {}  # je Datei nur der zuletzt gesehene Stand
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 des Dateiinhalts; pro Lauf je Datei anhand von Größe und mtime gemerkt."""
+    st = path.stat()
+    resolved = path.resolve()
+    memo = _file_hashes.get(resolved)
+    if memo is not None and memo[:2] == (st.st_size, st.st_mtime_ns):
+        return memo[2]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    _file_hashes[resolved] = (st.st_size, st.st_mtime_ns, digest.hexdigest())
+    return _file_hashes[resolved][2]
+
+
+class IncludeCache:
+    """Include-Dateien, einmal auf das PCM-Format der Pipeline normalisiert.
+
+    Jingles, Intros und Musikbetten stecken in vielen Folgen; statt sie bei
+    jedem Zusammenfügen neu zu dekodieren und umzurechnen, liegt je Datei und
+    Zielformat ein s16le-PCM-Eintrag im Cache. Schlüssel ist der Inhalts-Hash
+    (über Größe und mtime gemerkt, siehe ``file_hash``) plus Abtastrate und
+    Kanäle — eine geänderte Datei bekommt automatisch einen neuen Eintrag.
+    Einträge werden atomar geschrieben, parallele Worker-Prozesse können sich
+    also höchstens doppelte Arbeit machen, nie einen halben Eintrag lesen.
+    """
+
+    def __init__(self, directory: Path = INCLUDE_CACHE_DIR) -> None:
+        self.directory = directory
+
+    def path(self, include_file: Path, sample_rate: int, channels: int) -> Path:
+        key = file_hash(include_file)
+        return self.directory / key[:2] / f"{key}-{sample_rate}-{channels}.pcm"
+
+    def pcm(self, include_file: Path, sample_rate: int, channels: int) -> Path:
+        """Pfad des normalisierten PCM für ``include_file``; dekodiert nur beim ersten Mal."""
+        entry = self.path(include_file, sample_rate, channels)
+        if entry.exists():
+            return entry
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=entry.parent, prefix=".tmp-")
+        os.close(fd)
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(include_file), "-vn",
+                 "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-y", tmp_name],
+                capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg konnte {include_file.name} nicht dekodieren: {result.stderr.strip()}")
+            os.replace(tmp_name, entry)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return entry
+
+
+def copy_mapped(path: Path, out: BinaryIO) -> None:
+    """Schreibt den Inhalt von ``path`` per Memory-Mapping nach ``out`` (ohne Kopie in den Heap)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            out.write(mapped)
+
+
+def manifest_path(output_file: Path) -> Path:
+    """Sidecar-Manifest einer generierten Audiodatei (``foo.mp3.manifest.json``)."""
+    return output_file.with_name(output_file.name + ".manifest.json")
+
+
+def load_manifest(output_file: Path) -> dict | None:
+    try:
+        manifest = json.loads(manifest_path(output_file).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def build_manifest(segments: list[Segment], default_voice: str, settings: AudioSettings,
+                   model: str = PRIMARY_MODEL, chunks: list[list[str] | None] | None = None) -> dict:
+    """Beschreibt, woraus eine Ausgabe besteht: je Segment Hash, Stimme, Cache-Schlüssel bzw. Include-Hash.
+
+    ``chunks`` (je Segment, falls schon bekannt) erspart das erneute Aufteilen der Texte.
+    """
+    entries = []
+    for i, segment in enumerate(segments):
+        material = json.dumps([segment.content, segment.is_pause, segment.is_include, segment.voice], ensure_ascii=False)
+        entry: dict = {"hash": hashlib.sha256(material.encode("utf-8")).hexdigest()}
+        if segment.is_pause:
+            entry.update(kind="pause", seconds=segment.content)
+        elif segment.is_include:
+            include_file = SKRIPTE_DIR / segment.content
+            entry.update(kind="include", file=segment.content,
+                         file_hash=file_hash(include_file) if include_file.exists() else None)
+        else:
+            segment_chunks = chunks[i] if chunks is not None else \
+                split_text_into_chunks(segment.content, settings.chunk_chars, settings.chunk_seconds)
+            entry.update(kind="text", voice=segment.voice, chunks=[
+                TTSCache.key(model, segment.voice, settings.internal_format, chunk) for chunk in segment_chunks
+            ])
+        entries.append(entry)
+    return {
+        "version": MANIFEST_VERSION,
+        "settings": {"internal_format": settings.internal_format, "codec": settings.codec, "bitrate": settings.bitrate,
+                     **({"extra_outputs": [list(o) for o in settings.extra_outputs]} if settings.extra_outputs else {})},
+        "default_voice": default_voice,
+        "segments": entries,
+    }
+
+
+def write_manifest(output_file: Path, manifest: dict) -> None:
+    """Schreibt das Manifest atomar neben die Ausgabedatei."""
+    target = manifest_path(output_file)
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def manifest_default_voice(previous: dict | None) -> str | None:
+    """Stimme für Skripte ohne #VOICE: die der letzten Generierung, damit ein Neubau sie beibehält."""
+    if previous and previous.get("default_voice") in VALID_VOICES:
+        return previous["default_voice"]
+    return None
+
+
+def changed_segments(previous: dict | None, current: dict) -> int:
+    """Anzahl der Segmente in ``current``, die es in ``previous`` so nicht gab (Includes samt Dateiinhalt)."""
+    old: dict[tuple[str, str | None], int] = {}
+    for entry in (previous or {}).get("segments", []):
+        key = (entry["hash"], entry.get("file_hash"))
+        old[key] = old.get(key, 0) + 1
+    changed = 0
+    for entry in current["segments"]:
+        key = (entry["hash"], entry.get("file_hash"))
+        if old.get(key, 0):
+            old[key] -= 1
         else:
-            current_chunk += paragraph + "\n\n"
+            changed += 1
+    return changed
 
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
 
-    return chunks
+def is_output_outdated(md_file: Path, settings: AudioSettings, model: str = PRIMARY_MODEL) -> bool:
+    """Ob eine vorhandene Ausgabe laut Manifest nicht mehr zum Skript passt.
+
+    Ausgaben ohne Manifest (z.B. aus älteren Versionen) gelten als aktuell.
+    """
+    output_file = md_file.with_suffix(settings.suffix)
+    previous = load_manifest(output_file)
+    if previous is None or not output_file.exists():
+        return False
+    text = md_file.read_text(encoding="utf-8")
+    tokenizer = ScriptTokenizer(text, fallback_voice=manifest_default_voice(previous) or DEFAULT_VOICE)
+    segments = list(tokenizer)
+    current = build_manifest(segments, tokenizer.initial_voice, settings, model)
+    return current != previous
+
+
+class RateLimiter:
+    """Adaptives, globales Anfrage-Budget für alle TTS-Aufrufe eines Laufs.
+
+    - Token-Buckets für Anfragen und Zeichen pro Minute (Burst bis zu einer Minute).
+    - Nebenläufigkeit nach AIMD: jede erfolgreiche Anfrage erhöht das Limit um
+      ``1/limit`` (also etwa +1 pro Runde), jede Drosselung (429) halbiert es —
+      höchstens einmal pro Drosselungswelle, damit gleichzeitig zurückkommende
+      429er das Limit nicht mehrfach halbieren.
+    - ``Retry-After`` pausiert das gesamte Budget bis zum angegebenen Zeitpunkt.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        start_concurrency: int = CONCURRENT_REQUESTS,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        chars_per_minute: float = CHARS_PER_MINUTE,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(start_concurrency, max_concurrency))
+        self.requests_per_minute = requests_per_minute
+        self.chars_per_minute = chars_per_minute
+        self.in_flight = 0
+        self.requests = 0
+        self.throttles = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+        self.peak_limit = self.limit
+        self._request_tokens = float(requests_per_minute)
+        self._char_tokens = float(chars_per_minute)
+        self.monotonic = monotonic
+        self._refilled_at = monotonic()
+        self._paused_until = 0.0
+        self._last_cut = 0.0
+        self._changed = asyncio.Event()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._request_tokens = min(self.requests_per_minute, self._request_tokens + elapsed * self.requests_per_minute / 60)
+        self._char_tokens = min(self.chars_per_minute, self._char_tokens + elapsed * self.chars_per_minute / 60)
+
+    async def acquire(self, chars: int) -> None:
+        """Wartet, bis Nebenläufigkeit, Token-Buckets und Retry-After eine Anfrage zulassen."""
+        chars = min(chars, self.chars_per_minute)  # Einzelne Riesenanfrage darf nicht ewig warten
+        wait_start = self.monotonic()
+        while True:
+            now = self.monotonic()
+            self._refill(now)
+            timeout = self._wait_time(now, chars)
+            if timeout is not None and timeout <= 0:
+                break
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except TimeoutError:
+                pass
+        self._request_tokens -= 1
+        self._char_tokens -= chars
+        self.in_flight += 1
+        self.requests += 1
+        self.wait_seconds += self.monotonic() - wait_start
+
+    def _wait_time(self, now: float, chars: int) -> float | None:
+        """Sekunden bis zur nächsten Anfrage (<= 0: sofort), None bis eine Anfrage fertig wird."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        return max(
+            (1 - self._request_tokens) * 60 / self.requests_per_minute,
+            (chars - self._char_tokens) * 60 / self.chars_per_minute,
+        )
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Weckt alle Wartenden, damit sie ihre Bedingungen neu prüfen."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def success(self) -> None:
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self.peak_limit = max(self.peak_limit, self.limit)
+        self._wake()
+
+    def throttled(self, retry_after: float | None) -> None:
+        now = self.monotonic()
+        self.throttles += 1
+        if now - self._last_cut > (retry_after or 1.0):
+            self.limit = max(1.0, self.limit / 2)
+            self._last_cut = now
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def summary(self) -> str:
+        return (f"Nebenläufigkeit {self.limit:.1f} (Spitze {self.peak_limit:.1f}, max. {self.max_concurrency}), "
+                f"{self.requests} Anfragen, {self.throttles} Drosselungen, {self.retries} Wiederholungen, "
+                f"{format_duration(self.wait_seconds)} kumulierte Wartezeit")
+
+
+class TTSError(Exception):
+    """Fehler eines TTS-Backends in backendunabhängiger Form.
+
+    ``status_code`` folgt HTTP (429 = Drosselung, 5xx = Serverfehler, None =
+    Verbindungsproblem); ``retry_after`` ist die vom Dienst gewünschte Pause.
+    """
+
+    def __init__(self, message: str, status_code: int | None = None, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Drosselung (429), Serverfehler (5xx), Timeouts und Verbindungsfehler sind wiederholbar."""
+        status = self.status_code
+        return status is None or status == 429 or 500 <= status < 600
+
+
+class TTSBackend(ABC):
+    """Schmaler Adapter auf einen TTS-Dienst."""
+
+    name: str
+    primary_model: str
+    fallback_model: str | None = None
+
+    @abstractmethod
+    def stream(self, text: str, voice: str, model: str, response_format: str) -> AsyncIterator[bytes]:
+        """Liefert die Audiodaten stückweise (async Generator); Fehler als ``TTSError``."""
+
+
+def _retry_after(headers) -> float | None:
+    """Liest Retry-After (Sekunden, HTTP-Datum oder retry-after-ms) aus Antwort-Headern."""
+    headers = headers or {}
+    if value := headers.get("retry-after-ms"):
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    if value := headers.get("retry-after"):
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class OpenAIBackend(TTSBackend):
+    """TTS über die OpenAI-API (``AsyncOpenAI``, Streaming-Antwort)."""
+
+    name = "openai"
+    primary_model = PRIMARY_MODEL
+    fallback_model = FALLBACK_MODEL
+
+    def __init__(self, client=None) -> None:
+        if client is None:
+            from openai import AsyncOpenAI  # erst hier: Offline-Läufe brauchen das Paket nicht
+            # Wiederholungen übernimmt der RateLimiter, damit er Drosselungen selbst sieht
+            client = AsyncOpenAI(max_retries=0)
+        self.client = client
+
+    async def stream(self, text: str, voice: str, model: str, response_format: str) -> AsyncIterator[bytes]:
+        import openai
+        try:
+            async with self.client.audio.speech.with_streaming_response.create(
+                model=model,
+                voice=voice,
+                input=text,
+                response_format=response_format,
+            ) as response:
+                async for chunk in response.iter_bytes():
+                    yield chunk
+        except openai.APIStatusError as e:
+            raise TTSError(str(e), e.status_code, _retry_after(e.response.headers)) from e
+        except openai.APIConnectionError as e:  # inkl. Timeouts
+            raise TTSError(str(e)) from e
+
+
+class OfflineBackend(TTSBackend):
+    """Deterministischer, lokaler Ersatz für die API — für Benchmarks und Lasttests.
+
+    Liefert je Stimme einen festen Ton, dessen Länge mit der Textlänge
+    wächst (``chars_per_second``). Latenz, Jitter, Drosselung und Fehler
+    sind einstellbar; ``capacity`` simuliert einen Server, der oberhalb von
+    so vielen gleichzeitigen Anfragen mit 429 antwortet. Zufall kommt aus
+    einem festen Seed, Läufe sind also reproduzierbar.
+    """
+
+    name = "offline"
+    primary_model = "offline-tone"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        failure_rate: float = 0.0,
+        capacity: int | None = None,
+        retry_after: float = 1.0,
+        chars_per_second: float = SPEECH_CHARS_PER_SECOND,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.failure_rate = failure_rate
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self.chars_per_second = chars_per_second
+        self.rng = random.Random(seed)
+        self.in_flight = 0
+        self.calls = 0
+        self._tones: dict[tuple[str, str], list[bytes]] = {}
+
+    async def stream(self, text: str, voice: str, model: str, response_format: str) -> AsyncIterator[bytes]:
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+            if self.capacity is not None and self.in_flight > self.capacity or self.rng.random() < self.throttle_rate:
+                raise TTSError("Offline: Drosselung simuliert", 429, self.retry_after)
+            if self.rng.random() < self.failure_rate:
+                raise TTSError("Offline: Serverfehler simuliert", 503)
+        finally:
+            self.in_flight -= 1
+        seconds = max(0.2, len(text) / self.chars_per_second)
+        blocks = self._tone(voice, response_format)
+        # Ein Block = eine Sekunde Ton (PCM) bzw. ein Frame (MP3), zyklisch wiederholt
+        count = round(seconds) if response_format == "pcm" else round(seconds * PCM_SAMPLE_RATE / 576)
+        for i in range(max(1, count)):
+            yield blocks[i % len(blocks)]
+
+    def _tone(self, voice: str, response_format: str) -> list[bytes]:
+        """Eine Sekunde Sinuston je Stimme, einmal erzeugt (PCM) bzw. kodiert (MP3-Frames)."""
+        key = (voice, response_format)
+        if key not in self._tones:
+            frequency = 220 + int(hashlib.sha256(voice.encode()).hexdigest(), 16) % 440
+            samples = array("h", (
+                int(8000 * math.sin(2 * math.pi * frequency * i / PCM_SAMPLE_RATE)) for i in range(PCM_SAMPLE_RATE)
+            ))
+            if sys.byteorder == "big":
+                samples.byteswap()  # s16le wie die API
+            pcm = samples.tobytes()
+            if response_format == "pcm":
+                self._tones[key] = [pcm]
+            else:
+                self._tones[key] = self._encode_mp3(pcm)
+        return self._tones[key]
+
+    @staticmethod
+    def _encode_mp3(pcm: bytes) -> list[bytes]:
+        """Kodiert den Ton ohne Bit-Reservoir, damit jeder Frame für sich wiederholbar ist."""
+        if shutil.which("ffmpeg") is None:
+            return [SILENCE.mp3_frame(DEFAULT_MP3_FORMAT)[1]]
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "s16le", "-ar", str(PCM_SAMPLE_RATE),
+             "-ac", "1", "-i", "pipe:0", "-c:a", "libmp3lame", "-b:a", "64k", "-reservoir", "0", "-f", "mp3", "pipe:1"],
+            input=pcm, capture_output=True, check=True,
+        )
+        return [frame for _, frame in iter_mp3_frames(io.BytesIO(result.stdout))]
+
+
+class FileWriter:
+    """Führt Datei-I/O in Worker-Threads statt auf dem Event-Loop aus.
+
+    Höchstens ``max_pending`` Aufträge laufen gleichzeitig; weitere warten
+    (Gegendruck), damit sich bei langsamem Datenträger keine fertigen
+    Downloads unbegrenzt im Speicher stauen.
+    """
+
+    def __init__(self, max_pending: int = WRITE_QUEUE_SIZE) -> None:
+        self._slots = asyncio.Semaphore(max_pending)
+
+    async def run(self, func: Callable, *args):
+        async with self._slots:
+            return await asyncio.to_thread(func, *args)
+
+    async def write(self, path: Path, data: bytes) -> None:
+        await self.run(path.write_bytes, data)
+
+
+@dataclass
+class TTSStats:
+    """Messwerte eines TTS-Aufrufs (über alle Versuche), von ``text_to_speech`` befüllt."""
+    queue_wait: float = 0.0  # Warten auf das Anfrage-Budget (RateLimiter)
+    latency: float = 0.0  # Zeit in API-Aufrufen, inkl. fehlgeschlagener Versuche
+    backoff: float = 0.0  # Wartezeit zwischen Wiederholungen
+    retries: int = 0
+    cache_hit: bool = False
+    model: str = ""
 
 
 async def text_to_speech(
-    client: AsyncOpenAI,
+    backend: TTSBackend,
     text: str,
-    output_file: Path,
     voice: str = DEFAULT_VOICE,
-    model: str = PRIMARY_MODEL,
-) -> None:
-    """Konvertiert Text zu MP3 mit OpenAI TTS API."""
-    try:
-        async with client.audio.speech.with_streaming_response.create(
-            model=model,
-            voice=voice,
-            input=text,
-            response_format="mp3",
-        ) as response:
-            with open(output_file, "wb") as f:
-                async for chunk in response.iter_bytes():
-                    f.write(chunk)
-    except Exception as e:
-        # Fallback auf tts-1 wenn das primäre Modell nicht verfügbar ist
-        if model == PRIMARY_MODEL and "model" in str(e).lower():
-            print(f"      Fallback auf {FALLBACK_MODEL}...")
-            await text_to_speech(client, text, output_file, voice, FALLBACK_MODEL)
+    model: str | None = None,
+    cache: TTSCache | None = None,
+    limiter: RateLimiter | None = None,
+    response_format: str = "mp3",
+    writer: FileWriter | None = None,
+    stats: TTSStats | None = None,
+) -> bytes:
+    """Konvertiert Text zu Audio (MP3 oder rohes PCM) über ein TTS-Backend (mit optionalem Audio-Cache).
+
+    Mit ``limiter`` läuft jeder API-Aufruf durch das gemeinsame Budget;
+    wiederholbare Fehler werden mit exponentiellem Backoff und Jitter bzw.
+    nach ``Retry-After`` erneut versucht. Cache-Treffer kosten kein Budget.
+    Die Antwort wird im Speicher gesammelt und zurückgegeben; Cache-Zugriffe
+    laufen über ``writer`` außerhalb des Event-Loops. ``stats`` sammelt
+    Wartezeiten, API-Latenz und Wiederholungen für die Metriken.
+    """
+    model = model or backend.primary_model
+    if stats is None:
+        stats = TTSStats()
+    stats.model = model
+    key = TTSCache.key(model, voice, response_format, text)
+    if writer is None:
+        writer = FileWriter()
+    if cache is not None and (cached := await writer.run(cache.get, key, response_format)) is not None:
+        stats.cache_hit = True
+        return cached
+    if limiter is None:
+        limiter = RateLimiter()
+    attempt = 0
+    while True:
+        wait_start = time.monotonic()
+        await limiter.acquire(len(text))
+        request_start = time.monotonic()
+        stats.queue_wait += request_start - wait_start
+        try:
+            audio = bytearray()
+            async for chunk in backend.stream(text, voice, model, response_format):
+                audio += chunk
+        except TTSError as e:
+            error = e
         else:
-            raise
+            limiter.success()
+            break
+        finally:
+            limiter.release()
+            stats.latency += time.monotonic() - request_start
+
+        if error.retryable and attempt < MAX_RETRIES:
+            if error.status_code == 429:
+                limiter.throttled(error.retry_after)
+            limiter.retries += 1
+            # Full Jitter: zufällige Wartezeit bis zur exponentiell wachsenden Obergrenze
+            delay = error.retry_after or random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+            attempt += 1
+            stats.retries += 1
+            stats.backoff += delay
+            await asyncio.sleep(delay)
+            continue
+        # Fallback (z.B. auf tts-1) wenn das primäre Modell nicht verfügbar ist
+        if model == backend.primary_model and backend.fallback_model and not error.retryable \
+                and "model" in str(error).lower():
+            print(f"      Fallback auf {backend.fallback_model}...")
+            return await text_to_speech(backend, text, voice, backend.fallback_model, cache, limiter,
+                                        response_format, writer, stats)
+        raise error
+    audio = bytes(audio)
+    if cache is not None:
+        await writer.run(cache.put, key, response_format, audio)
+    return audio
+
+
+# MPEG-Audio Layer III: Bitraten (kbit/s) und Abtastraten je Version
+MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 25: (11025, 12000, 8000)}
+MP3_MAX_FRAME_LENGTH = 1441  # größter Layer-III-Frame: 320 kbit/s bei 32 kHz (MPEG-2: 160 kbit/s bei 8 kHz), mit Padding
+MP3_MAX_RESYNC = 64 * 1024  # so weit wird nach Müll im Datenstrom nach dem nächsten Frame-Kopf gesucht
+# Kandidaten beim Resync: Frame-Sync (11 gesetzte Bits) oder ein Tag am Dateiende
+_MP3_RESYNC_PATTERN = re.compile(rb"\xff(?=[\xe0-\xff])|TAG|APET")
+
+
+@dataclass(frozen=True)
+class Mp3FrameHeader:
+    """Kopf eines MPEG-Audio-Layer-III-Frames (4 Bytes)."""
+    version: int  # 1 = MPEG-1, 2 = MPEG-2, 25 = MPEG-2.5
+    bitrate: int  # kbit/s
+    sample_rate: int
+    padding: int
+    protected: bool  # CRC folgt auf den Kopf
+    mono: bool
+
+    @classmethod
+    def parse(cls, data: bytes) -> "Mp3FrameHeader | None":
+        """Liest einen Frame-Kopf; None wenn ``data`` keiner ist (oder nicht Layer III)."""
+        if len(data) < 4 or data[0] != 0xFF or data[1] & 0xE0 != 0xE0:
+            return None
+        version = {3: 1, 2: 2, 0: 25}.get((data[1] >> 3) & 3)
+        layer = (data[1] >> 1) & 3
+        bitrate_index = data[2] >> 4
+        sample_rate_index = (data[2] >> 2) & 3
+        # Layer III only; freies Format (Index 0) und ungültige Werte werden abgelehnt
+        if version is None or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+            return None
+        return cls(
+            version=version,
+            bitrate=MP3_BITRATES[1 if version == 1 else 2][bitrate_index],
+            sample_rate=MP3_SAMPLE_RATES[version][sample_rate_index],
+            padding=(data[2] >> 1) & 1,
+            protected=not data[1] & 1,
+            mono=data[3] >> 6 == 3,
+        )
+
+    @property
+    def samples(self) -> int:
+        return 1152 if self.version == 1 else 576
+
+    @property
+    def frame_length(self) -> int:
+        return self.samples // 8 * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info_length(self) -> int:
+        if self.version == 1:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    @property
+    def stream_format(self) -> tuple[int, int, bool]:
+        """Was zwischen Dateien übereinstimmen muss, damit Frames direkt aneinanderpassen."""
+        return (self.version, self.sample_rate, self.mono)
+
+    def smallest_frame(self, payload: int) -> "Mp3FrameHeader":
+        """Gleiches Format mit der kleinsten Bitrate, deren Frame ``payload`` Bytes fasst."""
+        for bitrate in MP3_BITRATES[1 if self.version == 1 else 2][1:]:
+            header = Mp3FrameHeader(self.version, bitrate, self.sample_rate, 0, False, self.mono)
+            if header.frame_length >= payload:
+                break
+        return header
+
+    def to_bytes(self) -> bytes:
+        """Kodiert den Kopf (immer ohne CRC)."""
+        version_bits = {1: 3, 2: 2, 25: 0}[self.version]
+        bitrate_index = MP3_BITRATES[1 if self.version == 1 else 2].index(self.bitrate)
+        sample_rate_index = MP3_SAMPLE_RATES[self.version].index(self.sample_rate)
+        return bytes((
+            0xFF,
+            0xE0 | version_bits << 3 | 1 << 1 | 1,  # Layer III, ohne CRC
+            bitrate_index << 4 | sample_rate_index << 2 | self.padding << 1,
+            (3 if self.mono else 0) << 6,
+        ))
+
+    def is_info_frame(self, frame: bytes) -> bool:
+        """Xing/Info- bzw. VBRI-Metadatenframe (enthält keine Audiodaten)."""
+        offset = 4 + (2 if self.protected else 0) + self.side_info_length
+        return frame[offset:offset + 4] in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+
+def _skip_id3v2(f) -> None:
+    """Positioniert ``f`` hinter einem ID3v2-Tag am Dateianfang (falls vorhanden)."""
+    header = f.read(10)
+    if len(header) == 10 and header[:3] == b"ID3":
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        footer = 10 if header[5] & 0x10 else 0
+        f.seek(10 + size + footer)
+    else:
+        f.seek(0)
+
+
+def iter_mp3_frames(source: "Path | AudioBuffer | BinaryIO") -> Iterator[tuple[Mp3FrameHeader, bytes]]:
+    """Liefert die Audio-Frames einer MP3-Datei (oder eines Puffers/Binärstroms), ohne sie zu dekodieren.
+
+    ID3v2/ID3v1/APE-Tags und Xing/Info/VBRI-Frames werden übersprungen; nach
+    Müll im Datenstrom wird auf den nächsten gültigen Frame-Kopf synchronisiert
+    (höchstens ``MP3_MAX_RESYNC`` Bytes weit, sonst endet der Strom dort).
+    """
+    if isinstance(source, AudioBuffer):
+        source = io.BytesIO(source.data)
+    with open(source, "rb") if isinstance(source, Path) else contextlib.nullcontext(source) as f:
+        _skip_id3v2(f)
+        first = True
+        while True:
+            head = f.read(4)
+            if len(head) < 4:
+                return
+            header = Mp3FrameHeader.parse(head)
+            if header is None:
+                if head[:3] == b"TAG" or head == b"APET" or not _resync_mp3(f, head):
+                    return  # Tags am Dateiende, oder kein Frame mehr in Reichweite
+                continue
+            frame = head + f.read(header.frame_length - 4)
+            if len(frame) < header.frame_length:
+                return  # abgeschnittener letzter Frame
+            if first and header.is_info_frame(frame):
+                first = False
+                continue
+            first = False
+            yield header, frame
+
+
+def _resync_mp3(f: BinaryIO, head: bytes) -> bool:
+    """Positioniert ``f`` auf den nächsten plausiblen Frame-Kopf (oder Tag) nach ``head``.
+
+    Gesucht wird blockweise; ein Kopf zählt nur, wenn dahinter ein Tag, ein
+    weiterer Kopf desselben Formats oder das Ende des Blocks folgt.
+    """
+    window = head[1:] + f.read(MP3_MAX_RESYNC)
+    base = f.tell() - len(window)
+    for m in _MP3_RESYNC_PATTERN.finditer(window):
+        pos = m.start()
+        if m.group() == b"\xff":
+            header = Mp3FrameHeader.parse(window[pos:pos + 4])
+            if header is None:
+                continue
+            following = window[pos + header.frame_length:pos + header.frame_length + 4]
+            if len(following) == 4 and following[:3] != b"TAG" and following != b"APET":
+                next_header = Mp3FrameHeader.parse(following)
+                if next_header is None or next_header.stream_format != header.stream_format:
+                    continue
+        f.seek(base + pos)
+        return True
+    return False
+
+
+def _xing_frame(template: Mp3FrameHeader, frame_count: int, byte_count: int, vbr: bool) -> bytes:
+    """Baut einen Xing/Info-Frame mit Frame- und Byteanzahl für Dauer und Seeking."""
+    header = template.smallest_frame(4 + template.side_info_length + 16)
+    tag = (b"Xing" if vbr else b"Info") + (3).to_bytes(4, "big") \
+        + frame_count.to_bytes(4, "big") + byte_count.to_bytes(4, "big")
+    frame = header.to_bytes() + bytes(header.side_info_length) + tag
+    return frame + bytes(header.frame_length - len(frame))
+
+
+class SilenceProvider:
+    """Liefert Stille beliebiger Dauer ohne Encoder und ohne Prozessstart.
+
+    MP3: ein stummer Frame (Kopf plus genullte Side-Info, also keine
+    Huffman-Daten) wird einmal je Format gebaut und beliebig oft wiederholt.
+    PCM: Nullbytes direkt in den Ausgabestrom.
+    """
+
+    PCM_BLOCK = bytes(1 << 16)
+
+    def __init__(self) -> None:
+        self._mp3_frames: dict[tuple[int, int, bool], tuple[Mp3FrameHeader, bytes]] = {}
+
+    def mp3_frame(self, template: Mp3FrameHeader) -> tuple[Mp3FrameHeader, bytes]:
+        """Stummer Frame im Format von ``template`` (kleinstmögliche Bitrate)."""
+        key = template.stream_format
+        if key not in self._mp3_frames:
+            header = template.smallest_frame(4 + template.side_info_length)
+            self._mp3_frames[key] = (header, header.to_bytes() + bytes(header.frame_length - 4))
+        return self._mp3_frames[key]
+
+    def mp3_frame_count(self, template: Mp3FrameHeader, seconds: float) -> int:
+        return round(seconds * template.sample_rate / template.samples)
+
+    def write_pcm(self, out, seconds: float, sample_rate: int, channels: int) -> None:
+        """Schreibt ``seconds`` Stille als s16le-PCM nach ``out``."""
+        remaining = round(seconds * sample_rate) * channels * 2
+        while remaining > 0:
+            block = self.PCM_BLOCK if remaining >= len(self.PCM_BLOCK) else bytes(remaining)
+            out.write(block)
+            remaining -= len(block)
+
+
+SILENCE = SilenceProvider()
+DEFAULT_MP3_FORMAT = Mp3FrameHeader(version=2, bitrate=64, sample_rate=24000, padding=0, protected=False, mono=True)  # wie die TTS-Ausgabe
+
+
+@dataclass(frozen=True)
+class Silence:
+    """Pause als Teil der Zusammenstellung; erst beim Zusammenfügen erzeugt."""
+    seconds: float
+
+
+@dataclass(frozen=True)
+class AudioBuffer:
+    """Zwischen-Audio (ein TTS-Chunk) im Speicher; geht ohne Umweg über die Platte ins Zusammenfügen."""
+    data: bytes
+    format: str  # "mp3" oder "pcm"
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.format}"
+
+    @property
+    def name(self) -> str:
+        return f"<Puffer {format_size(len(self.data))} {self.format}>"
+
+
+AudioPart = Path | AudioBuffer | Silence
+
+
+class Workspace:
+    """Privater Arbeitsbereich eines Laufs für Zwischen-Audio.
+
+    Chunks bleiben als ``AudioBuffer`` im Speicher, solange zusammen nicht
+    mehr als ``max_memory`` Bytes gehalten werden; darüber wird in ein
+    eigenes, erst bei Bedarf angelegtes Verzeichnis unter ``base`` (Default:
+    System-Temp) ausgelagert. Parallele Läufe teilen sich nichts. Das
+    Verzeichnis verschwindet beim Verlassen des ``with``-Blocks — auch bei
+    Fehlern oder Strg+C — und spätestens beim Beenden des Interpreters.
+    """
+
+    def __init__(self, max_memory: int = WORKSPACE_MAX_MEMORY_MB * 1024 * 1024, base: Path | None = None) -> None:
+        self.max_memory = max_memory
+        self.base = base
+        self.in_memory = 0
+        self.peak_memory = 0
+        self.spilled_bytes = 0
+        self._lock = threading.Lock()
+        self._directory: Path | None = None
+        self._counter = 0
+        self._cleanup: weakref.finalize | None = None
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _next_path(self, fmt: str) -> Path:
+        if self._directory is None:
+            self._directory = Path(tempfile.mkdtemp(prefix="fruehsport-", dir=self.base))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._directory, ignore_errors=True)
+        self._counter += 1
+        return self._directory / f"chunk_{self._counter:06d}.{fmt}"
+
+    def store(self, data: bytes, fmt: str) -> AudioBuffer | Path:
+        """Nimmt einen Chunk auf: als Puffer, oder oberhalb des Limits als Datei (blockiert dann)."""
+        with self._lock:
+            if self.in_memory + len(data) <= self.max_memory:
+                self.in_memory += len(data)
+                self.peak_memory = max(self.peak_memory, self.in_memory)
+                return AudioBuffer(data, fmt)
+            path = self._next_path(fmt)
+            self.spilled_bytes += len(data)
+        path.write_bytes(data)
+        return path
+
+    def release(self, parts: list[AudioPart]) -> None:
+        """Gibt die Zwischen-Audios eines fertigen Skripts frei (Speicher und ausgelagerte Dateien)."""
+        for part in parts:
+            if isinstance(part, AudioBuffer):
+                with self._lock:
+                    self.in_memory -= len(part.data)
+            elif isinstance(part, Path) and self._directory is not None and part.parent == self._directory:
+                part.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._cleanup is not None:
+            self._cleanup()
 
 
 def create_silence(duration_seconds: int, output_file: Path) -> None:
-    """Erzeugt eine MP3-Datei mit Stille der angegebenen Dauer."""
-    silence = AudioSegment.silent(duration=duration_seconds * 1000)  # ms
-    silence.export(output_file, format="mp3")
+    """Erzeugt eine MP3-Datei mit Stille der angegebenen Dauer (ohne Encoder)."""
+    header, frame = SILENCE.mp3_frame(DEFAULT_MP3_FORMAT)
+    with open(output_file, "wb") as f:
+        f.write(frame * SILENCE.mp3_frame_count(header, duration_seconds))
+
+
+def concat_mp3_frames(parts: list[AudioPart], output_file: Path, template: Mp3FrameHeader,
+                      timings: dict[str, float] | None = None) -> None:
+    """Hängt die Frames formatgleicher MP3-Dateien und Pausen verlustfrei aneinander.
+
+    Streamt Frame für Frame (konstanter Speicher, keine Neukodierung); Pausen
+    sind wiederholte stumme Frames im selben Format. Vorne steht ein
+    Xing/Info-Frame mit der Gesamtzahl der Frames.
+    """
+    with open(output_file, "wb") as out:
+        out.write(_xing_frame(template, 0, 0, False))  # Platzhalter, wird unten gefüllt
+        frame_count, byte_count, bitrates = write_mp3_frames(parts, out, template, timings)
+        xing = _xing_frame(template, frame_count, 0, len(bitrates) > 1)
+        xing = _xing_frame(template, frame_count, byte_count + len(xing), len(bitrates) > 1)
+        out.seek(0)
+        out.write(xing)
+
+
+def write_mp3_frames(parts: list[AudioPart], out: BinaryIO, template: Mp3FrameHeader,
+                     timings: dict[str, float] | None = None) -> tuple[int, int, set[int]]:
+    """Schreibt die Frames aller Teile nach ``out``; liefert Frame-Anzahl, Bytes und vorkommende Bitraten.
+
+    Die Zeit für Pausen wird in ``timings["silence"]`` aufsummiert (falls übergeben).
+    """
+    frame_count = 0
+    byte_count = 0
+    bitrates = set()
+    for part in parts:
+        if isinstance(part, Silence):
+            start = time.perf_counter()
+            header, frame = SILENCE.mp3_frame(template)
+            count = SILENCE.mp3_frame_count(header, part.seconds)
+            out.write(frame * count)
+            frame_count += count
+            byte_count += len(frame) * count
+            if count:
+                bitrates.add(header.bitrate)
+            if timings is not None:
+                timings["silence"] = timings.get("silence", 0.0) + time.perf_counter() - start
+            continue
+        for header, frame in iter_mp3_frames(part):
+            out.write(frame)
+            frame_count += 1
+            byte_count += len(frame)
+            bitrates.add(header.bitrate)
+    return frame_count, byte_count, bitrates
+
+
+def _split_mp3_runs(
+    parts: list[AudioPart], chunk_format: Mp3FrameHeader | None,
+) -> Iterator[tuple[Mp3FrameHeader | None, list[AudioPart]]]:
+    """Teilt ``parts`` für die Dekodierung auf.
+
+    Aufeinanderfolgende MP3-Teile im ``chunk_format`` bilden samt der Pausen
+    dazwischen einen Lauf (Format, Teile); jeder andere Teil steht allein
+    (None, [Teil]).
+    """
+    run: list[AudioPart] = []
+    for part in parts:
+        if chunk_format is None:
+            joins = False
+        elif isinstance(part, Silence):
+            joins = bool(run)  # Pausen hinter MP3-Teilen werden stumme Frames im selben Lauf
+        else:
+            header = first_mp3_header(part)
+            joins = header is not None and header.stream_format == chunk_format.stream_format
+        if joins:
+            run.append(part)
+            continue
+        if run:
+            yield chunk_format, run
+            run = []
+        yield None, [part]
+    if run:
+        yield chunk_format, run
+
+
+def _decode_to_pcm(
+    input_args: list[str],
+    pcm_args: list[str],
+    out: BinaryIO,
+    name: str,
+    feed: Callable[[BinaryIO], object] | None = None,
+) -> None:
+    """Dekodiert mit einem ffmpeg-Prozess nach PCM und streamt das Ergebnis nach ``out``.
+
+    ``feed`` schreibt die Eingabe in einem eigenen Thread auf stdin des
+    Decoders, während hier seine Ausgabe weitergereicht wird. Bei einem Fehler
+    wird der Decoder beendet und eingesammelt.
+    """
+    decoder = subprocess.Popen(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", *input_args, *pcm_args, "pipe:1"],
+        stdin=subprocess.DEVNULL if feed is None else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    feed_errors: list[BaseException] = []
+
+    def feed_stdin() -> None:
+        try:
+            feed(decoder.stdin)
+        except BrokenPipeError:
+            pass  # Decoder vorzeitig beendet: sein Exit-Code sagt, warum
+        except BaseException as e:
+            feed_errors.append(e)
+        finally:
+            with contextlib.suppress(BrokenPipeError):
+                decoder.stdin.close()
+
+    feeder = None if feed is None else threading.Thread(target=feed_stdin, daemon=True)
+    try:
+        if feeder is not None:
+            feeder.start()
+        shutil.copyfileobj(decoder.stdout, out, 1 << 16)
+    except BaseException:
+        decoder.kill()
+        raise
+    finally:
+        decoder.stdout.close()
+        exit_code = decoder.wait()
+        if feeder is not None:
+            feeder.join()
+    if feed_errors:
+        raise feed_errors[0]
+    if exit_code != 0:
+        raise RuntimeError(f"ffmpeg konnte {name} nicht dekodieren (Exit-Code {exit_code})")
+
+
+def encode_via_ffmpeg(
+    parts: list[AudioPart],
+    targets: list[tuple[Path, str, str]],
+    sample_rate: int,
+    channels: int,
+    chunk_format: Mp3FrameHeader | None = None,
+    include_cache: IncludeCache | None = None,
+) -> None:
+    """Fügt beliebige Teile über einen PCM-Strom zusammen und kodiert genau einmal.
+
+    Ein einziger Encoder-Prozess liest PCM von stdin und schreibt alle
+    ``targets`` (Pfad, Codec, Rate) aus demselben Strom. Rohe PCM-Chunks
+    (Dateien oder Puffer) werden direkt hineinkopiert, Pausen als PCM-Nullen
+    geschrieben, alle anderen Teile von einem Decoder auf das Format gebracht
+    und hineingestreamt. Aufeinanderfolgende MP3-Teile im ``chunk_format``
+    (samt Pausen dazwischen, als stumme Frames) teilen sich einen Decoder,
+    sodass die Zahl der ffmpeg-Prozesse nicht mit der Zahl der Chunks wächst.
+    Es liegt nie mehr als ein Puffer PCM im Speicher.
+
+    Mit ``include_cache`` werden Dateien (Includes) außerhalb solcher Läufe
+    nicht jedes Mal dekodiert, sondern als bereits normalisiertes PCM aus dem
+    Cache gemappt.
+
+    Bilden alle Teile einen solchen Lauf, bekommt der Encoder stattdessen den
+    Frame-Strom und dekodiert selbst — ein Prozess insgesamt.
+    """
+    pcm_args = ["-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels)]
+    runs = list(_split_mp3_runs(parts, chunk_format))
+    mp3_input = len(runs) == 1 and runs[0][0] is not None
+    input_args = ["-f", "mp3"] if mp3_input else pcm_args
+    outputs = [arg for path, codec, rate in targets for arg in (*OUTPUT_CODECS[codec].ffmpeg_args(rate), "-y", str(path))]
+    encoder = subprocess.Popen(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", *input_args, "-i", "pipe:0", *outputs],
+        stdin=subprocess.PIPE,
+    )
+    complete = False
+    try:
+        # Bricht der Encoder vorzeitig ab, zählt unten sein Exit-Code statt des BrokenPipeError
+        with contextlib.suppress(BrokenPipeError):
+            if mp3_input:
+                write_mp3_frames(parts, encoder.stdin, chunk_format)
+                runs = []
+            for run_format, run in runs:
+                if run_format is not None:
+                    _decode_to_pcm(["-f", "mp3", "-i", "pipe:0"], pcm_args, encoder.stdin, f"{len(run)} MP3-Teile",
+                                   feed=lambda stdin: write_mp3_frames(run, stdin, run_format))
+                    continue
+                part = run[0]
+                if isinstance(part, Silence):
+                    SILENCE.write_pcm(encoder.stdin, part.seconds, sample_rate, channels)
+                elif isinstance(part, AudioBuffer) and part.format == "pcm":
+                    encoder.stdin.write(part.data)
+                elif isinstance(part, AudioBuffer):
+                    _decode_to_pcm(["-f", part.format, "-i", "pipe:0"], pcm_args, encoder.stdin, part.name,
+                                   feed=lambda stdin: stdin.write(part.data))
+                elif part.suffix == ".pcm":
+                    with open(part, "rb") as pcm:
+                        shutil.copyfileobj(pcm, encoder.stdin, 1 << 16)
+                elif include_cache is not None:
+                    copy_mapped(include_cache.pcm(part, sample_rate, channels), encoder.stdin)
+                else:
+                    _decode_to_pcm(["-i", str(part)], pcm_args, encoder.stdin, part.name)
+            complete = True
+    except BaseException:
+        encoder.kill()
+        raise
+    finally:
+        with contextlib.suppress(BrokenPipeError):
+            encoder.stdin.close()
+        encoder_exit = encoder.wait()
+    if encoder_exit != 0 or not complete:
+        raise RuntimeError(f"ffmpeg-Encoder beendet mit Exit-Code {encoder_exit}")
+
+
+def reencode_file(source: Path, targets: list[tuple[Path, str, str]]) -> int:
+    """Kodiert eine vorhandene Audiodatei in einem Durchlauf in alle ``targets`` um (atomar).
+
+    Liefert die Summe der Zielgrößen. Läuft im Prozess-Pool, eine Datei je Worker.
+    """
+    tmp_files = [path.with_name(f".{path.name}.tmp") for path, _, _ in targets]
+    try:
+        outputs = [arg for tmp, (_, codec, rate) in zip(tmp_files, targets)
+                   for arg in (*OUTPUT_CODECS[codec].ffmpeg_args(rate), "-y", str(tmp))]
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(source), "-vn", *outputs],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg konnte {source.name} nicht umkodieren: {result.stderr.strip()}")
+        for tmp, (path, _, _) in zip(tmp_files, targets):
+            os.replace(tmp, path)
+    finally:
+        for tmp in tmp_files:
+            tmp.unlink(missing_ok=True)
+    return sum(path.stat().st_size for path, _, _ in targets)
+
+
+def first_mp3_header(path: Path | AudioBuffer) -> Mp3FrameHeader | None:
+    """Kopf des ersten Audio-Frames, oder None wenn ``path`` keine MP3 ist."""
+    if path.suffix == ".pcm":
+        return None
+    if isinstance(path, AudioBuffer):
+        magic = path.data[:3]
+    else:
+        with open(path, "rb") as f:
+            magic = f.read(3)
+    # Nur mit ID3-Tag oder Frame-Sync am Anfang: WAV/PCM u.ä. nicht nach Zufallstreffern durchsuchen
+    if magic != b"ID3" and not (len(magic) == 3 and magic[0] == 0xFF and magic[1] & 0xE0 == 0xE0):
+        return None
+    for header, _ in iter_mp3_frames(path):
+        return header
+    return None
+
+
+def probe_duration(path: Path) -> float | None:
+    """Exakte Spieldauer in Sekunden, nur aus Kopfdaten — ohne Audio zu dekodieren.
+
+    MP3: Xing/Info- bzw. VBRI-Frame (inkl. Encoder-Delay/Padding aus dem
+    LAME-Tag), sonst ein Scan über die Frame-Köpfe, der die Frame-Inhalte
+    überspringt. Ogg (Opus/Vorbis): Granule-Position der letzten Seite.
+    MP4/M4A: ``mvhd``-Atom. None bei unbekanntem Format.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(12)
+        f.seek(0)
+        if magic[:4] == b"OggS":
+            return _ogg_duration(f)
+        if magic[4:8] == b"ftyp":
+            return _mp4_duration(f)
+        return _mp3_duration(f)
+
+
+def _mp3_duration(f: BinaryIO) -> float | None:
+    _skip_id3v2(f)
+    head = f.read(4)
+    if Mp3FrameHeader.parse(head) is not None:
+        f.seek(-4, os.SEEK_CUR)
+    elif len(head) < 4 or not _resync_mp3(f, head):
+        return None
+    start = f.tell()
+    frame = f.read(MP3_MAX_FRAME_LENGTH)
+    header = Mp3FrameHeader.parse(frame[:4])
+    if header is None:  # nur noch Tags
+        return None
+    frame = frame[:header.frame_length]
+
+    offset = 4 + (2 if header.protected else 0) + header.side_info_length
+    if frame[offset:offset + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(frame[offset + 4:offset + 8], "big")
+        if flags & 1:
+            frames = int.from_bytes(frame[offset + 8:offset + 12], "big")
+            # Hinter Frames, Bytes, TOC und Qualität folgt ggf. der LAME-Tag mit Delay/Padding
+            lame = offset + 8 + 4 + (4 if flags & 2 else 0) + (100 if flags & 4 else 0) + (4 if flags & 8 else 0)
+            trim = 0
+            if frame[lame:lame + 4] in (b"LAME", b"Lavc", b"Lavf") and len(frame) >= lame + 24:
+                raw = frame[lame + 21:lame + 24]
+                trim = (raw[0] << 4 | raw[1] >> 4) + ((raw[1] & 0x0F) << 8 | raw[2])
+            return max(0, frames * header.samples - trim) / header.sample_rate
+    elif frame[36:40] == b"VBRI":
+        frames = int.from_bytes(frame[50:54], "big")
+        return frames * header.samples / header.sample_rate
+
+    # Kein (brauchbarer) Info-Frame: Frame-Köpfe zählen, Inhalte per seek überspringen
+    size = os.fstat(f.fileno()).st_size
+    f.seek(start + (header.frame_length if header.is_info_frame(frame) else 0))
+    samples = 0
+    while True:
+        head = f.read(4)
+        if len(head) < 4:
+            break
+        frame_header = Mp3FrameHeader.parse(head)
+        if frame_header is None:
+            if head[:3] == b"TAG" or head == b"APET" or not _resync_mp3(f, head):
+                break
+            continue
+        if f.tell() - 4 + frame_header.frame_length > size:
+            break  # abgeschnittener letzter Frame
+        samples += frame_header.samples
+        f.seek(frame_header.frame_length - 4, os.SEEK_CUR)
+    return samples / header.sample_rate
+
+
+def _ogg_duration(f: BinaryIO) -> float | None:
+    head = f.read(4096)
+    if (idx := head.find(b"OpusHead")) >= 0:
+        rate, pre_skip = 48000, int.from_bytes(head[idx + 10:idx + 12], "little")
+    elif (idx := head.find(b"\x01vorbis")) >= 0:
+        rate, pre_skip = int.from_bytes(head[idx + 12:idx + 16], "little"), 0
+    else:
+        return None
+    size = os.fstat(f.fileno()).st_size
+    f.seek(max(0, size - 65536))
+    tail = f.read()
+    last = tail.rfind(b"OggS")
+    if last < 0 or not rate:
+        return None
+    granule = int.from_bytes(tail[last + 6:last + 14], "little", signed=True)
+    return max(0, granule - pre_skip) / rate
+
+
+def _mp4_boxes(f: BinaryIO, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """(Typ, Inhaltsanfang, Ende) der Boxen zwischen ``start`` und ``end``."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        head = f.read(16)
+        box_size, header_size = int.from_bytes(head[:4], "big"), 8
+        if box_size == 1:
+            box_size, header_size = int.from_bytes(head[8:16], "big"), 16
+        elif box_size == 0:
+            box_size = end - pos
+        if box_size < header_size:
+            return
+        yield head[4:8], pos + header_size, pos + box_size
+        pos += box_size
+
+
+def _mp4_duration(f: BinaryIO) -> float | None:
+    size = os.fstat(f.fileno()).st_size
+    for box, start, end in _mp4_boxes(f, 0, size):
+        if box != b"moov":
+            continue
+        for child, child_start, _ in _mp4_boxes(f, start, end):
+            if child != b"mvhd":
+                continue
+            f.seek(child_start)
+            data = f.read(32)
+            if data[0] == 1:
+                timescale, duration = int.from_bytes(data[20:24], "big"), int.from_bytes(data[24:32], "big")
+            else:
+                timescale, duration = int.from_bytes(data[12:16], "big"), int.from_bytes(data[16:20], "big")
+            return duration / timescale if timescale else None
+    return None
 
 
-def combine_audio_files(audio_files: list[Path], output_file: Path) -> None:
-    """Kombiniert mehrere MP3-Dateien zu einer."""
-    if not audio_files:
-        return
+def scan_durations(files: list[Path], workers: int | None = None) -> list[tuple[Path, float | None]]:
+    """Dauer vieler Dateien parallel in Threads (reines Datei-I/O, wenige Bytes je Datei)."""
+    def probe(path: Path) -> float | None:
+        try:
+            return probe_duration(path)
+        except OSError:
+            return None
 
-    combined = AudioSegment.from_mp3(audio_files[0])
-    for audio_file in audio_files[1:]:
-        audio = AudioSegment.from_mp3(audio_file)
-        combined += audio
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(zip(files, executor.map(probe, files)))
 
-    combined.export(output_file, format="mp3")
 
+def combine_audio_files(
+    audio_files: list[AudioPart],
+    output_file: Path,
+    settings: AudioSettings = AudioSettings(),
+    include_cache: IncludeCache | None = None,
+) -> dict[str, float]:
+    """Kombiniert Audio-Dateien, Puffer und Pausen zu einer Ausgabedatei, streamend.
+
+    Ist MP3 das Ausgabeformat und haben alle Dateien dasselbe MP3-Format,
+    werden nur die Frames kopiert (linear, ohne Neukodierung) und Pausen als
+    stumme Frames eingefügt. Andernfalls läuft alles als PCM durch eine
+    ffmpeg-Pipeline mit genau einer Kodierung — im PCM-Modus auf der festen
+    TTS-Abtastrate. Weitere Formate (``settings.extra_outputs``) entstehen
+    neben ``output_file`` aus demselben PCM-Strom. Die Ausgaben werden atomar
+    ersetzt, damit ein Abbruch keine halbe Datei als "konvertiert" hinterlässt.
+
+    Liefert die Zeiten der Teilschritte in Sekunden: ``silence`` (Pausen als
+    stumme Frames), ``merge`` (Frames kopieren, ohne Pausen) und ``encode``
+    (ffmpeg-Pipeline; Pausen darin zählen mit, dort gibt der Encoder das Tempo vor).
+    """
+    timings = {"silence": 0.0, "merge": 0.0, "encode": 0.0}
+    if not audio_files:
+        return timings
 
-async def convert_script_to_mp3(client: AsyncOpenAI, md_file: Path) -> bool:
-    """Konvertiert ein Frühsport-Skript zu MP3."""
+    targets = [
+        (output_file if i == 0 else output_file.with_suffix(OUTPUT_CODECS[codec].suffix), codec, rate)
+        for i, (codec, rate) in enumerate(settings.outputs)
+    ]
+    tmp_files = {path: path.with_name(f".{path.name}.tmp") for path, _, _ in targets}
+    try:
+        if settings.internal_format == "pcm":
+            sample_rate, channels, chunk_format, uniform = PCM_SAMPLE_RATE, PCM_CHANNELS, None, False
+        else:
+            headers = [first_mp3_header(f) for f in audio_files if not isinstance(f, Silence)]
+            formats = {h.stream_format if h else None for h in headers}
+            # Zielformat: das der ersten MP3 (i.d.R. ein TTS-Chunk), sonst TTS-Standard
+            chunk_format = next((h for h in headers if h is not None), DEFAULT_MP3_FORMAT)
+            sample_rate, channels = chunk_format.sample_rate, 1 if chunk_format.mono else 2
+            uniform = len(formats) <= 1 and None not in formats
+        # MP3 mit konstanter Bitrate aus einheitlichen MP3-Teilen: nur Frames kopieren
+        encode = []
+        for path, codec, rate in targets:
+            if codec == "mp3" and uniform:
+                start, silence = time.perf_counter(), timings["silence"]
+                concat_mp3_frames(audio_files, tmp_files[path], chunk_format, timings)
+                timings["merge"] += time.perf_counter() - start - (timings["silence"] - silence)
+            else:
+                encode.append((tmp_files[path], codec, rate))
+        if encode:
+            start = time.perf_counter()
+            encode_via_ffmpeg(audio_files, encode, sample_rate, channels, chunk_format, include_cache)
+            timings["encode"] += time.perf_counter() - start
+        for path, tmp in tmp_files.items():
+            os.replace(tmp, path)
+    finally:
+        for tmp in tmp_files.values():
+            tmp.unlink(missing_ok=True)
+    return timings
+
+
+def create_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Prozess-Pool für das Zusammenfügen und Kodieren, außerhalb des Event-Loops.
+
+    Unter Linux per fork: die Worker erben das geladene Modul (auch wenn es
+    wie im Benchmark unter anderem Namen geladen wurde). Ein erster Auftrag
+    startet alle Worker sofort — noch bevor Threads laufen, die ein fork
+    nicht sauber mitnehmen würde.
+    """
+    context = multiprocessing.get_context("fork") if sys.platform == "linux" else None
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    pool.submit(int).result()
+    return pool
+
+
+async def run_blocking(pool: Executor | None, func: Callable, *args):
+    """Führt CPU-lastige Arbeit im Pool aus (ohne Pool in einem Thread); der Event-Loop bleibt frei."""
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """p-Perzentil (0–100) einer aufsteigend sortierten, nicht leeren Liste (Nearest-Rank)."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Metrics:
+    """Strukturierte Messwerte eines Laufs, als JSON-Zeilen und als Zusammenfassung.
+
+    Je Datensatz eine Zeile in ``file`` (angehängt, alle Läufe in einer
+    Datei, unterscheidbar an ``run``):
+
+    - ``chunk``:  ein TTS-Aufruf — Zeichen, Bytes, API-Latenz, Warten auf das
+      Budget, Backoff, Wiederholungen, Cache-Treffer, Modell
+    - ``script``: ein Skript — Gesamt-, TTS-, Stille-, Zusammenfüge- und
+      Kodierzeit, Aufrufe, Bytes, Audiodauer, Erfolg
+
+    Ohne ``file`` wird nur im Speicher gesammelt (für die Zusammenfassung).
+    """
+
+    def __init__(self, file: Path | None = METRICS_FILE) -> None:
+        self.file = file
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.chunks: list[dict] = []
+        self.scripts: list[dict] = []
+        self._out = None
+
+    def record(self, kind: str, **values) -> None:
+        row = {"ts": round(time.time(), 3), "run": self.run_id, "type": kind, **values}
+        (self.chunks if kind == "chunk" else self.scripts).append(row)
+        if self.file is None:
+            return
+        if self._out is None:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            self._out = open(self.file, "a", encoding="utf-8")
+        self._out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        if kind == "script":
+            self._out.flush()  # gepuffert je Chunk, spätestens nach jedem Skript auf der Platte
+
+    def close(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def distribution(self, values: list[float]) -> dict[str, float] | None:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return {f"p{p}": percentile(ordered, p) for p in (50, 95, 99)} | {"max": ordered[-1]}
+
+    def summary(self) -> list[str]:
+        """Zeilen für die Abschlussausgabe: Perzentile je Chunk, Summen je Phase."""
+        lines = []
+        api = [c for c in self.chunks if not c["cache_hit"]]
+        for title, values, fmt in (
+            ("TTS-Latenz", [c["latency_s"] for c in api], lambda v: f"{v:.2f}s"),
+            ("Budget-Warten", [c["queue_wait_s"] for c in api], lambda v: f"{v:.2f}s"),
+            ("Chunk-Größe", [c["bytes"] for c in self.chunks], lambda v: format_size(int(v))),
+        ):
+            if (distribution := self.distribution(values)) is not None:
+                lines.append(f"{title + ':':<15}" + " │ ".join(f"{k} {fmt(v)}" for k, v in distribution.items())
+                              + f" (n={len(values)})")
+        if self.scripts:
+            totals = {phase: sum(s.get(f"{phase}_s", 0.0) for s in self.scripts)
+                     for phase in ("tts", "silence", "merge", "encode")}
+            lines.append("Phasen:        " + " │ ".join(f"{name} {totals[phase]:.1f}s" for phase, name in (
+                ("tts", "TTS"), ("silence", "Stille"), ("merge", "Zusammenfügen"), ("encode", "Kodieren"))))
+        return lines
+
+
+class ProgressDisplay:
+    """Gemeinsame Konsolenausgabe für gleichzeitig laufende Skript-Konvertierungen.
+
+    Meldungen erscheinen als eigene Zeilen (im Batch-Modus mit Dateinamen als
+    Präfix). Darunter steht eine per ``\\r`` aktualisierte Statuszeile: ein
+    Balken, solange nur ein Skript läuft, sonst je Skript fertige/gesamte
+    TTS-Aufrufe und geschätzte Restzeit.
+    """
+
+    def __init__(self, with_prefix: bool = False) -> None:
+        self.with_prefix = with_prefix
+        self._active: dict[str, ScriptProgress] = {}
+        self._status_width = 0
+
+    def script(self, name: str) -> "ScriptProgress":
+        progress = ScriptProgress(self, name)
+        self._active[name] = progress
+        return progress
+
+    def line(self, text: str) -> None:
+        """Gibt eine Zeile aus, ohne die Statuszeile zu zerschießen."""
+        self._clear_status()
+        print(text)
+        self._render()
+
+    def _clear_status(self) -> None:
+        if self._status_width:
+            print("\r" + " " * self._status_width + "\r", end="")
+            self._status_width = 0
+
+    def _render(self) -> None:
+        running = [f for f in self._active.values() if f.total]
+        if not running:
+            return
+        if len(running) == 1:
+            f = running[0]
+            pct = f.done * 100 // f.total
+            bar = "█" * (pct // 5) + "░" * (20 - pct // 5)
+            status = (f"  {bar} {pct:3d}% │ {f.done}/{f.total} fertig │ {f.running} laufend │ "
+                      f"{format_duration(time.monotonic() - f.start)}")
+        else:
+            status = "  " + " │ ".join(
+                f"{f.name[:20]} {f.done}/{f.total} ~{format_duration(eta) if (eta := f.eta()) is not None else '?'}"
+                for f in running
+            )
+        self._clear_status()
+        print(status, end="", flush=True)
+        self._status_width = len(status)
+
+
+class ScriptProgress:
+    """Fortschritt eines einzelnen Skripts innerhalb der Fortschrittsanzeige."""
+
+    def __init__(self, display: ProgressDisplay, name: str) -> None:
+        self.display = display
+        self.name = name
+        self.start = time.monotonic()
+        self.done = 0
+        self.running = 0
+        self.total = 0
+
+    def report(self, text: str) -> None:
+        prefix = f"[{self.name}] " if self.display.with_prefix else ""
+        self.display.line(f"  {prefix}{text}")
+
+    def update(self, done: int, running: int, total: int) -> None:
+        self.done, self.running, self.total = done, running, total
+        self.display._render()
+
+    def eta(self) -> float | None:
+        """Geschätzte Restzeit der TTS-Phase aus dem bisherigen Durchsatz (None: noch unbekannt)."""
+        if not self.done:
+            return None
+        return (time.monotonic() - self.start) / self.done * (self.total - self.done)
+
+    def finish(self) -> None:
+        self.display._active.pop(self.name, None)
+        self.display._clear_status()
+        self.display._render()
+
+
+async def convert_script_to_mp3(
+    backend: TTSBackend,
+    md_file: Path,
+    cache: TTSCache | None = None,
+    limiter: RateLimiter | None = None,
+    progress: ScriptProgress | None = None,
+    settings: AudioSettings = AudioSettings(),
+    pool: Executor | None = None,
+    writer: FileWriter | None = None,
+    workspace: Workspace | None = None,
+    include_cache: IncludeCache | None = None,
+    metrics: Metrics | None = None,
+) -> bool:
+    """Konvertiert ein Frühsport-Skript zu Audio (Format laut ``settings``).
+
+    ``limiter`` ist das Anfrage-Budget; im Batch-Modus teilen sich alle
+    gleichzeitig laufenden Skripte denselben RateLimiter. Zusammenfügen und
+    Kodieren laufen in ``pool`` (mit Puffern im Speicher in einem Thread, damit
+    sie nicht in den Prozess kopiert werden), Datei-I/O über ``writer`` — der Event-Loop
+    bedient währenddessen ungebremst die TTS-Downloads anderer Skripte.
+    Zwischen-Audio liegt in ``workspace`` (im Batch-Modus einer je Lauf) und
+    wird nach dem Zusammenfügen freigegeben, auch wenn das Skript scheitert.
+    Includes, die neu kodiert werden müssen, kommen aus ``include_cache``.
+    Je Chunk und je Skript landen Messwerte in ``metrics``.
+    """
+    if workspace is None:
+        with Workspace() as workspace:
+            return await convert_script_to_mp3(backend, md_file, cache, limiter, progress, settings, pool,
+                                               writer, workspace, include_cache, metrics)
     file_start = time.monotonic()
+    if progress is None:
+        progress = ProgressDisplay().script(md_file.name)
     text = md_file.read_text(encoding="utf-8")
     if not text.strip():
-        print(f"  ⏭  Datei ist leer, überspringe")
+        progress.report("⏭  Datei ist leer, überspringe")
         return False
 
-    # Ohne #VOICE-Direktiven: zufällige Stimme für die ganze Folge (mehr Varianz)
-    # Nur der Teil nach #START zählt — davor stehende Direktiven werden ohnehin ignoriert
-    effective_text = text
-    start_match = START_PATTERN.search(effective_text)
-    if start_match:
-        effective_text = effective_text[start_match.end():]
-    if VOICE_PATTERN.search(effective_text):
-        default_voice = DEFAULT_VOICE
-    else:
-        default_voice = random.choice(sorted(VALID_VOICES))
-        print(f"  Zufallsstimme: {default_voice} (keine #VOICE-Direktive im Skript)")
-
-    segments = parse_script(text, default_voice)
-    text_segments = [s for s in segments if not s.is_pause and not s.is_include]
-    pause_segments = [s for s in segments if s.is_pause]
-    include_segments = [s for s in segments if s.is_include]
-    total_chars = sum(len(s.content) for s in text_segments)
-    total_pause_secs = sum(s.content for s in pause_segments)
-
-    include_info = f", {len(include_segments)} Include(s)" if include_segments else ""
-    voices_used = sorted({s.voice for s in text_segments})
-    voice_counts = {}
-    for s in text_segments:
-        voice_counts[s.voice] = voice_counts.get(s.voice, 0) + 1
-    voice_detail = ", ".join(f"{v}({c})" for v, c in sorted(voice_counts.items()))
-
-    print(f"  Segmente:  {len(segments)} ({len(text_segments)} Sprache, {len(pause_segments)} Pausen{include_info})")
-    print(f"  Stimmen:   {voice_detail}")
-    print(f"  Textmenge: {total_chars:,} Zeichen, ~{total_pause_secs}s Pausen")
-    print()
-
-    # Temporäres Verzeichnis für Segmente
-    temp_dir = SKRIPTE_DIR / "temp_audio"
-    temp_dir.mkdir(exist_ok=True)
-
-    # Semaphore für parallele Verarbeitung
-    semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
-    audio_files: list[Path] = []
-    processed_segments = 0
+    # Ohne #VOICE-Direktiven: zufällige Stimme für die ganze Folge (mehr Varianz).
+    # Bei einem Neubau bleibt die Stimme der letzten Generierung erhalten (Manifest).
+    output_file = md_file.with_suffix(settings.suffix)
+    previous = load_manifest(output_file)
+    fallback_voice = manifest_default_voice(previous) or random.choice(sorted(VALID_VOICES))
+    tokenizer = ScriptTokenizer(text, DEFAULT_VOICE, fallback_voice=fallback_voice)
+
+    # Der RateLimiter begrenzt die gleichzeitig laufenden TTS-Anfragen (über alle Chunks)
+    if limiter is None:
+        limiter = RateLimiter()
+    if writer is None:
+        writer = FileWriter()
+    # Pro Segment die Audio-Teile seiner Chunks, in Skript-Reihenfolge
+    segments: list[Segment] = []
+    segment_files: list[list[AudioPart | None]] = []
+    total_tts_calls = 0
     processed_tts_calls = 0
 
-    async def process_text_segment(idx: int, text_content: str, voice: str) -> list[Path]:
-        """Verarbeitet ein Text-Segment (eventuell in mehreren Chunks)."""
+    async def synthesize_chunk(chunk: str, segment_idx: int, index: int, voice: str) -> None:
+        """Synthetisiert einen Chunk; Wartezeiten und Wiederholungen regelt der RateLimiter."""
         nonlocal processed_tts_calls
-        async with semaphore:
-            chunks = split_text_into_chunks(text_content)
-            chunk_files = []
+        stats = TTSStats()
+        audio = await text_to_speech(backend, chunk, voice=voice, cache=cache, limiter=limiter,
+                                     response_format=settings.internal_format, writer=writer, stats=stats)
+        segment_files[segment_idx][index] = await writer.run(workspace.store, audio, settings.internal_format)
+        processed_tts_calls += 1
+        if metrics is not None:
+            metrics.record(
+                "chunk", script=md_file.name, segment=segment_idx, chunk=index, voice=voice, model=stats.model, chars=len(chunk),
+                bytes=len(audio), cache_hit=stats.cache_hit, latency_s=round(stats.latency, 4),
+                queue_wait_s=round(stats.queue_wait, 4), backoff_s=round(stats.backoff, 4), retries=stats.retries,
+            )
+        progress.update(processed_tts_calls, limiter.in_flight, total_tts_calls)
+
+    # Chunks anstoßen, sobald der Tokenizer ihr Segment liefert; die Reihenfolge
+    # für das Zusammenfügen ergibt sich aus segment_files, nicht aus der Fertigstellung
+    try:
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                for segment in tokenizer:
+                    idx = len(segments)
+                    segments.append(segment)
+                    segment_files.append([])
+                    if segment.is_pause:
+                        # Stille entsteht erst beim Zusammenfügen, im Format der übrigen Teile
+                        segment_files[idx].append(Silence(segment.content))
+                    elif segment.is_include:
+                        include_file = SKRIPTE_DIR / segment.content
+                        if include_file.exists():
+                            segment_files[idx].append(include_file)
+                        else:
+                            progress.report(f"⚠  Include-Datei nicht gefunden: {segment.content}")
+                    else:
+                        for chunk in split_text_into_chunks(segment.content, settings.chunk_chars, settings.chunk_seconds):
+                            slot = segment_files[idx]
+                            slot.append(None)  # Platz für das Audio, in Skript-Reihenfolge
+                            total_tts_calls += 1
+                            tasks.create_task(synthesize_chunk(chunk, idx, len(slot) - 1, segment.voice))
+                        # Synthese läuft an, während der Rest des Skripts noch geparst wird
+                        await asyncio.sleep(0)
+
+                default_voice = tokenizer.initial_voice
+                for warning in tokenizer.warnings:
+                    progress.report(f"WARNUNG: {warning}")
+                if not tokenizer.has_voice:
+                    if default_voice == manifest_default_voice(previous):
+                        progress.report(f"Stimme: {default_voice} (aus letzter Generierung)")
+                    else:
+                        progress.report(f"Zufallsstimme: {default_voice} (keine #VOICE-Direktive im Skript)")
+
+                text_segments = [s for s in segments if not s.is_pause and not s.is_include]
+                pause_segments = [s for s in segments if s.is_pause]
+                include_segments = [s for s in segments if s.is_include]
+                total_chars = sum(len(s.content) for s in text_segments)
+                total_pause_secs = sum(s.content for s in pause_segments)
+
+                include_info = f", {len(include_segments)} Include(s)" if include_segments else ""
+                voice_counts = {}
+                for s in text_segments:
+                    voice_counts[s.voice] = voice_counts.get(s.voice, 0) + 1
+                voice_detail = ", ".join(f"{v}({c})" for v, c in sorted(voice_counts.items()))
+
+                progress.report(f"Segmente:  {len(segments)} ({len(text_segments)} Sprache, {len(pause_segments)} Pausen{include_info})")
+                progress.report(f"Stimmen:   {voice_detail}")
+                progress.report(f"Textmenge: {total_chars:,} Zeichen, ~{total_pause_secs}s Pausen")
+                # Include-Hashes lesen ggf. große Dateien: nicht auf dem Event-Loop
+                manifest = await writer.run(build_manifest, segments, default_voice, settings, backend.primary_model)
+                if previous is not None:
+                    # Unveränderte Segmente kommen aus dem TTS-Cache; nur geänderte kosten API-Aufrufe
+                    progress.report(f"Neubau:    {changed_segments(previous, manifest)}/{len(segments)} Segmente geändert")
+                progress.update(processed_tts_calls, limiter.in_flight, total_tts_calls)
+        except ExceptionGroup as group:
+            # Erster fehlgeschlagener Chunk als eigentliche Fehlerursache
+            raise group.exceptions[0] from group
+        finally:
+            progress.finish()
+
+        audio_files = [f for files in segment_files for f in files]
+        tts_time = time.monotonic() - file_start
+        progress.report(f"TTS fertig: {len(segments)} Segmente │ TTS-Aufrufe: {processed_tts_calls} │ {format_duration(tts_time)}")
+
+        # Alle Segmente zusammenfügen
+        merge_start = time.monotonic()
+        # Puffer nicht in den Prozess-Pool pickeln (eine Kopie je Chunk, doppelter Spitzenspeicher):
+        # Frames kopieren ist I/O, ffmpeg kodiert im eigenen Prozess — dafür genügt ein Thread
+        combine_pool = None if any(isinstance(f, AudioBuffer) for f in audio_files) else pool
+        timings = await run_blocking(combine_pool, combine_audio_files, audio_files, output_file, settings, include_cache)
+        await writer.run(write_manifest, output_file, manifest)
+        merge_time = time.monotonic() - merge_start
+        progress.report(f"{len(audio_files)} Audio-Teile zusammengefügt ({format_duration(merge_time)})")
+    finally:
+        # Zwischen-Audio freigeben, auch die fertigen Chunks eines gescheiterten oder abgebrochenen
+        # Skripts (Speicherbuchhaltung und ggf. ausgelagerte Dateien; synchron, auch bei Abbruch)
+        workspace.release([f for files in segment_files for f in files if f is not None])
 
-            for chunk_idx, chunk in enumerate(chunks):
-                chunk_file = temp_dir / f"segment_{idx:04d}_chunk_{chunk_idx:04d}.mp3"
-                await text_to_speech(client, chunk, chunk_file, voice=voice)
-                processed_tts_calls += 1
-                chunk_files.append(chunk_file)
+    file_size = output_file.stat().st_size
+    audio_secs = await writer.run(probe_duration, output_file)
+    total_time = time.monotonic() - file_start
+    audio_info = f"{format_duration(audio_secs)} Audio" if audio_secs is not None else "Dauer unbekannt"
+    progress.report(f"✓ {output_file.name} ({format_size(file_size)}, {audio_info}, {format_duration(total_time)} Verarbeitung)")
+    if metrics is not None:
+        metrics.record(
+            "script", script=md_file.name, ok=True, total_s=round(total_time, 3), tts_s=round(tts_time, 3),
+            **{f"{phase}_s": round(seconds, 4) for phase, seconds in timings.items()},
+            assemble_s=round(merge_time, 3), segments=len(segments), tts_calls=processed_tts_calls,
+            chars=sum(len(s.content) for s in segments if not s.is_pause and not s.is_include),
+            output_bytes=file_size, audio_s=round(audio_secs, 3) if audio_secs is not None else None,
+        )
+    return True
 
-            return chunk_files
 
-    # Segmente sequenziell verarbeiten (Reihenfolge wichtig!)
-    for idx, segment in enumerate(segments):
-        processed_segments += 1
-        pct = processed_segments * 100 // len(segments)
-        elapsed = time.monotonic() - file_start
-        bar = "█" * (pct // 5) + "░" * (20 - pct // 5)
+class FileWatcher(ABC):
+    """Meldet Änderungen im Skripte-Verzeichnis und an eingebundenen Dateien (Watch-Modus).
+
+    Geänderte Pfade landen in einer Queue; ``changes`` fasst sie zu einem
+    Schub zusammen, sobald ``debounce`` Sekunden lang nichts mehr kam —
+    mehrfaches Speichern im Editor löst so nur eine Generierung aus.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._queue: asyncio.Queue[Path] = asyncio.Queue()
+
+    @abstractmethod
+    def watch(self, paths: set[Path]) -> None:
+        """Beobachtet zusätzlich ``paths`` (Includes, ggf. außerhalb des Verzeichnisses)."""
+
+    @abstractmethod
+    def start(self) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    async def __aenter__(self) -> "FileWatcher":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    async def changes(self, debounce: float = WATCH_DEBOUNCE_SECONDS) -> set[Path]:
+        """Wartet auf die nächste Änderung und sammelt, bis ``debounce`` Sekunden Ruhe ist."""
+        changed = {await self._queue.get()}
+        while True:
+            try:
+                changed.add(await asyncio.wait_for(self._queue.get(), debounce))
+            except TimeoutError:
+                return changed
+
+
+class InotifyWatcher(FileWatcher):
+    """Linux: inotify über ctypes, ohne Zusatzpaket; der Event-Loop liest den Deskriptor direkt.
+
+    Verzeichnisse, die es noch nicht gibt (Include-Ordner, die erst später
+    angelegt werden), wartet der nächste vorhandene Vorfahr auf neue
+    Unterverzeichnisse ab; sobald sie entstehen, werden sie selbst beobachtet.
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_IGNORED = 0x8000  # Watch entfernt, z.B. weil das Verzeichnis gelöscht wurde
+    IN_MASK_ADD = 0x20000000
+    IN_ISDIR = 0x40000000
+    # Fertig geschrieben, umbenannt (Editoren speichern oft per rename) oder gelöscht
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+    EVENT = struct.Struct("iIII")  # struct inotify_event ohne den Namen
+
+    def __init__(self, directory: Path) -> None:
+        super().__init__(directory)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self._directories: dict[int, Path] = {}
+        self._watched: set[Path] = set()
+        self._pending: set[Path] = set()  # beobachtet, aber noch nicht vorhanden
+        self._watch_directory(directory)
+
+    def _add_watch(self, directory: Path, mask: int) -> None:
+        # IN_MASK_ADD: ein Verzeichnis kann selbst beobachtet und Vorfahr eines fehlenden sein
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), mask | self.IN_MASK_ADD)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch {directory} fehlgeschlagen")
+        self._directories[wd] = directory
+
+    def _watch_directory(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        # Fehlt es, auf den nächsten vorhandenen Vorfahren warten; danach erneut prüfen,
+        # falls dazwischen etwas angelegt wurde
+        ancestor = None
+        while not directory.is_dir():
+            nearest = next(p for p in directory.parents if p.is_dir())
+            if nearest == ancestor:
+                self._pending.add(directory)
+                return
+            ancestor = nearest
+            self._add_watch(ancestor, self.IN_CREATE | self.IN_MOVED_TO)
+        self._add_watch(directory, self.MASK)
+        self._watched.add(directory)
+        self._pending.discard(directory)
+
+    def _directory_created(self, new: Path) -> None:
+        for directory in [v for v in self._pending if v == new or new in v.parents]:
+            self._watch_directory(directory)
+            if directory in self._watched:
+                # Was vor dem Watch hineingeschrieben wurde, meldet inotify nicht mehr
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            self._queue.put_nowait(Path(entry.path))
+
+    def watch(self, paths: set[Path]) -> None:
+        # inotify beobachtet Verzeichnisse; Ereignisse anderer Dateien darin filtert der Aufrufer
+        for path in paths:
+            self._watch_directory(path.parent)
+
+    def start(self) -> None:
+        asyncio.get_running_loop().add_reader(self._fd, self._read)
+
+    def close(self) -> None:
+        asyncio.get_running_loop().remove_reader(self._fd)
+        os.close(self._fd)
+
+    def _read(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        pos = 0
+        while pos + self.EVENT.size <= len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, pos)
+            name = data[pos + self.EVENT.size:pos + self.EVENT.size + length].rstrip(b"\0")
+            pos += self.EVENT.size + length
+            if mask & self.IN_IGNORED:
+                # Verzeichnis gelöscht: wieder auf sein Anlegen warten
+                directory = self._directories.pop(wd, None)
+                if directory in self._watched:
+                    self._watched.discard(directory)
+                    self._watch_directory(directory)
+                continue
+            if not name or wd not in self._directories:
+                continue
+            path = self._directories[wd] / os.fsdecode(name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._directory_created(path)
+            elif self._directories[wd] in self._watched:
+                self._queue.put_nowait(path)
+
+
+class PollingWatcher(FileWatcher):
+    """Fallback ohne inotify (andere Systeme, Netzlaufwerke): vergleicht mtime und Größe per stat."""
+
+    def __init__(self, directory: Path, interval: float = WATCH_POLL_SECONDS) -> None:
+        super().__init__(directory)
+        self.interval = interval
+        self._extra: set[Path] = set()
+        self._state = self._snapshot()
+        self._task: asyncio.Task | None = None
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        state = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    st = entry.stat()
+                    state[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        for path in self._extra:
+            with contextlib.suppress(FileNotFoundError):
+                st = path.stat()
+                state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def watch(self, paths: set[Path]) -> None:
+        new = {p for p in paths if p.parent != self.directory} - self._extra
+        self._extra |= new
+        # Aktuellen Stand der neuen Dateien merken, sonst gälten sie beim nächsten Durchlauf als geändert
+        for path in new:
+            with contextlib.suppress(FileNotFoundError):
+                st = path.stat()
+                self._state[path] = (st.st_mtime_ns, st.st_size)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            new = await asyncio.to_thread(self._snapshot)
+            for path in new.keys() | self._state.keys():
+                if new.get(path) != self._state.get(path):
+                    self._queue.put_nowait(path)
+            self._state = new
+
+
+def create_watcher(directory: Path, polling: bool = False,
+                       interval: float = WATCH_POLL_SECONDS) -> FileWatcher:
+    """inotify, wo verfügbar; sonst (oder mit ``polling``) stat-Polling."""
+    if not polling and sys.platform == "linux":
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:  # AttributeError: libc ohne inotify
+            print(f"  inotify nicht verfügbar ({e}), nutze Polling")
+    return PollingWatcher(directory, interval)
 
-        if segment.is_pause:
-            pause_file = temp_dir / f"segment_{idx:04d}_pause.mp3"
-            create_silence(segment.content, pause_file)
-            audio_files.append(pause_file)
-            print(f"\r  {bar} {pct:3d}% │ {processed_segments}/{len(segments)} │ ⏸  Pause {segment.content}s │ {format_duration(elapsed)}", end="", flush=True)
-        elif segment.is_include:
-            include_file = SKRIPTE_DIR / segment.content
-            if include_file.exists():
-                audio_files.append(include_file)
-                print(f"\r  {bar} {pct:3d}% │ {processed_segments}/{len(segments)} │ 📎 Include: {segment.content} │ {format_duration(elapsed)}", end="", flush=True)
-            else:
-                print(f"\n  ⚠  Include-Datei nicht gefunden: {segment.content}")
-        else:
-            preview = segment.content[:50].replace('\n', ' ')
-            if len(segment.content) > 50:
-                preview += "…"
-            print(f"\r  {bar} {pct:3d}% │ {processed_segments}/{len(segments)} │ 🔊 {segment.voice}: {len(segment.content)} Z │ {format_duration(elapsed)}   ", end="", flush=True)
-            chunk_files = await process_text_segment(idx, segment.content, segment.voice)
-            audio_files.extend(chunk_files)
-
-    elapsed = time.monotonic() - file_start
-    print(f"\r  {'█' * 20} 100% │ {len(segments)}/{len(segments)} │ TTS-Aufrufe: {processed_tts_calls} │ {format_duration(elapsed)}       ")
-
-    # Alle Segmente zusammenfügen
-    print(f"  Füge {len(audio_files)} Audio-Dateien zusammen...", end="", flush=True)
-    merge_start = time.monotonic()
-    output_file = md_file.with_suffix(".mp3")
-    if len(audio_files) == 1:
-        shutil.move(audio_files[0], output_file)
-    else:
-        combine_audio_files(audio_files, output_file)
-        for audio_file in audio_files:
-            if audio_file.exists() and audio_file.parent == temp_dir:
-                audio_file.unlink()
-    merge_time = time.monotonic() - merge_start
-    print(f" ({format_duration(merge_time)})")
 
-    # Temporäres Verzeichnis aufräumen
-    if temp_dir.exists() and not any(temp_dir.iterdir()):
-        temp_dir.rmdir()
+def script_includes(md_file: Path) -> set[Path]:
+    """Alle per #INCLUDE eingebundenen Dateien eines Skripts."""
+    text = md_file.read_text(encoding="utf-8")
+    return {SKRIPTE_DIR / s.content for s in ScriptTokenizer(text) if s.is_include}
 
-    file_size = output_file.stat().st_size
-    total_time = time.monotonic() - file_start
-    # Geschätzte Audio-Dauer: MP3 bei ~128kbps → bytes / 16000 ≈ Sekunden
-    est_audio_secs = file_size / 16000
-    print(f"  ✓ {output_file.name} ({format_size(file_size)}, ~{format_duration(est_audio_secs)} Audio, {format_duration(total_time)} Verarbeitung)")
-    return True
 
+def refresh_includes(includes: dict[Path, set[Path]], changed: set[Path]) -> None:
+    """Liest die Includes nur der geänderten Skripte neu ein; gelöschte Skripte fallen heraus."""
+    for path in changed:
+        if path.suffix != ".md" or path.parent != SKRIPTE_DIR:
+            continue
+        try:
+            includes[path] = script_includes(path)
+        except FileNotFoundError:
+            includes.pop(path, None)
+
+
+def affected_scripts(changed: set[Path], includes: dict[Path, set[Path]],
+                       settings: AudioSettings, model: str = PRIMARY_MODEL) -> list[Path]:
+    """Skripte, die wegen ``changed`` neu generiert werden müssen.
+
+    Kandidaten sind geänderte Skripte und Skripte, die eine geänderte Datei
+    einbinden; neu generiert wird davon nur, was fehlt oder laut Manifest
+    veraltet ist. Eigene Ausgaben tauchen zwar als Änderung auf, lösen aber
+    so nichts aus (außer sie sind selbst irgendwo eingebunden).
+    """
+    changed = {p.resolve() for p in changed}
+    candidates = {p for p in changed if p.suffix == ".md" and p.parent == SKRIPTE_DIR.resolve()}
+    candidates |= {md.resolve() for md, files in includes.items() if {d.resolve() for d in files} & changed}
+    targets = []
+    for md_file in sorted(candidates):
+        if not md_file.exists():
+            continue
+        output_file = md_file.with_suffix(settings.suffix)
+        if get_missing_mp3s([md_file], settings.suffixes) or is_output_outdated(md_file, settings, model):
+            targets.append(md_file)
+        elif load_manifest(output_file) is None and output_file.stat().st_mtime < md_file.stat().st_mtime:
+            targets.append(md_file)  # Ausgabe ohne Manifest (ältere Version): nach Zeitstempel
+    return targets
+
+
+async def watch_scripts(args: argparse.Namespace, settings: AudioSettings, model: str,
+                        convert: Callable) -> None:
+    """Watch-Modus: beobachtet Skripte und Includes und generiert Betroffenes nach jeder Änderung neu.
+
+    ``convert`` bekommt die Liste der betroffenen Skripte und läuft mit
+    den warmen Ressourcen des Aufrufers (HTTP-Client, Caches, Prozess-Pool).
+    """
+    async with create_watcher(SKRIPTE_DIR, args.polling, args.poll_interval) as watcher:
+        kind = "inotify" if isinstance(watcher, InotifyWatcher) else f"Polling alle {args.poll_interval:g}s"
+        print(f"\n  Watch-Modus: beobachte {SKRIPTE_DIR} ({kind}, Entprellung {args.debounce:g}s), Strg+C beendet")
+        includes = await asyncio.to_thread(lambda: {md: script_includes(md) for md in get_md_files()})
+        while True:
+            watcher.watch(set().union(*includes.values()))
+            changed = await watcher.changes(args.debounce)
+            await asyncio.to_thread(refresh_includes, includes, changed)
+            targets = await asyncio.to_thread(affected_scripts, changed, includes, settings, model)
+            if targets:
+                print(f"\n  Änderung erkannt: {', '.join(p.name for p in targets)}\n")
+                await convert(targets)
+
+
+@dataclass
+class ScriptPlan:
+    """Was ein Skript im nächsten Lauf an TTS kosten würde (Trockenlauf)."""
+    md_file: Path
+    reason: str  # "fehlt" oder "veraltet"
+    chunks: list[tuple[str, int]]  # (Cache-Schlüssel, Zeichen) je Chunk
+    random_voice: bool  # Stimme wird erst beim Lauf gewürfelt: Cache-Treffer unbekannt
+
+
+def plan_scripts(md_files: list[Path], settings: AudioSettings, model: str = PRIMARY_MODEL) -> list[ScriptPlan]:
+    """Ermittelt fehlende und veraltete Skripte samt ihrer Chunks — ohne API-Aufrufe.
+
+    Jedes Skript wird genau einmal geparst und gechunkt; dieselben Chunks
+    dienen dem Manifest-Vergleich und der Planung.
+    """
+    plans = []
+    missing = set(get_missing_mp3s(md_files, settings.suffixes))
+    for md_file in md_files:
+        previous = None if md_file in missing else load_manifest(md_file.with_suffix(settings.suffix))
+        if md_file not in missing and previous is None:
+            continue  # vorhanden, ohne Manifest: gilt als aktuell
+        text = md_file.read_text(encoding="utf-8")
+        # Ohne #VOICE und ohne Manifest würfelt der Lauf die Stimme; "" markiert das hier
+        tokenizer = ScriptTokenizer(text, fallback_voice=manifest_default_voice(previous) or "")
+        segments = list(tokenizer)
+        chunks = [
+            None if s.is_pause or s.is_include
+            else split_text_into_chunks(s.content, settings.chunk_chars, settings.chunk_seconds)
+            for s in segments
+        ]
+        if md_file not in missing:
+            if build_manifest(segments, tokenizer.initial_voice, settings, model, chunks) == previous:
+                continue
+        plans.append(ScriptPlan(
+            md_file=md_file,
+            reason="fehlt" if md_file in missing else "veraltet",
+            chunks=[(TTSCache.key(model, s.voice, settings.internal_format, c), len(c))
+                    for s, segment_chunks in zip(segments, chunks) if segment_chunks for c in segment_chunks],
+            random_voice=not tokenizer.has_voice and tokenizer.initial_voice == "",
+        ))
+    return plans
+
+
+def estimate_latency(metrics_file: Path | None, model: str, max_bytes: int = 4 * 1024 * 1024) -> tuple[float, float, int] | None:
+    """Latenzmodell aus früheren Läufen: (Sekunden fix, Sekunden je Zeichen, Anzahl Messungen).
+
+    Lineare Regression über die echten API-Aufrufe (ohne Cache-Treffer und
+    Wiederholungen) des Modells; gelesen wird nur das Ende der Metrik-Datei.
+    """
+    if metrics_file is None or not metrics_file.exists():
+        return None
+    with open(metrics_file, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - max_bytes))
+        lines = f.read().splitlines()
+    if size > max_bytes:
+        lines = lines[1:]  # erste Zeile ist angeschnitten
+    points = []
+    for line in lines:
+        if b'"chunk"' not in line:
+            continue
+        with contextlib.suppress(ValueError):
+            row = json.loads(line)
+            if row.get("model") == model and not row.get("cache_hit") and not row.get("retries"):
+                points.append((row["chars"], row["latency_s"]))
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mx = sum(x for x, _ in points) / n
+    my = sum(y for _, y in points) / n
+    variance = sum((x - mx) ** 2 for x, _ in points)
+    slope = max(0.0, sum((x - mx) * (y - my) for x, y in points) / variance) if variance else 0.0
+    return max(0.0, my - slope * mx), slope, n
+
+
+def print_plan(args: argparse.Namespace, settings: AudioSettings, model: str = PRIMARY_MODEL) -> None:
+    """Trockenlauf: was der nächste Lauf an TTS-Aufrufen, Kosten und Zeit bräuchte."""
+    start = time.monotonic()
+    plans = plan_scripts(get_md_files(), settings, model)
+    cache = TTSCache(TTS_CACHE_DIR)
+    seen: set = set()
+    calls = hits = duplicates = total_chars = api_chars = 0
+    api_chunks = []
+    for plan in plans:
+        for key, chars in plan.chunks:
+            total_chars += chars
+            # Zufallsstimmen verschiedener Skripte sind verschieden: nicht über Skripte deduplizieren
+            dedup_key = (plan.md_file, key) if plan.random_voice else key
+            if dedup_key in seen:
+                duplicates += 1
+            elif not plan.random_voice and cache.contains(key, settings.internal_format):
+                hits += 1
+                seen.add(dedup_key)
+            else:
+                calls += 1
+                api_chars += chars
+                api_chunks.append(chars)
+                seen.add(dedup_key)
+    audio_minutes = api_chars / SPEECH_CHARS_PER_SECOND / 60
+
+    latency = estimate_latency(args.metrics, model)
+    fix, per_char = (latency[0], latency[1]) if latency else (PLAN_LATENCY_SECONDS[0], PLAN_LATENCY_SECONDS[1] / 1000)
+    api_seconds = sum(fix + per_char * chars for chars in api_chunks)
+    # Engpass: Nebenläufigkeit oder eines der Token-Buckets
+    wall_time = max(
+        api_seconds / args.parallel_requests,
+        calls / args.requests_per_minute * 60,
+        api_chars / args.chars_per_minute * 60,
+    )
+
+    print(f"Trockenlauf (keine API-Aufrufe), Modell {model}:")
+    for plan in plans:
+        voice = ", Zufallsstimme" if plan.random_voice else ""
+        print(f"  {plan.md_file.name:<40} {plan.reason:<9} {len(plan.chunks):>4} Chunks, "
+              f"{sum(z for _, z in plan.chunks):>8,} Zeichen{voice}")
+    if plans:
+        print()
+    missing_count = sum(1 for p in plans if p.reason == "fehlt")
+    print(f"  Skripte zu generieren: {len(plans)} ({missing_count} fehlen, {len(plans) - missing_count} veraltet)")
+    print(f"  Textmenge:             {total_chars:,} Zeichen in {hits + calls + duplicates} Chunks")
+    print(f"  TTS-Aufrufe:           {calls} (außerdem {hits} Cache-Treffer, {duplicates} Duplikate)")
+    print(f"  Zu synthetisieren:     {api_chars:,} Zeichen ≈ {format_duration(audio_minutes * 60)} Audio")
+    print(f"  Geschätzte Kosten:     ${audio_minutes * args.cost_per_minute:,.2f} "
+          f"({args.cost_per_minute:g} $/Audio-Minute)")
+    source = (f"Latenz aus {latency[2]} Messungen: {fix:.2f}s + {per_char * 1000:.2f}s/1000 Zeichen" if latency
+                else f"keine Messwerte, angenommen {fix:.1f}s + {per_char * 1000:.1f}s/1000 Zeichen")
+    print(f"  Geschätzte TTS-Dauer:  ~{format_duration(wall_time)} ({args.parallel_requests} parallele Anfragen, {source})")
+    print(f"  Planung:               {time.monotonic() - start:.2f} s")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="fruehsport-audio.py",
+        description="Konvertiert alle Skripte in Skripte/ ohne zugehörige MP3 zu Audio.",
+        epilog="Veraltete Ausgaben (laut Manifest) werden komplett neu zusammengefügt. Nur der TTS-Cache "
+               "spart dabei Anfragen: unveränderte Abschnitte kommen aus Cache/tts, fehlt ihr Eintrag, "
+               "werden sie neu synthetisiert.",
+    )
+    parser.add_argument(
+        "--parallel-skripte", dest="parallel_scripts", type=int, default=1, metavar="N",
+        help="Batch-Modus: bis zu N Skripte gleichzeitig konvertieren (Default: 1)",
+    )
+    parser.add_argument(
+        "--parallele-anfragen", dest="parallel_requests", type=int, default=MAX_CONCURRENT_REQUESTS, metavar="N",
+        help="Obergrenze gleichzeitiger TTS-Anfragen über alle Skripte; das adaptive Limit "
+             f"startet bei {CONCURRENT_REQUESTS} (Default: {MAX_CONCURRENT_REQUESTS})",
+    )
+    parser.add_argument(
+        "--anfragen-pro-minute", dest="requests_per_minute", type=float, default=REQUESTS_PER_MINUTE, metavar="N",
+        help=f"Token-Bucket für TTS-Anfragen pro Minute (Default: {REQUESTS_PER_MINUTE})",
+    )
+    parser.add_argument(
+        "--zeichen-pro-minute", dest="chars_per_minute", type=float, default=CHARS_PER_MINUTE, metavar="N",
+        help=f"Token-Bucket für Textzeichen pro Minute (Default: {CHARS_PER_MINUTE})",
+    )
+    parser.add_argument(
+        "--intern-format", dest="internal_format", choices=("mp3", "pcm"), default="mp3",
+        help="Zwischenformat der TTS-Chunks: mp3 (frame-genaues Zusammenfügen) oder pcm "
+             "(verlustfrei, genau eine Kodierung am Ende) (Default: mp3)",
+    )
+    parser.add_argument(
+        "--codec", action="append", metavar="CODEC[:RATE]",
+        help=f"Ausgabeformat ({', '.join(sorted(OUTPUT_CODECS))}), wiederholbar oder kommagetrennt, "
+             "z.B. --codec mp3-vbr:V4,opus:48k; das erste ist maßgeblich für Manifest und "
+             "Konvertierungsstatus, weitere entstehen aus demselben PCM-Strom (Default: mp3)",
+    )
+    parser.add_argument(
+        "--bitrate", default=MP3_BITRATE, metavar="RATE",
+        help=f"Bitrate für Codecs ohne eigene Angabe, wenn neu kodiert wird, z.B. 64k (Default: {MP3_BITRATE}; "
+             f"mp3-vbr: {VBR_QUALITY})",
+    )
+    parser.add_argument(
+        "--encoder-prozesse", dest="encoder_processes", type=int, default=os.cpu_count() or 1, metavar="N",
+        help="Größe des Prozess-Pools für Zusammenfügen und Kodieren (Default: Anzahl CPU-Kerne)",
+    )
+    parser.add_argument(
+        "--bibliothek-kodieren", dest="encode_library", action="store_true",
+        help="keine TTS: vorhandene Ausgaben aller Skripte parallel in die fehlenden --codec-Formate umkodieren",
+    )
+    watch = parser.add_argument_group("Watch-Modus (--watch)")
+    watch.add_argument(
+        "--watch", action="store_true",
+        help="nach dem ersten Durchlauf weiterlaufen und geänderte Skripte bzw. Includes neu generieren",
+    )
+    watch.add_argument("--entprellung", dest="debounce", type=float, default=WATCH_DEBOUNCE_SECONDS, metavar="SEK",
+                       help=f"Ruhezeit nach der letzten Änderung vor dem Generieren (Default: {WATCH_DEBOUNCE_SECONDS:g})")
+    watch.add_argument("--polling", action="store_true",
+                       help="stat-Polling statt inotify erzwingen (z.B. für Netzlaufwerke)")
+    watch.add_argument("--poll-intervall", dest="poll_interval", type=float, default=WATCH_POLL_SECONDS, metavar="SEK",
+                       help=f"Abstand der Polling-Durchläufe (Default: {WATCH_POLL_SECONDS:g})")
+    parser.add_argument(
+        "--metriken", dest="metrics", type=Path, default=METRICS_FILE, metavar="DATEI",
+        help="Messwerte je Chunk und Skript als JSON-Zeilen anhängen "
+             "(Default: Logs/fruehsport-audio-metriken.jsonl)",
+    )
+    parser.add_argument(
+        "--keine-metriken", dest="metrics", action="store_const", const=None,
+        help="keine Metrik-Datei schreiben (Zusammenfassung am Ende bleibt)",
+    )
+    parser.add_argument(
+        "--trockenlauf", dest="dry_run", action="store_true",
+        help="keine TTS: für alle fehlenden/veralteten Skripte Zeichen, TTS-Aufrufe (nach Cache und "
+             "Duplikaten), Kosten und Dauer schätzen",
+    )
+    parser.add_argument(
+        "--kosten-pro-minute", dest="cost_per_minute", type=float, default=COST_PER_AUDIO_MINUTE_USD, metavar="USD",
+        help=f"Preis je Minute erzeugter Sprache für --trockenlauf (Default: {COST_PER_AUDIO_MINUTE_USD})",
+    )
+    parser.add_argument(
+        "--dauer-scan", dest="duration_scan", action="store_true",
+        help="keine TTS: exakte Dauer aller Audiodateien in Skripte/ aus den Kopfdaten lesen (ohne Dekodieren)",
+    )
+    parser.add_argument(
+        "--chunk-zeichen", dest="chunk_chars", type=int, default=MAX_CHUNK_SIZE, metavar="N",
+        help=f"maximale Zeichen je TTS-Anfrage (Default und Obergrenze: {MAX_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--chunk-sekunden", dest="chunk_seconds", type=float, default=None, metavar="SEK",
+        help="maximale geschätzte Audiodauer je TTS-Anfrage; kleinere Chunks laufen parallel "
+             f"(≈ {SPEECH_CHARS_PER_SECOND} Zeichen/s, Default: aus)",
+    )
+    parser.add_argument(
+        "--speicher-limit", dest="memory_limit", type=int, default=WORKSPACE_MAX_MEMORY_MB, metavar="MB",
+        help="Zwischen-Audio des Laufs bis zu dieser Größe im Speicher halten, darüber auf Platte "
+             f"auslagern (0 = immer auslagern, Default: {WORKSPACE_MAX_MEMORY_MB})",
+    )
+    parser.add_argument(
+        "--arbeitsverzeichnis", dest="work_dir", type=Path, default=None, metavar="DIR",
+        help="Basis für ausgelagertes Zwischen-Audio, z.B. ein tmpfs; je Lauf entsteht darin "
+             "ein eigenes Verzeichnis, das am Ende entfernt wird (Default: System-Temp)",
+    )
+    offline = parser.add_argument_group("Offline-Backend (--backend offline)")
+    offline.add_argument(
+        "--backend", choices=("openai", "offline"), default="openai",
+        help="openai: echte API; offline: deterministischer lokaler Ton-Generator "
+             "für Benchmarks und Lasttests, ohne API-Key (Default: openai)",
+    )
+    offline.add_argument("--offline-latenz", dest="offline_latency", type=float, default=0.3, metavar="SEK",
+                         help="simulierte Antwortzeit pro Anfrage (Default: 0.3)")
+    offline.add_argument("--offline-jitter", type=float, default=0.1, metavar="SEK",
+                         help="zufällige Abweichung der Antwortzeit (Default: 0.1)")
+    offline.add_argument("--offline-drossel-rate", dest="offline_throttle_rate", type=float, default=0.0, metavar="P",
+                         help="Anteil der Anfragen, die mit 429 abgelehnt werden (Default: 0)")
+    offline.add_argument("--offline-fehler-rate", dest="offline_failure_rate", type=float, default=0.0, metavar="P",
+                         help="Anteil der Anfragen, die mit 503 scheitern (Default: 0)")
+    offline.add_argument("--offline-kapazitaet", dest="offline_capacity", type=int, default=None, metavar="N",
+                         help="simulierter Server: mehr als N gleichzeitige Anfragen → 429")
+    args = parser.parse_args(argv)
+    if args.parallel_scripts < 1 or args.parallel_requests < 1:
+        parser.error("--parallel-skripte und --parallele-anfragen müssen mindestens 1 sein")
+    if args.requests_per_minute <= 0 or args.chars_per_minute <= 0:
+        parser.error("--anfragen-pro-minute und --zeichen-pro-minute müssen positiv sein")
+    try:
+        args.outputs = parse_codec_specs(args.codec or ["mp3"], args.bitrate)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.encoder_processes < 1:
+        parser.error("--encoder-prozesse muss mindestens 1 sein")
+    if not 1 <= args.chunk_chars <= MAX_CHUNK_SIZE:
+        parser.error(f"--chunk-zeichen muss zwischen 1 und {MAX_CHUNK_SIZE} liegen")
+    if args.chunk_seconds is not None and args.chunk_seconds <= 0:
+        parser.error("--chunk-sekunden muss positiv sein")
+    if args.debounce < 0 or args.poll_interval <= 0:
+        parser.error("--entprellung darf nicht negativ, --poll-intervall muss positiv sein")
+    if args.memory_limit < 0:
+        parser.error("--speicher-limit darf nicht negativ sein")
+    if args.work_dir is not None and not args.work_dir.is_dir():
+        parser.error(f"--arbeitsverzeichnis {args.work_dir} ist kein Verzeichnis")
+    if not (0 <= args.offline_throttle_rate <= 1 and 0 <= args.offline_failure_rate <= 1):
+        parser.error("--offline-drossel-rate und --offline-fehler-rate müssen zwischen 0 und 1 liegen")
+    return args
+
+
+def parse_codec_specs(specs: list[str], default_bitrate: str) -> list[tuple[str, str]]:
+    """``["mp3-vbr:V4,opus:48k"]`` → ``[("mp3-vbr", "V4"), ("opus", "48k")]``; ValueError bei Unsinn."""
+    outputs = []
+    for spec in (part.strip() for item in specs for part in item.split(",")):
+        codec, _, rate = spec.partition(":")
+        if codec not in OUTPUT_CODECS:
+            raise ValueError(f"Unbekannter Codec '{codec}' (verfügbar: {', '.join(sorted(OUTPUT_CODECS))})")
+        vbr = OUTPUT_CODECS[codec].vbr
+        rate = rate or (VBR_QUALITY if vbr else default_bitrate)
+        if vbr and not re.fullmatch(r"[Vv]?\d", rate):
+            raise ValueError(f"{codec}: Qualitätsstufe V0..V9 erwartet, nicht '{rate}'")
+        outputs.append((codec, rate))
+    suffixes = [OUTPUT_CODECS[codec].suffix for codec, _ in outputs]
+    if len(set(suffixes)) != len(suffixes):
+        raise ValueError("Jedes Ausgabeformat braucht eine eigene Dateiendung (z.B. nicht mp3 und mp3-vbr zusammen)")
+    return outputs
+
+
+def create_backend(args: argparse.Namespace) -> TTSBackend:
+    if args.backend == "offline":
+        return OfflineBackend(
+            latency=args.offline_latency,
+            jitter=args.offline_jitter,
+            throttle_rate=args.offline_throttle_rate,
+            failure_rate=args.offline_failure_rate,
+            capacity=args.offline_capacity,
+        )
+    return OpenAIBackend()
+
+
+async def reencode_library(settings: AudioSettings, workers: int) -> None:
+    """Kodiert vorhandene Ausgaben aller Skripte in die fehlenden bzw. veralteten Formate um.
+
+    Quelle ist je Skript die erste vorhandene Ausgabe (bevorzugt MP3); jedes
+    Skript ist ein Auftrag im Prozess-Pool, der alle Zielformate in einem
+    Decoder-Durchlauf schreibt — bei großen Bibliotheken also so parallel wie
+    Kerne vorhanden sind.
+    """
+    start = time.monotonic()
+    jobs: list[tuple[Path, list[tuple[Path, str, str]]]] = []
+    for md_file in get_md_files():
+        sources = [md_file.with_suffix(suffix) for suffix in dict.fromkeys((".mp3", *settings.suffixes))]
+        source = next((f for f in sources if f.exists()), None)
+        if source is None:
+            continue
+        targets = [
+            (target, codec, rate)
+            for codec, rate in settings.outputs
+            if (target := md_file.with_suffix(OUTPUT_CODECS[codec].suffix)) != source
+            and (not target.exists() or target.stat().st_mtime < source.stat().st_mtime)
+        ]
+        if targets:
+            jobs.append((source, targets))
+
+    outputs = ", ".join(codec for codec, _ in settings.outputs)
+    print(f"Bibliothek umkodieren: {len(jobs)} Datei(en) → {outputs} ({workers} Prozesse)")
+    if not jobs:
+        return
+    pool = create_process_pool(workers)
+    done = 0
+    failed = []
+    total_bytes = 0
+
+    async def reencode_one(source: Path, targets: list[tuple[Path, str, str]]) -> None:
+        nonlocal done, total_bytes
+        try:
+            total_bytes += await run_blocking(pool, reencode_file, source, targets)
+            status = "✓"
+        except Exception as e:
+            failed.append(source.name)
+            status = f"✗ {e}"
+        done += 1
+        print(f"  [{done}/{len(jobs)}] {source.name} → {', '.join(t.name for t, _, _ in targets)} {status}")
 
-async def main():
+    try:
+        await asyncio.gather(*(reencode_one(source, targets) for source, targets in jobs))
+    finally:
+        pool.shutdown(cancel_futures=True)
+    print(f"\n  {done - len(failed)} umkodiert, {format_size(total_bytes)}, {format_duration(time.monotonic() - start)}")
+    if failed:
+        print(f"  Fehlgeschlagen: {', '.join(failed)}")
+
+
+def print_library_durations() -> None:
+    """Listet die Dauer aller Audiodateien in SKRIPTE_DIR; gelesen werden nur Kopfdaten, parallel in Threads."""
+    start = time.monotonic()
+    suffixes = {codec.suffix for codec in OUTPUT_CODECS.values()}
+    files = sorted(p for p in SKRIPTE_DIR.iterdir() if p.suffix in suffixes and p.is_file())
+    results = scan_durations(files)
+    total = 0.0
+    unknown = []
+    for path, seconds in results:
+        if seconds is None:
+            unknown.append(path.name)
+            continue
+        total += seconds
+        print(f"  {format_duration(seconds):>8}  {seconds:10.3f} s  {path.name}")
+    print(f"\n  {len(results) - len(unknown)} Datei(en), Gesamtdauer {format_duration(total)}, "
+          f"gelesen in {time.monotonic() - start:.2f} s")
+    if unknown:
+        print(f"  Dauer unbekannt: {', '.join(unknown)}")
+
+
+async def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    (codec, bitrate), *extra_outputs = args.outputs
+    settings = AudioSettings(
+        internal_format=args.internal_format, codec=codec, bitrate=bitrate, extra_outputs=tuple(extra_outputs),
+        chunk_chars=args.chunk_chars, chunk_seconds=args.chunk_seconds,
+    )
+    if args.duration_scan:
+        print_library_durations()
+        return
+    if args.dry_run:
+        # Ohne Backend: kein Client, kein API-Key nötig
+        print_plan(args, settings, OfflineBackend.primary_model if args.backend == "offline" else PRIMARY_MODEL)
+        return
+    if args.encode_library:
+        check_ffmpeg()
+        await reencode_library(settings, args.encoder_processes)
+        return
+    backend = create_backend(args)
     check_ffmpeg()
-    total_start = time.monotonic()
 
     print(f"{'─' * 60}")
     print(f"  Frühsport Audio Generator")
     print(f"  Skripte-Verzeichnis: {SKRIPTE_DIR}")
-    print(f"  TTS-Modell: {PRIMARY_MODEL} (Fallback: {FALLBACK_MODEL})")
-    print(f"  Parallele Anfragen: {CONCURRENT_REQUESTS}")
+    fallback = f" (Fallback: {backend.fallback_model})" if backend.fallback_model else ""
+    print(f"  TTS-Backend: {backend.name}, Modell {backend.primary_model}{fallback}")
+    print(f"  Parallele Anfragen: {min(CONCURRENT_REQUESTS, args.parallel_requests)} → max. {args.parallel_requests} (global, adaptiv)")
+    print(f"  Rate-Limit: {args.requests_per_minute:g} Anfragen/min, {args.chars_per_minute:g} Zeichen/min")
+    print(f"  Parallele Skripte:  {args.parallel_scripts}")
+    outputs = ", ".join(f"{codec} ({OUTPUT_CODECS[codec].suffix}, {rate})" for codec, rate in settings.outputs)
+    print(f"  Audio: intern {settings.internal_format}, Ausgabe {outputs}")
+    print(f"  Encoder-Prozesse: {args.encoder_processes}")
+    spill_dir = args.work_dir or tempfile.gettempdir()
+    print(f"  Zwischen-Audio: bis {args.memory_limit} MB im Speicher, darüber in {spill_dir}")
+    print(f"  TTS-Cache: {TTS_CACHE_DIR} (max. {format_size(TTS_CACHE_MAX_BYTES)})")
+    print(f"  Include-Cache: {INCLUDE_CACHE_DIR}")
     print(f"{'─' * 60}")
     print()
 
@@ -385,49 +2768,111 @@ async def main():
     if not md_files:
         print("Keine Skripte gefunden.")
         print(f"Lege Frühsport-Skripte in {SKRIPTE_DIR} ab.")
-        return
+        if not args.watch:
+            return
 
-    missing = get_missing_mp3s(md_files)
-    already_converted = len(md_files) - len(missing)
+    missing = get_missing_mp3s(md_files, settings.suffixes)
+    outdated = [f for f in md_files if f not in missing and is_output_outdated(f, settings, backend.primary_model)]
+    already_converted = len(md_files) - len(missing) - len(outdated)
+    missing += outdated
 
     print(f"  Skripte gesamt:       {len(md_files)}")
     print(f"  Bereits konvertiert:  {already_converted}")
+    print(f"  Veraltet (Manifest):  {len(outdated)}")
     print(f"  Zu konvertieren:      {len(missing)}")
 
     if not missing:
         print("\n  Alle Skripte sind bereits konvertiert.")
-        return
-
-    print(f"\n{'─' * 60}\n")
-
-    client = AsyncOpenAI()
-    converted = 0
-    failed = []
-
-    for i, md_file in enumerate(missing, 1):
-        print(f"┌─ [{i}/{len(missing)}] {md_file.name}")
-        try:
-            if await convert_script_to_mp3(client, md_file):
-                converted += 1
-        except Exception as e:
-            print(f"  ✗ FEHLER: {e}")
-            failed.append(md_file.name)
-
-        elapsed_total = time.monotonic() - total_start
-        if i < len(missing):
-            avg_per_file = elapsed_total / i
-            eta = avg_per_file * (len(missing) - i)
-            print(f"└─ Gesamt: {format_duration(elapsed_total)} │ Verbleibend: ~{len(missing) - i} Dateien, ~{format_duration(eta)}")
-        print()
+        if not args.watch:
+            return
+    else:
+        print(f"\n{'─' * 60}\n")
+
+    # Zusammenfügen/Kodieren im Prozess-Pool; der Pool startet, bevor Threads laufen
+    pool = create_process_pool(args.encoder_processes)
+    writer = FileWriter()
+    # Eigener Arbeitsbereich dieses Laufs; wird am Ende entfernt, auch bei Fehler oder Strg+C
+    workspace = Workspace(args.memory_limit * 1024 * 1024, args.work_dir)
+    cache = TTSCache(TTS_CACHE_DIR)
+    include_cache = IncludeCache(INCLUDE_CACHE_DIR)
+    metrics = Metrics(args.metrics)
+    # Ein gemeinsames Anfrage-Budget für alle gleichzeitig laufenden Skripte
+    limiter = RateLimiter(
+        max_concurrency=args.parallel_requests,
+        requests_per_minute=args.requests_per_minute,
+        chars_per_minute=args.chars_per_minute,
+    )
+    script_slots = asyncio.Semaphore(args.parallel_scripts)
+    batch = args.parallel_scripts > 1
+    display = ProgressDisplay(with_prefix=batch)
+
+    async def convert_batch(scripts: list[Path]) -> None:
+        """Konvertiert ``scripts`` mit den Ressourcen dieses Laufs; im Watch-Modus je Änderung erneut."""
+        batch_start = time.monotonic()
+        converted = 0
+        finished = 0
+        failed = []
+
+        async def convert_one(i: int, md_file: Path) -> None:
+            """Konvertiert ein Skript; Fehler bleiben auf dieses Skript beschränkt."""
+            nonlocal converted, finished
+            async with script_slots:
+                display.line(f"┌─ [{i}/{len(scripts)}] {md_file.name}")
+                progress = display.script(md_file.name)
+                script_start = time.monotonic()
+                try:
+                    if await convert_script_to_mp3(backend, md_file, cache, limiter, progress, settings, pool,
+                                                   writer, workspace, include_cache, metrics):
+                        converted += 1
+                except Exception as e:
+                    progress.report(f"✗ FEHLER: {e}")
+                    failed.append(md_file.name)
+                    metrics.record("script", script=md_file.name, ok=False, error=str(e),
+                                     total_s=round(time.monotonic() - script_start, 3))
+
+                finished += 1
+                elapsed_total = time.monotonic() - batch_start
+                remaining = len(scripts) - finished
+                status = f"└─ {md_file.name} │ " if batch else "└─ "
+                if remaining:
+                    eta = elapsed_total / finished * remaining
+                    display.line(f"{status}Gesamt: {format_duration(elapsed_total)} │ Verbleibend: ~{remaining} Dateien, ~{format_duration(eta)}")
+                elif batch:
+                    display.line(f"{status}Gesamt: {format_duration(elapsed_total)}")
+                display.line("")
+
+        await asyncio.gather(*(convert_one(i, md_file) for i, md_file in enumerate(scripts, 1)))
+
+        total_time = time.monotonic() - batch_start
+        print(f"{'═' * 60}")
+        print(f"  Fertig!")
+        print(f"  Konvertiert:   {converted}/{len(scripts)} Datei(en)")
+        if failed:
+            print(f"  Fehlgeschlagen: {len(failed)} ({', '.join(failed)})")
+        lookups = cache.hits + cache.misses
+        hit_rate = f" ({cache.hits * 100 // lookups}% Treffer)" if lookups else ""
+        print(f"  TTS-Cache:     {cache.hits} Treffer, {cache.misses} Fehlgriffe{hit_rate}, "
+              f"{format_size(cache.size)}, {cache.evictions} verdrängt")
+        print(f"  Rate-Limiter:  {limiter.summary()}")
+        spilled = f", {format_size(workspace.spilled_bytes)} ausgelagert" if workspace.spilled_bytes else ""
+        print(f"  Zwischen-Audio: max. {format_size(workspace.peak_memory)} im Speicher{spilled}")
+        for line in metrics.summary():
+            print(f"  {line}")
+        if args.metrics is not None:
+            print(f"  Metriken:      {args.metrics}")
+        print(f"  Gesamtdauer:   {format_duration(total_time)}")
+        print(f"{'═' * 60}")
 
-    total_time = time.monotonic() - total_start
-    print(f"{'═' * 60}")
-    print(f"  Fertig!")
-    print(f"  Konvertiert:   {converted}/{len(missing)} Datei(en)")
-    if failed:
-        print(f"  Fehlgeschlagen: {len(failed)} ({', '.join(failed)})")
-    print(f"  Gesamtdauer:   {format_duration(total_time)}")
-    print(f"{'═' * 60}")
+    try:
+        if missing:
+            await convert_batch(missing)
+        if args.watch:
+            # Backend (HTTP-Client), Caches, Pool und Limiter bleiben für alle weiteren Durchläufe warm
+            await watch_scripts(args, settings, backend.primary_model, convert_batch)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        workspace.close()
+        metrics.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.11"
+# dependencies = []
+# ///
+
+"""
+fruehsport-benchmark: Misst die Generierungs-Pipeline von fruehsport-audio an synthetischen Skripten.
+
+Erzeugt deterministische Skripte (5 Minuten bis 3 Stunden) mit vielen
+Pausen, Includes und Stimmwechseln und lässt sie gegen das Offline-Backend
+laufen — ohne API-Key, ohne Netz. Pro Phase werden Laufzeit, Spitzen-RSS,
+gestartete Prozesse und geschriebene Bytes erfasst:
+
+  parse     parse_script
+  chunks    split_text_into_chunks über alle Text-Segmente
+  silence   create_silence für alle Pausen
+  tts       Offline-Synthese aller Chunks (text_to_speech)
+  combine   combine_audio_files über alle Teile (füllt den Include-Cache)
+  convert   convert_script_to_mp3 Ende-zu-Ende (Include-Cache warm)
+
+Die Ergebnisse landen als JSON in Benchmarks/; mit ``--vergleiche`` wird gegen
+einen früheren Lauf verglichen und bei Regressionen mit Exit-Code 1 beendet.
+
+Benötigt ffmpeg (wie fruehsport-audio selbst).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+BENCHMARK_DIR = SCRIPT_DIR.parent / "Benchmarks"
+
+DAUERN_MINUTEN = (5, 30, 90, 180)  # Standard-Größen der synthetischen Skripte
+SPRECH_ZEICHEN_PRO_SEKUNDE = 15  # wie OfflineBackend: Textlänge → Audiodauer
+TOLERANZ = 0.25  # Relative Verschlechterung, ab der ein Vergleich als Regression gilt
+MIN_SEKUNDEN_FUER_VERGLEICH = 0.05  # Kürzere Phasen schwanken zu stark für einen Zeitvergleich
+
+WOERTER = (
+    "Arme", "Beine", "Schultern", "langsam", "kreisen", "strecken", "atmen", "tief", "ein", "aus",
+    "Knie", "beugen", "Rücken", "gerade", "Hüfte", "locker", "Schritt", "nach", "vorne", "hinten",
+    "links", "rechts", "halten", "Spannung", "lösen", "Füße", "Boden", "Becken", "Kopf", "Nacken",
+)
+STIMMEN = ("nova", "onyx", "coral", "sage")
+
+
+def lade_generator():
+    """Lädt fruehsport-audio.py als Modul (der Dateiname ist kein gültiger Modulname).
+
+    Registriert in ``sys.modules``, damit der Prozess-Pool Funktionen daraus übergeben kann.
+    """
+    spec = importlib.util.spec_from_file_location("fruehsport_audio", SCRIPT_DIR / "fruehsport-audio.py")
+    modul = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = modul
+    spec.loader.exec_module(modul)
+    return modul
+
+
+def erzeuge_skript(minuten: int, seed: int = 0) -> tuple[str, list[str]]:
+    """Synthetisches Skript mit ungefähr ``minuten`` Spieldauer.
+
+    Etwa 70 % Sprache, 25 % Pausen, der Rest Includes; Stimmwechsel alle
+    paar Absätze. Liefert den Skripttext und die Namen der Include-Dateien.
+    """
+    rng = random.Random(seed * 1000 + minuten)
+    sprache = minuten * 60 * 0.70
+    pausen = minuten * 60 * 0.25
+    includes = ["include-kurz.mp3", "include-lang.mp3"]
+    zeilen = [f"# Benchmark {minuten} Minuten", "", "Vorspann, wird nicht gesprochen.", "", "#START", ""]
+    absatz = 0
+    while sprache > 0 or pausen > 0:
+        if absatz % 4 == 0:
+            zeilen += [f"#VOICE {rng.choice(STIMMEN)}", ""]
+        saetze = []
+        for _ in range(rng.randint(2, 6)):
+            satz = " ".join(rng.choice(WOERTER) for _ in range(rng.randint(5, 14)))
+            saetze.append(satz[0].upper() + satz[1:] + rng.choice((".", ".", "!", "?")))
+        text = " ".join(saetze)
+        zeilen += [text, ""]
+        sprache -= len(text) / SPRECH_ZEICHEN_PRO_SEKUNDE
+        if pausen > 0:
+            dauer = rng.choice((3, 5, 10, 15, 30))
+            zeilen += [f"#PAUSE {dauer}", ""]
+            pausen -= dauer
+        if absatz % 10 == 9:
+            zeilen += [f"#INCLUDE {rng.choice(includes)}", ""]
+        absatz += 1
+    return "\n".join(zeilen), includes
+
+
+class ProzessZaehler:
+    """Zählt gestartete Kindprozesse (subprocess und asyncio laufen beide über ``subprocess.Popen``)."""
+
+    def __init__(self) -> None:
+        self.anzahl = 0
+
+    @contextlib.contextmanager
+    def aktiv(self):
+        original = subprocess.Popen
+        zaehler = self
+
+        class ZaehlendesPopen(original):
+            def __init__(self, *args, **kwargs):
+                zaehler.anzahl += 1
+                super().__init__(*args, **kwargs)
+
+        subprocess.Popen = ZaehlendesPopen
+        try:
+            yield
+        finally:
+            subprocess.Popen = original
+
+
+def _proc_wert(datei: str, schluessel: str) -> int | None:
+    """Liest einen Zahlenwert aus /proc/self/<datei> (Linux); None anderswo."""
+    try:
+        for zeile in Path("/proc/self", datei).read_text().splitlines():
+            name, _, wert = zeile.partition(":")
+            if name == schluessel:
+                return int(wert.split()[0])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _setze_rss_spitze_zurueck() -> bool:
+    """Setzt VmHWM zurück, damit die RSS-Spitze pro Phase gilt (Linux ≥ 4.0)."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def _verzeichnis_bytes(verzeichnis: Path) -> int:
+    return sum(p.stat().st_size for p in verzeichnis.rglob("*") if p.is_file())
+
+
+class Messung:
+    """Misst eine Phase: Laufzeit, Spitzen-RSS, Prozessstarts, geschriebene Bytes.
+
+    - ``peak_rss_bytes``: Spitze dieses Prozesses während der Phase (ohne
+      Linux-Reset: Spitze seit Programmstart).
+    - ``child_peak_rss_bytes``: größter Kindprozess bisher (nicht rücksetzbar).
+    - ``bytes_written``: Zuwachs der Dateien im Arbeitsverzeichnis (erfasst
+      auch Schreibvorgänge von ffmpeg); ``write_syscall_bytes`` zählt nur die
+      write()-Aufrufe dieses Prozesses.
+    """
+
+    def __init__(self, zaehler: ProzessZaehler, arbeitsverzeichnis: Path) -> None:
+        self.zaehler = zaehler
+        self.arbeitsverzeichnis = arbeitsverzeichnis
+
+    @contextlib.contextmanager
+    def phase(self, ergebnis: dict, name: str):
+        rss_reset = _setze_rss_spitze_zurueck()
+        prozesse = self.zaehler.anzahl
+        wchar = _proc_wert("io", "wchar")
+        bytes_vorher = _verzeichnis_bytes(self.arbeitsverzeichnis)
+        start = time.perf_counter()
+        yield
+        dauer = time.perf_counter() - start
+        hwm_kb = _proc_wert("status", "VmHWM") if rss_reset else None
+        # ru_maxrss ist auf Linux in KiB, auf macOS in Bytes
+        einheit = 1 if sys.platform == "darwin" else 1024
+        wchar_nachher = _proc_wert("io", "wchar")
+        ergebnis[name] = {
+            "seconds": round(dauer, 4),
+            "peak_rss_bytes": hwm_kb * 1024 if hwm_kb else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * einheit,
+            "child_peak_rss_bytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * einheit,
+            "processes_spawned": self.zaehler.anzahl - prozesse,
+            "bytes_written": max(0, _verzeichnis_bytes(self.arbeitsverzeichnis) - bytes_vorher),
+            "write_syscall_bytes": wchar_nachher - wchar if wchar is not None and wchar_nachher is not None else None,
+        }
+
+
+def miss_skript(fa, minuten: int, arbeitsverzeichnis: Path, settings, seed: int) -> dict:
+    """Lässt alle Phasen für ein synthetisches Skript laufen und liefert die Messwerte."""
+    zaehler = ProzessZaehler()
+    messung = Messung(zaehler, arbeitsverzeichnis)
+    fa.SKRIPTE_DIR = arbeitsverzeichnis
+    text, includes = erzeuge_skript(minuten, seed)
+    md_file = arbeitsverzeichnis / f"benchmark-{minuten:03d}min.md"
+    md_file.write_text(text, encoding="utf-8")
+    for i, name in enumerate(includes):
+        fa.create_silence(10 + 50 * i, arbeitsverzeichnis / name)
+
+    phasen: dict = {}
+    teile = arbeitsverzeichnis / "teile"
+    teile.mkdir()
+    with zaehler.aktiv():
+        with messung.phase(phasen, "parse"):
+            segments = fa.parse_script(text)
+        text_segments = [s for s in segments if not s.is_pause and not s.is_include]
+
+        with messung.phase(phasen, "chunks"):
+            chunks_je_segment = {
+                i: fa.split_text_into_chunks(s.content, settings.chunk_chars, settings.chunk_seconds)
+                for i, s in enumerate(segments) if not s.is_pause and not s.is_include
+            }
+
+        with messung.phase(phasen, "silence"):
+            for i, s in enumerate(segments):
+                if s.is_pause:
+                    fa.create_silence(s.content, teile / f"pause_{i:05d}.mp3")
+
+        backend = fa.OfflineBackend()
+        limiter = fa.RateLimiter(max_concurrency=fa.MAX_CONCURRENT_REQUESTS,
+                                 requests_per_minute=1e9, chars_per_minute=1e12)
+        chunk_files: dict[int, list] = {}
+        workspace = fa.Workspace(base=arbeitsverzeichnis)
+        include_cache = fa.IncludeCache(arbeitsverzeichnis / "includes")
+
+        async def synthetisiere_chunk(chunk: str, voice: str, teile_liste: list, index: int) -> None:
+            audio = await fa.text_to_speech(backend, chunk, voice=voice, limiter=limiter,
+                                            response_format=settings.internal_format)
+            teile_liste[index] = workspace.store(audio, settings.internal_format)
+
+        async def synthetisiere() -> None:
+            async with asyncio.TaskGroup() as tasks:
+                for i, s in enumerate(segments):
+                    if s.is_pause:
+                        chunk_files[i] = [fa.Silence(s.content)]
+                    elif s.is_include:
+                        chunk_files[i] = [arbeitsverzeichnis / s.content]
+                    else:
+                        chunk_files[i] = [None] * len(chunks_je_segment[i])
+                        for j, chunk in enumerate(chunks_je_segment[i]):
+                            tasks.create_task(synthetisiere_chunk(chunk, s.voice, chunk_files[i], j))
+
+        with messung.phase(phasen, "tts"):
+            asyncio.run(synthetisiere())
+
+        audio_files = [f for i in sorted(chunk_files) for f in chunk_files[i]]
+        with messung.phase(phasen, "combine"):
+            fa.combine_audio_files(audio_files, arbeitsverzeichnis / f"combine{settings.suffix}", settings,
+                                   include_cache)
+
+        shutil.rmtree(teile)
+        workspace.release(audio_files)
+        with messung.phase(phasen, "convert"), contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(fa.convert_script_to_mp3(backend, md_file, None, limiter, settings=settings,
+                                                 workspace=workspace, include_cache=include_cache))
+        workspace.close()
+
+    output_file = md_file.with_suffix(settings.suffix)
+    return {
+        "minutes": minuten,
+        "script_chars": len(text),
+        "segments": len(segments),
+        "pauses": sum(1 for s in segments if s.is_pause),
+        "includes": sum(1 for s in segments if s.is_include),
+        "voices": len({s.voice for s in text_segments}),
+        "chunks": sum(map(len, chunks_je_segment.values())),
+        "output_bytes": output_file.stat().st_size,
+        "phases": phasen,
+    }
+
+
+def vergleiche(alt: dict, neu: dict, toleranz: float) -> list[str]:
+    """Regressionen von ``neu`` gegenüber ``alt``: Laufzeit, Prozessstarts, geschriebene Bytes."""
+    regressionen = []
+    alte_laeufe = {lauf["minutes"]: lauf for lauf in alt.get("runs", [])}
+    for lauf in neu["runs"]:
+        vorher = alte_laeufe.get(lauf["minutes"])
+        if vorher is None:
+            continue
+        for phase, werte in lauf["phases"].items():
+            alt_werte = vorher["phases"].get(phase)
+            if alt_werte is None:
+                continue
+            for metrik in ("seconds", "processes_spawned", "bytes_written"):
+                a, n = alt_werte[metrik], werte[metrik]
+                if metrik == "seconds" and max(a, n) < MIN_SEKUNDEN_FUER_VERGLEICH:
+                    continue
+                if n > a * (1 + toleranz) and n - a > (0 if metrik != "seconds" else MIN_SEKUNDEN_FUER_VERGLEICH):
+                    regressionen.append(f"{lauf['minutes']:>3} min {phase:<8} {metrik}: {a} → {n}")
+    return regressionen
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="fruehsport-benchmark.py",
+        description="Benchmark der Audio-Pipeline an synthetischen Skripten (Offline-Backend, ohne API).",
+    )
+    parser.add_argument(
+        "--minuten", type=int, nargs="+", default=list(DAUERN_MINUTEN), metavar="N",
+        help=f"Spieldauern der synthetischen Skripte (Default: {' '.join(map(str, DAUERN_MINUTEN))})",
+    )
+    parser.add_argument("--intern-format", choices=("mp3", "pcm"), default="mp3",
+                        help="Zwischenformat wie bei fruehsport-audio (Default: mp3)")
+    parser.add_argument("--codec", default="mp3", metavar="CODEC[:RATE]",
+                        help="Ausgabeformat(e) wie bei fruehsport-audio, kommagetrennt (Default: mp3)")
+    parser.add_argument("--chunk-sekunden", type=float, default=None, metavar="SEK",
+                        help="maximale geschätzte Audiodauer je TTS-Chunk (Default: nur Zeichenlimit)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed der Skript-Erzeugung (Default: 0)")
+    parser.add_argument("--ausgabe", type=Path, metavar="DATEI",
+                        help="JSON-Ergebnisdatei (Default: Benchmarks/fruehsport-<Zeitstempel>.json)")
+    parser.add_argument("--vergleiche", type=Path, metavar="DATEI",
+                        help="früheres Ergebnis; Regressionen → Exit-Code 1")
+    parser.add_argument("--toleranz", type=float, default=TOLERANZ, metavar="ANTEIL",
+                        help=f"erlaubte relative Verschlechterung beim Vergleich (Default: {TOLERANZ})")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    fa = lade_generator()
+    fa.check_ffmpeg()
+    try:
+        (codec, bitrate), *extra = fa.parse_codec_specs([args.codec], fa.MP3_BITRATE)
+    except ValueError as e:
+        print(e)
+        return 2
+    settings = fa.AudioSettings(internal_format=args.intern_format, codec=codec, bitrate=bitrate,
+                                extra_outputs=tuple(extra), chunk_seconds=args.chunk_sekunden)
+
+    ergebnis = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"internal_format": settings.internal_format, "outputs": [list(o) for o in settings.outputs],
+                     "chunk_chars": settings.chunk_chars,
+                     "chunk_seconds": settings.chunk_seconds, "seed": args.seed},
+        "runs": [],
+    }
+    print(f"{'Skript':>8}  {'Phase':<8} {'Zeit':>9} {'RSS':>10} {'Prozesse':>8} {'geschrieben':>12}")
+    for minuten in args.minuten:
+        with tempfile.TemporaryDirectory(prefix="fruehsport-benchmark-") as tmp:
+            lauf = miss_skript(fa, minuten, Path(tmp), settings, args.seed)
+        ergebnis["runs"].append(lauf)
+        for phase, werte in lauf["phases"].items():
+            print(f"{minuten:>5}min  {phase:<8} {werte['seconds']:>8.3f}s {fa.format_size(werte['peak_rss_bytes']):>10} "
+                  f"{werte['processes_spawned']:>8} {fa.format_size(werte['bytes_written']):>12}")
+
+    ausgabe = args.ausgabe or BENCHMARK_DIR / f"fruehsport-{datetime.now():%Y%m%d-%H%M%S}.json"
+    ausgabe.parent.mkdir(parents=True, exist_ok=True)
+    ausgabe.write_text(json.dumps(ergebnis, indent=1), encoding="utf-8")
+    print(f"\nErgebnis: {ausgabe}")
+
+    if args.vergleiche:
+        basis = json.loads(args.vergleiche.read_text(encoding="utf-8"))
+        if basis.get("settings") != ergebnis["settings"]:
+            print(f"\n⚠  Einstellungen weichen ab: {basis.get('settings')} vs. {ergebnis['settings']}")
+        regressionen = vergleiche(basis, ergebnis, args.toleranz)
+        if regressionen:
+            print(f"\n✗ {len(regressionen)} Regression(en) gegenüber {args.vergleiche.name}:")
+            for zeile in regressionen:
+                print(f"  {zeile}")
+            return 1
+        print(f"\n✓ Keine Regression gegenüber {args.vergleiche.name} (Toleranz {args.toleranz:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,8 +5,10 @@ Der CLI-Einstieg ist ``podcast-player.py`` im selben Verzeichnis.
 
 Architektur (Adapter-Muster, alles Externe gekapselt):
 
-- ``PlayerBackend``   — Adapter fuer den Player-Prozess (mpv, Fallback mplayer)
+- ``PlayerBackend``   — Adapter fuer den Player-Prozess (mpv, Fallback mplayer);
+                        ``MpvIpcBackend`` steuert einen langlebigen mpv per JSON-IPC (gapless)
 - ``EventLog``        — JSONL-Abspiel-Log (``Logs/podcast-player.jsonl``)
+- ``LogStatistik``    — inkrementelle Auswertung des Logs (Unterbefehl ``stats``)
 - ``PodcastPlayer``   — Orchestrierung: Playlist, Warteschleife, Signale
 
 Der Player beruehrt keinerlei Lautstaerken; die Absenkung anderer Quellen
@@ -18,17 +20,37 @@ Es werden ausschliesslich Standardbibliotheks-Module verwendet.
 from __future__ import annotations
 
 import argparse
+import atexit
+import bisect
 import datetime as _dt
+import glob
+import gzip
+import hashlib
+import itertools
 import json
+import math
+import os
+import queue
+import re
+import selectors
 import shutil
 import signal
+import socket
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import urllib.parse
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import BinaryIO
 
 # --- Festlegungen ------------------------------------------------------------
 
@@ -38,6 +60,13 @@ EXIT_BENUTZUNG = 2               # Argument-/Playlist-Fehler
 EXIT_SIGINT = 130
 EXIT_SIGTERM = 143
 
+# mpv im IPC-Betrieb: bleibt nach dem Playlist-Ende im Leerlauf, haelt das Audiogeraet ueber
+# Dateigrenzen offen und liest die vorgemerkte naechste Datei schon waehrend der laufenden vor
+MPV_IPC_OPTIONEN = (
+    "--no-video", "--really-quiet", "--no-terminal",
+    "--idle=yes", "--gapless-audio=yes", "--prefetch-playlist=yes",
+)
+
 
 class PlaylistFehler(Exception):
     """Ein Argument ergibt keine abspielbare Playlist (fehlende Datei, leerer Ordner)."""
@@ -64,25 +93,111 @@ class PlayerBackend(ABC):
     def terminate(self) -> None:
         """Laufenden Player beenden (idempotent)."""
 
+    def vormerken(self, datei: Path) -> None:
+        """Naechste Datei ankuendigen, damit der Player sie vorladen kann (optional)."""
+
+    def warte_fd(self) -> int | None:
+        """Deskriptor, der lesbar wird, sobald ``poll`` ein neues Ergebnis haben kann.
+
+        None (Default, z. B. Fakes): der Player fragt ``poll`` in festen Schritten ab.
+        """
+        return None
+
+    def schliesse(self) -> None:
+        """Alle Ressourcen des Backends freigeben (idempotent, optional)."""
+
+
+class _SigchldPipe:
+    """Selbst-Pipe, in die ein SIGCHLD-Handler schreibt — Ersatz fuer pidfd_open.
+
+    Nur noetig ohne pidfd (Kernel < 5.3, kein Linux). Der Handler laesst sich nur im
+    Haupt-Thread installieren; sonst ``ValueError`` und der Aufrufer pollt weiter.
+    """
+
+    def __init__(self) -> None:
+        self._lesen, self._schreiben = os.pipe()
+        os.set_blocking(self._lesen, False)
+        os.set_blocking(self._schreiben, False)
+        try:
+            self._vorher = signal.signal(signal.SIGCHLD, self._handler)
+        except ValueError:
+            self.schliesse()
+            raise
+
+    def _handler(self, _signalnummer: int, _frame: object) -> None:
+        try:
+            os.write(self._schreiben, b"\0")
+        except BlockingIOError:
+            pass  # Pipe voll: sie ist ohnehin lesbar
+
+    def fileno(self) -> int:
+        return self._lesen
+
+    def leeren(self) -> None:
+        try:
+            while os.read(self._lesen, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def schliesse(self) -> None:
+        if getattr(self, "_vorher", None) is not None:
+            signal.signal(signal.SIGCHLD, self._vorher)
+            self._vorher = None
+        for fd in (self._lesen, self._schreiben):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._lesen = self._schreiben = -1
+
 
 class CommandPlayerBackend(PlayerBackend):
-    """PlayerBackend, das einen externen Befehl (mpv/mplayer) als Subprozess startet."""
+    """PlayerBackend, das einen externen Befehl (mpv/mplayer) als Subprozess startet.
+
+    Das Ende des Kindprozesses meldet ``warte_fd``: ein pidfd (Linux >= 5.3), sonst
+    die Lese-Seite einer SIGCHLD-Selbst-Pipe.
+    """
 
     def __init__(self, basis_befehl: list[str], terminate_timeout_s: float = 5.0) -> None:
         self.basis_befehl = basis_befehl
         self._terminate_timeout_s = terminate_timeout_s
         self._prozess: subprocess.Popen | None = None
+        self._pidfd: int | None = None
+        self._sigchld: _SigchldPipe | None = None
 
     def start(self, datei: Path) -> None:
+        self._schliesse_pidfd()
         self._prozess = subprocess.Popen(
             [*self.basis_befehl, str(datei)],
             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
         )
+        try:
+            self._pidfd = os.pidfd_open(self._prozess.pid)
+        except (AttributeError, OSError):
+            # Ein Kind, das schon vor dem Handler endet, findet das poll() vor dem Warten
+            if self._sigchld is None:
+                try:
+                    self._sigchld = _SigchldPipe()
+                except ValueError:
+                    pass
 
     def poll(self) -> int | None:
         if self._prozess is None:
             return None
-        return self._prozess.poll()
+        if self._sigchld is not None:
+            self._sigchld.leeren()
+        exit_code = self._prozess.poll()
+        if exit_code is not None:
+            self._schliesse_pidfd()
+        return exit_code
+
+    def warte_fd(self) -> int | None:
+        if self._pidfd is not None:
+            return self._pidfd
+        if self._sigchld is not None and self._prozess is not None:
+            return self._sigchld.fileno()
+        return None
 
     def terminate(self) -> None:
         if self._prozess is not None and self._prozess.poll() is None:
@@ -92,18 +207,286 @@ class CommandPlayerBackend(PlayerBackend):
             except subprocess.TimeoutExpired:
                 self._prozess.kill()
                 self._prozess.wait()
+        self._schliesse_pidfd()
+
+    def schliesse(self) -> None:
+        self._schliesse_pidfd()
+        if self._sigchld is not None:
+            self._sigchld.schliesse()
+            self._sigchld = None
+
+    def _schliesse_pidfd(self) -> None:
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+            self._pidfd = None
+
+
+@dataclass
+class _IpcEintrag:
+    """Eine an mpv uebergebene Datei; ``ergebnis`` ist ihr 'Exit-Code' nach ``end-file``."""
+
+    datei: Path
+    eintrag_id: int | None = None
+    ergebnis: int | None = None
+
+
+class MpvIpcBackend(PlayerBackend):
+    """PlayerBackend ueber einen einzigen, langlebigen mpv-Prozess und dessen JSON-IPC-Socket.
+
+    Statt eines Prozesses je Datei (Start, Decoder-Init, Audiogeraet oeffnen) haengt
+    ``vormerken`` die naechste Datei an mpvs Playlist an; mpv geht gapless in sie ueber.
+    Das Ende einer Datei kommt als ``end-file``-Ereignis (``eof`` -> 0, ``error`` -> 1)
+    statt als Exit-Code. Der Prozess startet beim ersten ``start`` (und nach einem Absturz
+    erneut); ``schliesse`` beendet ihn.
+
+    Mit ``basis_befehl=None`` wird kein Prozess gestartet, sondern ein bereits laufender
+    mpv (``--input-ipc-server``) unter ``socket_pfad`` gesteuert.
+    """
+
+    def __init__(
+        self,
+        basis_befehl: list[str] | None,
+        socket_pfad: Path | None = None,
+        verbinde_timeout_s: float = 5.0,
+        terminate_timeout_s: float = 5.0,
+    ) -> None:
+        if basis_befehl is None and socket_pfad is None:
+            raise ValueError("Ohne Befehl wird ein socket_pfad benoetigt.")
+        self.basis_befehl = basis_befehl
+        self.socket_pfad = socket_pfad  # ohne Vorgabe: eigenes Temp-Verzeichnis beim Start
+        self._eigenes_verzeichnis: Path | None = None
+        self._verbinde_timeout_s = verbinde_timeout_s
+        self._terminate_timeout_s = terminate_timeout_s
+        self._prozess: subprocess.Popen | None = None
+        self._socket: socket.socket | None = None
+        self._puffer = b""
+        self._request_id = 0
+        self._ladeauftraege: dict[int, _IpcEintrag] = {}
+        self._eintraege: deque[_IpcEintrag] = deque()  # [0] = aktuelle Datei, dann vorgemerkte
+
+    # --- PlayerBackend ---
+
+    def start(self, datei: Path) -> None:
+        if (
+            len(self._eintraege) > 1
+            and self._eintraege[0].ergebnis is not None
+            and self._eintraege[1].datei == datei
+            and self._verbunden()
+        ):
+            self._eintraege.popleft()  # vorgemerkt: mpv spielt sie bereits oder gleich
+            return
+        self._verbinde()
+        eintrag = _IpcEintrag(datei)
+        self._eintraege = deque([eintrag])
+        self._lade(eintrag, "replace")
+
+    def vormerken(self, datei: Path) -> None:
+        if not self._eintraege or not self._verbunden():
+            return
+        eintrag = _IpcEintrag(datei)
+        self._eintraege.append(eintrag)
+        try:
+            # append-play: falls mpv das Playlist-Ende schon erreicht hat, startet sie sofort
+            self._lade(eintrag, "append-play")
+        except OSError:
+            self._eintraege.pop()
+
+    def poll(self) -> int | None:
+        if not self._eintraege:
+            return None
+        aktuell = self._eintraege[0]
+        if aktuell.ergebnis is None:
+            self._lies_ereignisse()
+        if aktuell.ergebnis is None and not self._verbunden():
+            exit_code = self._prozess.poll() if self._prozess is not None else None
+            aktuell.ergebnis = exit_code or 1  # Ende ohne end-file ist nie ein Erfolg
+        return aktuell.ergebnis
+
+    def warte_fd(self) -> int | None:
+        # Lesbar bei jedem Ereignis und beim Verbindungsende (mpv beendet/abgestuerzt)
+        return self._socket.fileno() if self._socket is not None else None
+
+    def terminate(self) -> None:
+        """Wiedergabe stoppen; der mpv-Prozess bleibt fuer ``start`` erhalten."""
+        offen = any(e.ergebnis is None for e in self._eintraege)
+        self._eintraege.clear()
+        if offen and self._verbunden():
+            try:
+                self._sende(["stop"])
+            except OSError:
+                self._beende_prozess()
+
+    def schliesse(self) -> None:
+        self._eintraege.clear()
+        quit_gesendet = False
+        if self._verbunden() and self._prozess is not None:
+            try:
+                self._sende(["quit"])
+                quit_gesendet = True
+            except OSError:
+                pass
+        self._trenne()
+        self._beende_prozess(quit_gesendet)
+        if self._eigenes_verzeichnis is not None:
+            shutil.rmtree(self._eigenes_verzeichnis, ignore_errors=True)
+            self._eigenes_verzeichnis = None
+            self.socket_pfad = None
+
+    # --- IPC ---
+
+    def _verbunden(self) -> bool:
+        return self._socket is not None and (self._prozess is None or self._prozess.poll() is None)
+
+    def _verbinde(self) -> None:
+        """Stellt Prozess und Socket bereit; Fehler als OSError (-> "fehler" im Log)."""
+        if self._verbunden():
+            return
+        self._trenne()
+        if self.basis_befehl is not None:
+            self._beende_prozess()
+            if self.socket_pfad is None:
+                self._eigenes_verzeichnis = Path(tempfile.mkdtemp(prefix="podcast-player-"))
+                self.socket_pfad = self._eigenes_verzeichnis / "mpv.sock"
+            self.socket_pfad.unlink(missing_ok=True)
+            self._prozess = subprocess.Popen(
+                [*self.basis_befehl, f"--input-ipc-server={self.socket_pfad}"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        frist = time.monotonic() + self._verbinde_timeout_s
+        while True:
+            verbindung = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                verbindung.connect(str(self.socket_pfad))
+            except OSError:
+                verbindung.close()
+                if self._prozess is not None and self._prozess.poll() is not None:
+                    raise ConnectionError(
+                        f"mpv beendet (Exit-Code {self._prozess.returncode})"
+                    ) from None
+                if time.monotonic() >= frist:
+                    self._beende_prozess()
+                    raise TimeoutError(f"Kein mpv-IPC-Socket unter {self.socket_pfad}") from None
+                time.sleep(0.02)
+                continue
+            verbindung.setblocking(False)
+            self._socket = verbindung
+            return
+
+    def _trenne(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        self._puffer = b""
+        self._ladeauftraege.clear()
+
+    def _beende_prozess(self, quit_gesendet: bool = False) -> None:
+        if self._prozess is None or self._prozess.poll() is not None:
+            return
+        if quit_gesendet:
+            try:
+                self._prozess.wait(timeout=self._terminate_timeout_s)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+        self._prozess.terminate()
+        try:
+            self._prozess.wait(timeout=self._terminate_timeout_s)
+        except subprocess.TimeoutExpired:
+            self._prozess.kill()
+            self._prozess.wait()
+
+    def _sende(self, befehl: list) -> int:
+        self._request_id += 1
+        zeile = json.dumps({"command": befehl, "request_id": self._request_id}) + "\n"
+        daten = zeile.encode("utf-8")
+        with selectors.DefaultSelector() as selektor:
+            selektor.register(self._socket, selectors.EVENT_WRITE)
+            while daten:
+                try:
+                    daten = daten[self._socket.send(daten):]
+                except BlockingIOError:
+                    if not selektor.select(self._terminate_timeout_s):
+                        raise TimeoutError("mpv nimmt keine Befehle an") from None
+        return self._request_id
+
+    def _lade(self, eintrag: _IpcEintrag, modus: str) -> None:
+        try:
+            request_id = self._sende(["loadfile", str(eintrag.datei), modus])
+        except OSError:
+            self._trenne()
+            raise
+        self._ladeauftraege[request_id] = eintrag
+
+    def _lies_ereignisse(self) -> None:
+        """Liest alles Anstehende vom Socket, ohne zu blockieren."""
+        if self._socket is None:
+            return
+        while True:
+            try:
+                daten = self._socket.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                daten = b""
+            if not daten:  # mpv hat die Verbindung geschlossen
+                self._verarbeite(self._puffer)
+                self._trenne()
+                return
+            self._puffer += daten
+        *zeilen, self._puffer = self._puffer.split(b"\n")
+        for zeile in zeilen:
+            self._verarbeite(zeile)
+
+    def _verarbeite(self, zeile: bytes) -> None:
+        try:
+            nachricht = json.loads(zeile)
+        except ValueError:
+            return
+        if "request_id" in nachricht and "event" not in nachricht:
+            eintrag = self._ladeauftraege.pop(nachricht["request_id"], None)
+            if eintrag is not None:
+                if nachricht.get("error") != "success":
+                    eintrag.ergebnis = 1
+                elif isinstance(nachricht.get("data"), dict):
+                    eintrag.eintrag_id = nachricht["data"].get("playlist_entry_id")
+            return
+        ereignis = nachricht.get("event")
+        if ereignis == "start-file":
+            # Aeltere mpv-Versionen liefern die Eintrags-ID nicht in der loadfile-Antwort
+            eintrag_id = nachricht.get("playlist_entry_id")
+            if eintrag_id is not None and self._finde(eintrag_id) is None:
+                for eintrag in self._eintraege:
+                    if eintrag.eintrag_id is None and eintrag.ergebnis is None:
+                        eintrag.eintrag_id = eintrag_id
+                        break
+        elif ereignis == "end-file" and nachricht.get("reason") in ("eof", "error"):
+            eintrag = self._finde(nachricht.get("playlist_entry_id"))
+            if eintrag is None:  # ohne IDs: mpv beendet die Dateien in Playlist-Reihenfolge
+                eintrag = next((e for e in self._eintraege if e.ergebnis is None), None)
+            if eintrag is not None:
+                eintrag.ergebnis = 0 if nachricht["reason"] == "eof" else 1
+
+    def _finde(self, eintrag_id: int | None) -> _IpcEintrag | None:
+        if eintrag_id is None:
+            return None
+        return next((e for e in self._eintraege if e.eintrag_id == eintrag_id), None)
 
 
 def finde_player_backend(
     which: Callable[[str], str | None] = shutil.which,
     override: str | None = None,
-) -> CommandPlayerBackend:
+    gapless: bool = False,
+) -> PlayerBackend:
     """mpv als Default, mplayer als Fallback; ``override`` erzwingt einen Befehl.
 
     Der ``override`` (CLI-Option ``--backend``) dient Tests und Sonderfaellen:
     der angegebene Befehl wird unveraendert mit der Datei als letztem Argument
-    aufgerufen.
+    aufgerufen. Mit ``gapless`` laeuft mpv (bzw. der ``override``) als ein
+    einziger Prozess ueber JSON-IPC (``MpvIpcBackend``); mplayer bleibt der
+    Fallback ohne Vorladen.
     """
+    if gapless and (mpv := override or which("mpv")):
+        return MpvIpcBackend([mpv, *MPV_IPC_OPTIONEN])
     if override:
         return CommandPlayerBackend([override])
     mpv = which("mpv")
@@ -117,31 +500,146 @@ def finde_player_backend(
 
 # --- Playlist ----------------------------------------------------------------
 
-def baue_playlist(argumente: list[str]) -> list[Path]:
-    """Argumente (Dateien und Ordner) zu einer Playlist in Aufrufreihenfolge.
+PLAYLIST_ENDUNGEN = (".m3u", ".m3u8")
+_GLOB_ZEICHEN = re.compile(r"[*?[]")
+
+
+def baue_playlist(
+    argumente: list[str],
+    rekursiv: bool = False,
+    scan_threads: int = 1,
+) -> list[Path]:
+    """Argumente (Dateien, Ordner, Glob-Muster, M3U/M3U8) zu einer Playlist in Aufrufreihenfolge.
 
     Ordner steuern ihre ``*.mp3`` alphabetisch sortiert bei — locale-unabhaengig
-    und case-insensitive. Nicht existierende Argumente und Ordner ohne MP3s
-    sind Benutzungsfehler (``PlaylistFehler``).
+    und case-insensitive; mit ``rekursiv`` samt Unterordnern (sortiert nach dem
+    relativen Pfad, Symlinks auf Ordner werden nicht verfolgt). Gelesen wird per
+    ``os.scandir`` — die Dateitypen kommen aus dem Verzeichniseintrag, ohne ein
+    ``stat`` je Datei. Mit ``scan_threads`` > 1 laufen die Ordner-Scans parallel
+    (hilft auf Netzlaufwerken). Muster (``*``, ``?``, ``[``) liefern passende
+    MP3s und Ordner, M3U-Zeilen gelten relativ zur Playlist-Datei.
+
+    Nicht existierende Argumente, Muster ohne Treffer und Ordner ohne MP3s sind
+    Benutzungsfehler (``PlaylistFehler``).
     """
-    playlist: list[Path] = []
+    teile: list[list[Path] | int] = []  # feste Dateien oder Index eines zu scannenden Ordners
+    ordner: list[Path] = []
+
+    def ordner_teil(pfad: Path) -> None:
+        teile.append(len(ordner))
+        ordner.append(pfad)
+
     for argument in argumente:
         pfad = Path(argument)
-        if pfad.is_dir():
-            mp3s = sorted(
-                (p for p in pfad.iterdir() if p.is_file() and p.suffix.lower() == ".mp3"),
-                key=lambda p: p.name.casefold(),
-            )
-            if not mp3s:
-                raise PlaylistFehler(f"Ordner enthaelt keine MP3-Dateien: {pfad}")
-            playlist.extend(mp3s)
-        elif pfad.is_file():
-            playlist.append(pfad)
+        modus = _st_mode(pfad)
+        if not modus and _GLOB_ZEICHEN.search(argument):
+            treffer = sorted(glob.glob(os.path.expanduser(argument), recursive=True), key=lambda t: (t.casefold(), t))
+            vorher = len(teile)
+            for eintrag in map(Path, treffer):
+                eintrag_modus = _st_mode(eintrag)
+                if stat.S_ISDIR(eintrag_modus):
+                    ordner_teil(eintrag)
+                elif stat.S_ISREG(eintrag_modus) and eintrag.suffix.lower() == ".mp3":
+                    teile.append([eintrag])
+            if len(teile) == vorher:
+                raise PlaylistFehler(f"Keine MP3-Dateien passen auf das Muster: {argument}")
+        elif stat.S_ISDIR(modus):
+            ordner_teil(pfad)
+        elif stat.S_ISREG(modus):
+            if pfad.suffix.lower() in PLAYLIST_ENDUNGEN:
+                for eintrag in _lies_m3u(pfad):
+                    eintrag_modus = _st_mode(eintrag)
+                    if stat.S_ISDIR(eintrag_modus):
+                        ordner_teil(eintrag)
+                    elif stat.S_ISREG(eintrag_modus):
+                        teile.append([eintrag])
+                    else:
+                        raise PlaylistFehler(f"Eintrag aus {pfad} nicht gefunden: {eintrag}")
+            else:
+                teile.append([pfad])
         else:
             raise PlaylistFehler(f"Datei oder Ordner nicht gefunden: {pfad}")
+
+    gescannt = _scanne_ordner(ordner, rekursiv, scan_threads)
+    playlist: list[Path] = []
+    for teil in teile:
+        playlist.extend(gescannt[teil] if isinstance(teil, int) else teil)
     return playlist
 
 
+def _st_mode(pfad: Path) -> int:
+    """``st_mode`` von ``pfad`` (Symlinks aufgeloest) aus einem einzigen ``stat``; 0, wenn es ihn nicht gibt."""
+    try:
+        return os.stat(pfad).st_mode
+    except OSError:
+        return 0
+
+
+def _lies_m3u(pfad: Path) -> list[Path]:
+    """Eintraege einer M3U/M3U8-Playlist; Kommentare (``#EXTINF`` ...) und Leerzeilen entfallen."""
+    roh = pfad.read_bytes()
+    try:
+        text = roh.decode("utf-8-sig")
+    except UnicodeDecodeError:  # klassisches .m3u in Latin-1
+        text = roh.decode("latin-1")
+    eintraege = []
+    for zeile in text.splitlines():
+        zeile = zeile.strip()
+        if not zeile or zeile.startswith("#"):
+            continue
+        if zeile.startswith("file://"):
+            zeile = urllib.parse.unquote(urllib.parse.urlparse(zeile).path)
+        elif "://" in zeile:
+            raise PlaylistFehler(f"URLs werden nicht unterstuetzt ({pfad}): {zeile}")
+        eintraege.append(pfad.parent / Path(zeile).expanduser())
+    return eintraege
+
+
+def _lies_ordner(
+    pfad: Path, praefix: tuple[str, ...]
+) -> tuple[list[tuple[tuple[str, ...], Path]], list[tuple[Path, tuple[str, ...]]]]:
+    """Ein ``scandir``: MP3s mit Sortierschluessel und Unterordner (ohne Symlinks)."""
+    mp3s, unterordner = [], []
+    with os.scandir(pfad) as eintraege:
+        for eintrag in eintraege:
+            schluessel = (*praefix, eintrag.name.casefold(), eintrag.name)
+            if eintrag.is_dir(follow_symlinks=False):
+                unterordner.append((Path(eintrag.path), schluessel))
+            elif eintrag.name.lower().endswith(".mp3") and eintrag.is_file():
+                mp3s.append((schluessel, Path(eintrag.path)))
+    return mp3s, unterordner
+
+
+def _scanne_ordner(ordner: list[Path], rekursiv: bool, scan_threads: int) -> list[list[Path]]:
+    """MP3s je Ordner, sortiert; Scans aller Ordner und Unterordner teilen sich einen Thread-Pool."""
+    gefunden: list[list[tuple[tuple[str, ...], Path]]] = [[] for _ in ordner]
+    if not ordner:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, scan_threads)) as pool:
+        offen = {pool.submit(_lies_ordner, pfad, ()): (index, True) for index, pfad in enumerate(ordner)}
+        while offen:
+            fertig, _ = wait(offen, return_when=FIRST_COMPLETED)
+            for future in fertig:
+                index, wurzel = offen.pop(future)
+                try:
+                    mp3s, unterordner = future.result()
+                except OSError as fehler:
+                    if wurzel:
+                        raise PlaylistFehler(f"Ordner nicht lesbar: {ordner[index]} ({fehler})") from None
+                    continue  # unlesbarer Unterordner: uebersprungen
+                gefunden[index].extend(mp3s)
+                if rekursiv:
+                    for pfad, schluessel in unterordner:
+                        offen[pool.submit(_lies_ordner, pfad, schluessel[:-1])] = (index, False)
+    ergebnis = []
+    for index, treffer in enumerate(gefunden):
+        if not treffer:
+            raise PlaylistFehler(f"Ordner enthaelt keine MP3-Dateien: {ordner[index]}")
+        treffer.sort(key=lambda paar: paar[0])
+        ergebnis.append([pfad for _schluessel, pfad in treffer])
+    return ergebnis
+
+
 # --- EventLog: JSONL-Abspiel-Log ---------------------------------------------
 
 class EventLog:
@@ -149,15 +647,54 @@ class EventLog:
 
     Format: {"zeit": ISO-8601, "ereignis": "start"|"ende"|"abbruch"|"fehler",
              "datei": Pfad, "dauer_s": Zahl|null, "detail": String|null}
+
+    Die Datei bleibt offen. Geflusht (inkl. fsync) wird alle ``flush_alle``
+    Ereignisse, sofort bei den Ereignissen in ``flush_bei`` (Abbruch durch
+    Signal, Fehler) und in ``schliesse``. Rotiert wird ab ``max_bytes`` und/oder
+    beim Datumswechsel (``taeglich``) nach ``<name>.<stempel>[.gz]``; davon
+    bleiben die ``behalte`` neuesten.
+
+    Mit ``asynchron`` schreibt ein Hintergrund-Thread aus einer begrenzten
+    Queue — ``schreibe`` kehrt sofort zurueck (und blockiert nur, wenn die
+    Queue voll ist: lieber warten als Ereignisse verlieren). ``schliesse``
+    arbeitet die Queue vollstaendig ab und muss am Ende aufgerufen werden.
     """
 
     def __init__(
         self,
         pfad: Path,
         uhr: Callable[[], _dt.datetime] = lambda: _dt.datetime.now().astimezone(),
+        flush_alle: int = 1,
+        flush_bei: frozenset[str] = frozenset({"abbruch", "fehler"}),
+        max_bytes: int | None = None,
+        taeglich: bool = False,
+        komprimieren: bool = False,
+        behalte: int = 7,
+        asynchron: bool = False,
+        queue_groesse: int = 1024,
     ) -> None:
         self.pfad = pfad
         self._uhr = uhr
+        self.flush_alle = max(1, flush_alle)
+        self.flush_bei = flush_bei
+        self.max_bytes = max_bytes
+        self.taeglich = taeglich
+        self.komprimieren = komprimieren
+        self.behalte = behalte
+        self._datei = None
+        self._groesse = 0
+        self._datum: _dt.date | None = None
+        self._ungeflusht = 0
+        self._warnung_gemeldet = False
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        if asynchron:
+            self._queue = queue.Queue(maxsize=queue_groesse)
+            self._thread = threading.Thread(
+                target=self._schreib_schleife, name="EventLog", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.schliesse)
 
     def schreibe(
         self,
@@ -166,23 +703,172 @@ class EventLog:
         dauer_s: float | None = None,
         detail: str | None = None,
     ) -> None:
+        zeit = self._uhr()
         eintrag = {
-            "zeit": self._uhr().isoformat(),
+            "zeit": zeit.isoformat(),
             "ereignis": ereignis,
             "datei": str(datei),
             "dauer_s": round(dauer_s, 3) if dauer_s is not None else None,
             "detail": detail,
         }
+        if self._queue is not None and self._thread is not None:
+            self._queue.put((eintrag, zeit))
+        else:
+            self._verarbeite(eintrag, zeit)
+
+    def schliesse(self) -> None:
+        """Alle ausstehenden Ereignisse schreiben, flushen und die Datei schliessen (idempotent)."""
+        if self._thread is not None:
+            thread, self._thread = self._thread, None
+            if thread.is_alive():  # sonst holt niemand das Ende-Zeichen ab
+                self._queue.put(None)
+                thread.join()
+            atexit.unregister(self.schliesse)
+        self._schliesse_datei()
+
+    # --- Schreiben (Aufrufer-Thread oder Hintergrund-Thread) ---
+
+    def _schreib_schleife(self) -> None:
+        while (element := self._queue.get()) is not None:
+            try:
+                self._verarbeite(*element)  # gleiche Flush-Politik wie im synchronen Betrieb
+            except Exception as fehler:
+                # Weiterleeren: ein toter Thread liesse schreibe() und schliesse() ewig warten
+                self._warne(fehler)
+            finally:
+                self._queue.task_done()
+
+    def _verarbeite(self, eintrag: dict, zeit: _dt.datetime) -> None:
+        try:
+            zeile = (json.dumps(eintrag, ensure_ascii=False) + "\n").encode("utf-8")
+            self._rotiere_bei_bedarf(len(zeile), zeit.date())
+            self._oeffne()
+            self._datei.write(zeile)
+            self._groesse += len(zeile)
+            self._ungeflusht += 1
+            if self._ungeflusht >= self.flush_alle or eintrag["ereignis"] in self.flush_bei:
+                self._flush()
+        except OSError as fehler:
+            if self._queue is None:
+                raise
+            self._warne(fehler)
+
+    def _warne(self, fehler: Exception) -> None:
+        if not self._warnung_gemeldet:  # im Hintergrund: Wiedergabe nicht stoeren
+            self._warnung_gemeldet = True
+            print(f"Warnung: Abspiel-Log nicht schreibbar: {fehler}", file=sys.stderr)
+
+    def _oeffne(self) -> None:
+        if self._datei is not None:
+            return
         self.pfad.parent.mkdir(parents=True, exist_ok=True)
-        with self.pfad.open("a", encoding="utf-8") as log_datei:
-            log_datei.write(json.dumps(eintrag, ensure_ascii=False) + "\n")
+        self._datei = self.pfad.open("ab")
+        # Ohne schliesse() (synchroner Betrieb) schliesst die Garbage Collection die Datei
+        self._schliesser = weakref.finalize(self, self._datei.close)
+        self._groesse = self._datei.tell()
+        if self._datum is None and self._groesse:
+            self._datum = _dt.date.fromtimestamp(self.pfad.stat().st_mtime)
+
+    def _flush(self) -> None:
+        if self._datei is None or not self._ungeflusht:
+            return
+        self._datei.flush()
+        os.fsync(self._datei.fileno())
+        self._ungeflusht = 0
+
+    def _schliesse_datei(self) -> None:
+        if self._datei is not None:
+            self._flush()
+            self._schliesser.detach()
+            self._datei.close()
+            self._datei = None
+
+    def _rotiere_bei_bedarf(self, zeilen_bytes: int, datum: _dt.date) -> None:
+        self._oeffne()
+        if self._datum is None or not self._groesse:
+            self._datum = datum
+            return
+        if self.taeglich and datum != self._datum:
+            stempel = self._datum.isoformat()
+        elif self.max_bytes is not None and self._groesse + zeilen_bytes > self.max_bytes:
+            stempel = self._uhr().strftime("%Y-%m-%dT%H%M%S")
+        else:
+            return
+        self._schliesse_datei()
+        ziel = self.pfad.with_name(f"{self.pfad.name}.{stempel}")
+        nummer = 1
+        while ziel.exists() or ziel.with_name(ziel.name + ".gz").exists():
+            nummer += 1
+            ziel = self.pfad.with_name(f"{self.pfad.name}.{stempel}-{nummer}")
+        self.pfad.rename(ziel)
+        if self.komprimieren:
+            with ziel.open("rb") as quelle, gzip.open(ziel.with_name(ziel.name + ".gz"), "wb") as gz:
+                shutil.copyfileobj(quelle, gz)
+            ziel.unlink()
+        self._raeume_auf()
+        self._datum = datum
+        self._oeffne()
+
+    def _raeume_auf(self) -> None:
+        rotierte = sorted(
+            self.pfad.parent.glob(f"{self.pfad.name}.*"),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for alt in rotierte[: max(0, len(rotierte) - self.behalte)]:
+            alt.unlink(missing_ok=True)
+
+
+# --- SignalWecker: Signale als lesbarer Deskriptor -----------------------------
+
+class SignalWecker:
+    """Weckt ein blockierendes ``select`` bei jedem Signal mit Python-Handler auf.
+
+    Ohne ihn wuerde ``select`` nach dem Handler weiterschlafen (PEP 475). Der
+    Interpreter schreibt die Signalnummer selbst in den Socket
+    (``signal.set_wakeup_fd``); ``schliesse`` stellt den vorherigen Deskriptor
+    wieder her. Nur im Haupt-Thread nutzbar (sonst ``ValueError``).
+    """
+
+    def __init__(self) -> None:
+        self._lesen, self._schreiben = socket.socketpair()
+        self._lesen.setblocking(False)
+        self._schreiben.setblocking(False)
+        try:
+            self._vorher = signal.set_wakeup_fd(
+                self._schreiben.fileno(), warn_on_full_buffer=False
+            )
+        except ValueError:
+            self._lesen.close()
+            self._schreiben.close()
+            raise
+
+    def fileno(self) -> int:
+        return self._lesen.fileno()
+
+    def leeren(self) -> None:
+        try:
+            while self._lesen.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def schliesse(self) -> None:
+        if self._lesen.fileno() == -1:
+            return
+        signal.set_wakeup_fd(self._vorher)
+        self._lesen.close()
+        self._schreiben.close()
 
 
 # --- Orchestrierung ----------------------------------------------------------
 
 @dataclass
 class PodcastPlayer:
-    """Spielt eine Playlist ab und protokolliert jedes Ereignis."""
+    """Spielt eine Playlist ab und protokolliert jedes Ereignis.
+
+    Mit ``wecker`` und einem Backend, das ``warte_fd`` liefert, blockiert das Warten
+    auf das Dateiende ohne Zeitschritte; sonst wird alle ``warte_schritt_s`` gepollt.
+    """
 
     playlist: list[Path]
     backend: PlayerBackend
@@ -190,6 +876,7 @@ class PodcastPlayer:
     warte_schritt_s: float = 0.1
     sleep: Callable[[float], None] = time.sleep
     monotonic: Callable[[], float] = time.monotonic
+    wecker: SignalWecker | None = None
     _abbruch_signal: int | None = field(default=None, init=False)
 
     def fordere_abbruch_an(self, signalnummer: int) -> None:
@@ -198,15 +885,16 @@ class PodcastPlayer:
 
     def run(self) -> int:
         datei_fehler = False
-        for datei in self.playlist:
-            ergebnis = self._spiele_datei(datei)
+        for index, datei in enumerate(self.playlist):
+            naechste = self.playlist[index + 1] if index + 1 < len(self.playlist) else None
+            ergebnis = self._spiele_datei(datei, naechste)
             if ergebnis == "abbruch":
                 return _exit_code_fuer_signal(self._abbruch_signal)
             if ergebnis == "fehler":
                 datei_fehler = True
         return EXIT_DATEI_FEHLER if datei_fehler else EXIT_OK
 
-    def _spiele_datei(self, datei: Path) -> str:
+    def _spiele_datei(self, datei: Path, naechste: Path | None = None) -> str:
         """Spielt eine Datei ab; Rueckgabe: "ende" | "fehler" | "abbruch"."""
         self.log.schreibe("start", datei)
         beginn = self.monotonic()
@@ -215,6 +903,8 @@ class PodcastPlayer:
         except OSError as fehler:
             self.log.schreibe("fehler", datei, dauer_s=0.0, detail=str(fehler))
             return "fehler"
+        if naechste is not None:
+            self.backend.vormerken(naechste)
 
         exit_code = self._warte_bis_ende()
         dauer = self.monotonic() - beginn
@@ -240,13 +930,28 @@ class PodcastPlayer:
 
         Liefert den Exit-Code des Players oder None bei Signal-Abbruch.
         """
-        while True:
-            if self._abbruch_signal is not None:
-                return None
-            exit_code = self.backend.poll()
-            if exit_code is not None:
-                return exit_code
-            self.sleep(self.warte_schritt_s)
+        warte_fd = self.backend.warte_fd() if self.wecker is not None else None
+        if warte_fd is None:
+            while True:
+                if self._abbruch_signal is not None:
+                    return None
+                exit_code = self.backend.poll()
+                if exit_code is not None:
+                    return exit_code
+                self.sleep(self.warte_schritt_s)
+
+        with selectors.DefaultSelector() as selektor:
+            selektor.register(warte_fd, selectors.EVENT_READ)
+            selektor.register(self.wecker, selectors.EVENT_READ)
+            while True:
+                # Erst leeren, dann pruefen: ein Signal danach macht den Wecker wieder lesbar
+                self.wecker.leeren()
+                if self._abbruch_signal is not None:
+                    return None
+                exit_code = self.backend.poll()
+                if exit_code is not None:
+                    return exit_code
+                selektor.select()
 
 
 def _exit_code_fuer_signal(signalnummer: int | None) -> int:
@@ -255,6 +960,330 @@ def _exit_code_fuer_signal(signalnummer: int | None) -> int:
     return EXIT_SIGINT
 
 
+# --- LogStatistik: inkrementelle Auswertung des Abspiel-Logs ---------------------
+
+_json_zeile = json.JSONDecoder().raw_decode  # ohne Encoding-Erkennung von json.loads(bytes)
+
+
+def _buche(ziel: dict, ereignis: str, dauer_s: float | None) -> None:
+    """Zaehlt ein Ereignis; Hoerzeit aus beendeten und abgebrochenen Wiedergaben."""
+    ziel[ereignis] = ziel.get(ereignis, 0) + 1
+    if ereignis in ("ende", "abbruch") and dauer_s:
+        ziel["hoerzeit_s"] = ziel.get("hoerzeit_s", 0.0) + dauer_s
+
+
+def _oeffne_log(pfad: Path) -> BinaryIO:
+    return gzip.open(pfad, "rb") if pfad.suffix == ".gz" else pfad.open("rb")
+
+
+def _woche(tag: str) -> str:
+    jahr, woche, _ = _dt.date.fromisoformat(tag).isocalendar()
+    return f"{jahr}-W{woche:02d}"
+
+
+class LogStatistik:
+    """Aggregate ueber ``Logs/podcast-player.jsonl``, die nur neue Zeilen einlesen.
+
+    Der Zustand liegt als JSON neben dem Log (``podcast-player.stats.json``):
+
+    - ``offset``: Byte-Position hinter der letzten vollstaendig verarbeiteten Zeile;
+      ``kopf`` (Hash der ersten Zeile) erkennt eine Rotation — dann wird das Archiv
+      mit diesem Kopf ab ``offset`` zu Ende gelesen (samt juengerer Archive), die
+      neue Datei beginnt bei 0, die bisherigen Aggregate bleiben erhalten.
+    - ``pro_datei``/``pro_tag``: Zaehler je Ereignis und Hoerzeit (``ende``+``abbruch``).
+    - ``bloecke``: Zeitindex der aktuellen Datei, je ``BLOCK_ZEILEN`` Zeilen
+      ``[offset, min_zeit, max_zeit]`` (Unix-Sekunden). Zeitraum-Abfragen suchen per
+      Bisektion ueber Praefix-Maximum/Suffix-Minimum den Bereich und lesen nur ihn —
+      auch wenn die Uhr einmal zurueckspringt. Rotierte Logs sind nicht indexiert:
+      ``pro_datei(von, bis)`` zaehlt nur die aktuelle Datei; ``archiv_bis`` (spaetester
+      Zeitpunkt ausserhalb des Index) zeigt, ob ein Zeitraum davon betroffen ist.
+    """
+
+    VERSION = 2
+    BLOCK_ZEILEN = 1024
+    LESE_BYTES = 1 << 20
+
+    def __init__(self, log_pfad: Path, index_pfad: Path | None = None) -> None:
+        self.log_pfad = log_pfad
+        self.index_pfad = index_pfad or log_pfad.with_suffix(".stats.json")
+        self.zustand = self._lade()
+
+    @classmethod
+    def _leer(cls) -> dict:
+        return {
+            "version": cls.VERSION, "kopf": None, "offset": 0, "ereignisse": 0,
+            "ungueltig": 0, "pro_datei": {}, "pro_tag": {}, "bloecke": [],
+            "archiv_bis": None,
+        }
+
+    def _lade(self) -> dict:
+        try:
+            zustand = json.loads(self.index_pfad.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._leer()
+        return zustand if zustand.get("version") == self.VERSION else self._leer()
+
+    def speichere(self) -> None:
+        self.index_pfad.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.index_pfad.with_name(self.index_pfad.name + ".tmp")
+        temp.write_text(json.dumps(self.zustand, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, self.index_pfad)
+
+    def aktualisiere(self) -> int:
+        """Liest alle seit dem Checkpoint angehaengten Zeilen ein; Rueckgabe: Anzahl."""
+        z = self.zustand
+        try:
+            log_datei = self.log_pfad.open("rb")
+        except FileNotFoundError:
+            log_datei = None
+        kopf = None
+        if log_datei is not None:
+            erste_zeile = log_datei.readline(4096)
+            kopf = hashlib.sha1(erste_zeile).hexdigest() if erste_zeile else None
+        neu = 0
+        if z["kopf"] is not None and kopf != z["kopf"]:
+            # rotiert: Rest des Archivs (und juengere Archive) nachholen, Aggregate bleiben
+            neu += self._hole_archive_nach()
+            self._archiviere(max((block[2] for block in z["bloecke"]), default=None))
+            z["kopf"], z["offset"], z["bloecke"] = None, 0, []
+        if log_datei is None:
+            return neu
+        with log_datei:
+            if os.fstat(log_datei.fileno()).st_size < z["offset"]:
+                self.zustand = z = self._leer()  # gekuerzt/ueberschrieben: neu aufbauen
+            z["kopf"] = kopf
+            log_datei.seek(z["offset"])
+            neu += self._lies(log_datei, z["offset"], indexieren=True)
+        return neu
+
+    def _lies(self, datei: BinaryIO, offset: int, indexieren: bool) -> int:
+        """Verarbeitet vollstaendige Zeilen ab ``offset``; der Index wandert nur mit ``indexieren``."""
+        anzahl = 0
+        rest = b""
+        while daten := datei.read(self.LESE_BYTES):
+            zeilen = (rest + daten).split(b"\n")
+            rest = zeilen.pop()  # unvollstaendige letzte Zeile: beim naechsten Mal
+            for zeile in zeilen:
+                self._verarbeite(zeile, offset if indexieren else None)
+                offset += len(zeile) + 1
+                anzahl += 1
+        if indexieren:
+            self.zustand["offset"] = offset
+        return anzahl
+
+    def _archive(self) -> list[Path]:
+        """Rotierte Logs (``<name>.<stempel>[.gz]``), aelteste zuerst."""
+        archive = []
+        for pfad in self.log_pfad.parent.glob(f"{self.log_pfad.name}.*"):
+            try:
+                archive.append((pfad.stat().st_mtime, pfad.name, pfad))
+            except OSError:
+                continue  # inzwischen aufgeraeumt
+        return [pfad for _mtime, _name, pfad in sorted(archive)]
+
+    def _hole_archive_nach(self) -> int:
+        """Liest das per Kopf-Hash gefundene Archiv ab dem Checkpoint zu Ende und alle juengeren ganz.
+
+        Ist das Archiv schon aufgeraeumt (``--log-behalte``), bleiben dessen Restzeilen
+        verloren; die juengeren Archive werden trotzdem vollstaendig gelesen.
+        """
+        z = self.zustand
+        archive = self._archive()
+        gefunden = None
+        for index, pfad in enumerate(archive):
+            try:
+                with _oeffne_log(pfad) as datei:
+                    if hashlib.sha1(datei.readline(4096)).hexdigest() == z["kopf"]:
+                        gefunden = index
+                        break
+            except (OSError, EOFError):
+                continue
+        if gefunden is None:
+            return 0
+        neu = 0
+        for index in range(gefunden, len(archive)):
+            try:
+                with _oeffne_log(archive[index]) as datei:
+                    offset = z["offset"] if index == gefunden else 0
+                    datei.seek(offset)
+                    neu += self._lies(datei, offset, indexieren=False)
+            except (OSError, EOFError):
+                continue
+        return neu
+
+    def _archiviere(self, zeitpunkt: float | None) -> None:
+        """Merkt den spaetesten Zeitpunkt, der nicht (mehr) im Index der aktuellen Datei liegt."""
+        if zeitpunkt is not None:
+            z = self.zustand
+            z["archiv_bis"] = zeitpunkt if z["archiv_bis"] is None else max(z["archiv_bis"], zeitpunkt)
+
+    def _verarbeite(self, zeile: bytes, offset: int | None) -> None:
+        z = self.zustand
+        try:
+            eintrag = _json_zeile(zeile.decode("utf-8"))[0]
+            zeit = eintrag["zeit"]
+            zeitpunkt = _dt.datetime.fromisoformat(zeit).timestamp()
+            ereignis, datei = eintrag["ereignis"], eintrag["datei"]
+        except (ValueError, KeyError, TypeError):
+            z["ungueltig"] += 1
+            return
+        dauer_s = eintrag.get("dauer_s")
+        z["ereignisse"] += 1
+        _buche(z["pro_datei"].setdefault(datei, {}), ereignis, dauer_s)
+        _buche(z["pro_tag"].setdefault(zeit[:10], {}), ereignis, dauer_s)
+        if offset is None:  # Zeile aus einem Archiv: nicht im Index der aktuellen Datei
+            self._archiviere(zeitpunkt)
+            return
+
+        bloecke = z["bloecke"]
+        if not bloecke or bloecke[-1][3] >= self.BLOCK_ZEILEN:
+            bloecke.append([offset, zeitpunkt, zeitpunkt, 0])
+        block = bloecke[-1]
+        block[1] = min(block[1], zeitpunkt)
+        block[2] = max(block[2], zeitpunkt)
+        block[3] += 1
+
+    # --- Abfragen ---
+
+    def pro_woche(self, von: _dt.date | None = None, bis: _dt.date | None = None) -> dict[str, dict]:
+        wochen: dict[str, dict] = {}
+        for tag, zaehler in sorted(self.zustand["pro_tag"].items()):
+            if (von and tag < von.isoformat()) or (bis and tag > bis.isoformat()):
+                continue
+            woche = wochen.setdefault(_woche(tag), {})
+            for schluessel, wert in zaehler.items():
+                woche[schluessel] = woche.get(schluessel, 0) + wert
+        return wochen
+
+    def pro_datei(self, von: float | None = None, bis: float | None = None) -> dict[str, dict]:
+        """Zaehler je Datei, gesamt (aus den Aggregaten) oder fuer [von, bis] in Unix-Sekunden."""
+        if von is None and bis is None:
+            return self.zustand["pro_datei"]
+        von = -math.inf if von is None else von
+        bis = math.inf if bis is None else bis
+        ergebnis: dict[str, dict] = {}
+        anfang, ende = self._bereich(von, bis)
+        if anfang >= ende:
+            return ergebnis
+        with self.log_pfad.open("rb") as log_datei:
+            log_datei.seek(anfang)
+            for zeile in log_datei.read(ende - anfang).split(b"\n"):
+                try:
+                    eintrag = _json_zeile(zeile.decode("utf-8"))[0]
+                    zeitpunkt = _dt.datetime.fromisoformat(eintrag["zeit"]).timestamp()
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if von <= zeitpunkt <= bis:
+                    _buche(
+                        ergebnis.setdefault(eintrag["datei"], {}),
+                        eintrag["ereignis"], eintrag.get("dauer_s"),
+                    )
+        return ergebnis
+
+    def zeitraum_unvollstaendig(self, von: float | None) -> bool:
+        """True, wenn ``pro_datei(von, ...)`` eingelesene Ereignisse aus rotierten Logs auslaesst."""
+        archiv_bis = self.zustand["archiv_bis"]
+        return archiv_bis is not None and (von is None or von <= archiv_bis)
+
+    def _bereich(self, von: float, bis: float) -> tuple[int, int]:
+        """Byte-Bereich der aktuellen Datei, der alle Zeilen aus [von, bis] enthaelt."""
+        bloecke = self.zustand["bloecke"]
+        if not bloecke:
+            return 0, 0
+        praefix_max = list(itertools.accumulate((b[2] for b in bloecke), max))
+        suffix_min = list(itertools.accumulate((b[1] for b in reversed(bloecke)), min))[::-1]
+        erster = bisect.bisect_left(praefix_max, von)   # erster Block, der >= von erreichen kann
+        letzter = bisect.bisect_right(suffix_min, bis)  # Bloecke ab hier liegen ganz nach bis
+        if erster >= letzter:
+            return 0, 0
+        ende = bloecke[letzter][0] if letzter < len(bloecke) else self.zustand["offset"]
+        return bloecke[erster][0], ende
+
+
+def _format_dauer(sekunden: float) -> str:
+    minuten, sek = divmod(int(round(sekunden)), 60)
+    stunden, minuten = divmod(minuten, 60)
+    return f"{stunden}:{minuten:02d}:{sek:02d}"
+
+
+def _tagesgrenze(tag: _dt.date, ende: bool = False) -> float:
+    """Lokale Mitternacht (bzw. Ende des Tages) als Unix-Sekunden."""
+    zeitpunkt = _dt.datetime.combine(tag + _dt.timedelta(days=1) if ende else tag, _dt.time())
+    return zeitpunkt.astimezone().timestamp() - (1e-6 if ende else 0.0)
+
+
+def parse_stats_argumente(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="podcast-player.py stats",
+        description="Auswertung des Abspiel-Logs: Wiedergaben und Hoerzeit je Datei und Woche.",
+    )
+    parser.add_argument("--von", type=_dt.date.fromisoformat, default=None, metavar="JJJJ-MM-TT")
+    parser.add_argument("--bis", type=_dt.date.fromisoformat, default=None, metavar="JJJJ-MM-TT")
+    parser.add_argument(
+        "--datei", default=None, metavar="TEXT",
+        help="Nur Dateien, deren Pfad TEXT enthaelt (Gross-/Kleinschreibung egal)",
+    )
+    parser.add_argument("--top", type=int, default=20, metavar="N", help="Dateien je Liste (Default: 20)")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    parser.add_argument(
+        "--neu-aufbauen", action="store_true",
+        help="Checkpoint und Aggregate verwerfen und das Log vollstaendig neu einlesen",
+    )
+    parser.add_argument(
+        "--log-datei", type=Path, default=None, metavar="PFAD",
+        help="Pfad der Logdatei (Default: Logs/podcast-player.jsonl im Projekt)",
+    )
+    return parser.parse_args(argv)
+
+
+def main_stats(argv: list[str]) -> int:
+    argumente = parse_stats_argumente(argv)
+    statistik = LogStatistik(argumente.log_datei or standard_log_pfad())
+    if argumente.neu_aufbauen:
+        statistik.zustand = statistik._leer()
+    neu = statistik.aktualisiere()
+    statistik.speichere()
+
+    zeitraum = argumente.von is not None or argumente.bis is not None
+    von = _tagesgrenze(argumente.von) if argumente.von else None
+    dateien = statistik.pro_datei(
+        von, _tagesgrenze(argumente.bis, ende=True) if argumente.bis else None,
+    ) if zeitraum else statistik.pro_datei()
+    if zeitraum and statistik.zeitraum_unvollstaendig(von):
+        print(
+            "Hinweis: Dateien im Zeitraum nur aus dem aktuellen Log, rotierte Logs fehlen "
+            "(die Wochensummen sind vollstaendig).",
+            file=sys.stderr,
+        )
+    if argumente.datei:
+        muster = argumente.datei.casefold()
+        dateien = {d: z for d, z in dateien.items() if muster in d.casefold()}
+    rangliste = sorted(
+        dateien.items(), key=lambda paar: (-paar[1].get("hoerzeit_s", 0.0), paar[0])
+    )[: argumente.top]
+    wochen = statistik.pro_woche(argumente.von, argumente.bis)
+
+    if argumente.json:
+        print(json.dumps({
+            "ereignisse": statistik.zustand["ereignisse"], "neu": neu,
+            "wochen": wochen, "dateien": dict(rangliste),
+        }, ensure_ascii=False, indent=2))
+        return EXIT_OK
+
+    print(f"Abspiel-Statistik: {statistik.zustand['ereignisse']:,} Ereignisse ({neu:,} neu eingelesen)")
+    print("\nHoerzeit pro Woche:")
+    for woche, zaehler in wochen.items():
+        print(f"  {woche}  {_format_dauer(zaehler.get('hoerzeit_s', 0.0)):>10}  "
+              f"{zaehler.get('ende', 0):>6} beendet")
+    print("\nDateien nach Hoerzeit:")
+    print(f"  {'Starts':>7} {'Beendet':>7} {'Abbruch':>7} {'Fehler':>7} {'Hoerzeit':>10}  Datei")
+    for datei, zaehler in rangliste:
+        print(f"  {zaehler.get('start', 0):>7} {zaehler.get('ende', 0):>7} "
+              f"{zaehler.get('abbruch', 0):>7} {zaehler.get('fehler', 0):>7} "
+              f"{_format_dauer(zaehler.get('hoerzeit_s', 0.0)):>10}  {datei}")
+    return EXIT_OK
+
+
 # --- CLI ---------------------------------------------------------------------
 
 def projekt_root() -> Path:
@@ -269,34 +1298,84 @@ def parse_argumente(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         prog="podcast-player.py",
         description="Spielt MP3-Dateien als eine Playlist ab.",
+        epilog="Auswertung des Abspiel-Logs: podcast-player.py stats --help",
     )
     parser.add_argument(
         "eingaben", nargs="+", metavar="DATEI_ODER_ORDNER",
-        help="MP3-Dateien und/oder Ordner mit MP3-Dateien, in Abspielreihenfolge",
+        help="MP3-Dateien, Ordner, Glob-Muster und/oder M3U-Playlists, in Abspielreihenfolge",
+    )
+    parser.add_argument(
+        "-r", "--rekursiv", action="store_true",
+        help="Ordner samt Unterordnern abspielen (sortiert nach relativem Pfad)",
+    )
+    parser.add_argument(
+        "--scan-threads", type=int, default=8, metavar="N",
+        help="Parallele Ordner-Scans, v.a. fuer Netzlaufwerke (Default: 8)",
     )
     parser.add_argument(
         "--backend", default=None, metavar="BEFEHL",
         help="Player-Befehl erzwingen statt mpv/mplayer-Erkennung (v.a. fuer Tests)",
     )
+    parser.add_argument(
+        "--gapless", action="store_true",
+        help="Ein mpv-Prozess fuer die ganze Playlist (JSON-IPC), naechste Datei vorgeladen",
+    )
     parser.add_argument(
         "--log-datei", type=Path, default=None, metavar="PFAD",
         help="Pfad der Logdatei (Default: Logs/podcast-player.jsonl im Projekt)",
     )
+    parser.add_argument(
+        "--log-flush-alle", type=int, default=1, metavar="N",
+        help="Log alle N Ereignisse auf die Platte bringen (Abbruch, Fehler, Programmende sofort; Default: 1)",
+    )
+    parser.add_argument(
+        "--log-max-mb", type=float, default=None, metavar="MB",
+        help="Logdatei ab dieser Groesse rotieren",
+    )
+    parser.add_argument(
+        "--log-taeglich", action="store_true",
+        help="Logdatei beim Datumswechsel rotieren",
+    )
+    parser.add_argument(
+        "--log-komprimieren", action="store_true",
+        help="Rotierte Logdateien mit gzip komprimieren",
+    )
+    parser.add_argument(
+        "--log-behalte", type=int, default=7, metavar="N",
+        help="Anzahl rotierter Logdateien, die erhalten bleiben (Default: 7)",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
-    argumente = parse_argumente(argv if argv is not None else sys.argv[1:])
+    argv = argv if argv is not None else sys.argv[1:]
+    if argv[:1] == ["stats"]:  # Unterbefehl; eine Datei namens "stats" als ./stats angeben
+        return main_stats(argv[1:])
+    argumente = parse_argumente(argv)
 
     try:
-        playlist = baue_playlist(argumente.eingaben)
-        backend = finde_player_backend(override=argumente.backend)
+        playlist = baue_playlist(
+            argumente.eingaben, rekursiv=argumente.rekursiv, scan_threads=argumente.scan_threads
+        )
+        backend = finde_player_backend(override=argumente.backend, gapless=argumente.gapless)
     except (PlaylistFehler, PlayerNichtGefunden) as fehler:
         print(f"Fehler: {fehler}", file=sys.stderr)
         return EXIT_BENUTZUNG
 
-    log = EventLog(argumente.log_datei or standard_log_pfad())
-    player = PodcastPlayer(playlist=playlist, backend=backend, log=log)
+    log = EventLog(
+        argumente.log_datei or standard_log_pfad(),
+        flush_alle=argumente.log_flush_alle,
+        max_bytes=int(argumente.log_max_mb * 1024 * 1024) if argumente.log_max_mb else None,
+        taeglich=argumente.log_taeglich,
+        komprimieren=argumente.log_komprimieren,
+        behalte=argumente.log_behalte,
+        asynchron=True,
+    )
+    try:
+        wecker: SignalWecker | None = SignalWecker()
+    except ValueError:  # nicht im Haupt-Thread: Polling
+        wecker = None
+    player = PodcastPlayer(playlist=playlist, backend=backend, log=log, wecker=wecker)
 
     def signal_handler(signalnummer: int, _frame: object) -> None:
         player.fordere_abbruch_an(signalnummer)
@@ -310,6 +1389,10 @@ def main(argv: list[str] | None = None) -> int:
     finally:
         for signalnummer, handler in vorherige_handler.items():
             signal.signal(signalnummer, handler)
+        backend.schliesse()
+        if wecker is not None:
+            wecker.schliesse()
+        log.schliesse()
 
 
 if __name__ == "__main__":  # pragma: no cover — Einstieg laeuft nur im E2E-Subprozess
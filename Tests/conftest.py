@@ -24,6 +24,8 @@ class FakePlayerBackend(PlayerBackend):
       hinterlegte Exit-Code zurueckkommt (simuliert Spieldauer).
     - ``bei_start``: optionaler Hook (datei -> None), z.B. um waehrend der
       "Wiedergabe" einen Abbruch anzufordern.
+    - ``vorgemerkte_dateien``/``schliesse_aufrufe`` protokollieren die
+      optionalen Hooks ``vormerken`` und ``schliesse``.
     """
 
     def __init__(
@@ -36,7 +38,9 @@ class FakePlayerBackend(PlayerBackend):
         self.polls_bis_ende = polls_bis_ende
         self.bei_start = bei_start
         self.gestartete_dateien: list[Path] = []
+        self.vorgemerkte_dateien: list[Path] = []
         self.terminate_aufrufe = 0
+        self.schliesse_aufrufe = 0
         self._laufende_datei: Path | None = None
         self._verbleibende_polls = 0
 
@@ -61,6 +65,12 @@ class FakePlayerBackend(PlayerBackend):
         self.terminate_aufrufe += 1
         self._laufende_datei = None
 
+    def vormerken(self, datei: Path) -> None:
+        self.vorgemerkte_dateien.append(datei)
+
+    def schliesse(self) -> None:
+        self.schliesse_aufrufe += 1
+
 
 class FakeUhr:
     """Deterministische monotone Uhr; ``sleep`` rueckt die Zeit vor."""
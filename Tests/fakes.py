@@ -5,6 +5,10 @@ jeden Abspielvorgang protokollieren. Verhalten je Dateiname:
 ``kaputt`` -> Exit 1, ``sendesignal`` -> SIGINT an den Elternprozess.
 Schlafdauer via ``FAKE_PLAYER_SLEEP``.
 
+``FakeMpvServer`` steht fuer einen mpv im JSON-IPC-Betrieb (``--gapless``):
+in-process als Thread oder als ausfuehrbares ``fakebin``-Skript, das wie mpv
+``--input-ipc-server=PFAD`` auswertet.
+
 Es laeuft nie ein echter mpv- oder mplayer-Prozess; ein ``pactl`` existiert
 im ``fakebin`` bewusst nicht — jeder pactl-Aufruf des Players wuerde bei
 ``PATH=fakebin`` sofort scheitern (R00003: der Player beruehrt keine
@@ -15,8 +19,13 @@ from __future__ import annotations
 
 import json
 import os
+import selectors
+import signal
+import socket
 import stat
 import sys
+import threading
+import time
 from pathlib import Path
 
 FAKE_PLAYER_QUELLTEXT = f'''#!{sys.executable}
@@ -38,17 +47,220 @@ time.sleep(float(os.environ.get("FAKE_PLAYER_SLEEP", "0")))
 sys.exit(1 if "kaputt" in name else 0)
 '''
 
+FAKE_MPV_IPC_QUELLTEXT = f'''#!{sys.executable}
+import os, sys
+
+sys.path.insert(0, {str(Path(__file__).resolve().parent)!r})
+from fakes import FakeMpvServer
+
+socket_pfad = next(
+    a.split("=", 1)[1] for a in sys.argv[1:] if a.startswith("--input-ipc-server=")
+)
+FakeMpvServer(
+    socket_pfad,
+    dauer_s=float(os.environ.get("FAKE_PLAYER_SLEEP", "0")),
+    player_log=os.environ.get("FAKE_PLAYER_LOG"),
+    argv=sys.argv[1:],
+    signal_ziel=os.getppid(),
+).serve()
+'''
+
+
+class FakeMpvServer:
+    """mpv-Ersatz mit JSON-IPC auf einem Unix-Socket (Teilmenge des echten Protokolls).
+
+    Versteht ``loadfile`` (``replace``/``append``/``append-play``), ``stop``,
+    ``quit`` und ``get_property pid``; sendet ``start-file``, ``end-file``
+    (``eof``/``error``/``stop``, mit ``playlist_entry_id``) und ``idle``.
+    Jede "Wiedergabe" dauert ``dauer_s``; nicht existierende Dateien und
+    ``kaputt`` im Namen enden mit ``reason: error``, ``sendesignal`` schickt
+    SIGINT an ``signal_ziel``. Gestartete Dateien landen wie beim Fake-Player
+    in ``player_log`` (zusaetzlich mit pid), empfangene Befehle in ``befehle``.
+    """
+
+    def __init__(
+        self,
+        socket_pfad: Path | str,
+        dauer_s: float = 0.0,
+        player_log: Path | str | None = None,
+        argv: list[str] | tuple[str, ...] = (),
+        signal_ziel: int | None = None,
+    ) -> None:
+        self.socket_pfad = str(socket_pfad)
+        self.dauer_s = dauer_s
+        self.player_log = player_log
+        self.argv = list(argv)
+        self.signal_ziel = signal_ziel
+        self.befehle: list[list] = []
+        self._playlist: list[dict] = []
+        self._position: int | None = None
+        self._ende: float | None = None
+        self._naechste_id = 1
+        self._clients: dict[socket.socket, bytes] = {}
+        self._selektor = selectors.DefaultSelector()
+        self._weck_lesen, self._weck_schreiben = socket.socketpair()
+        self._laeuft = True
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if os.path.exists(self.socket_pfad):
+            os.unlink(self.socket_pfad)
+        self._server.bind(self.socket_pfad)
+        self._server.listen()
+
+    def starte_im_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve, daemon=True)
+        thread.start()
+        return thread
+
+    def stoppe(self) -> None:
+        """Beendet ``serve`` von aussen (wie ein Absturz: Verbindungen brechen ab)."""
+        self._laeuft = False
+        try:
+            self._weck_schreiben.send(b"x")
+        except OSError:
+            pass  # serve ist schon beendet
+        self._weck_schreiben.close()
+
+    def serve(self) -> None:
+        self._selektor.register(self._server, selectors.EVENT_READ)
+        self._selektor.register(self._weck_lesen, selectors.EVENT_READ)
+        try:
+            while self._laeuft:
+                timeout = None if self._ende is None else max(0.0, self._ende - time.monotonic())
+                for schluessel, _maske in self._selektor.select(timeout):
+                    if schluessel.fileobj is self._server:
+                        client, _ = self._server.accept()
+                        self._clients[client] = b""
+                        self._selektor.register(client, selectors.EVENT_READ)
+                    elif schluessel.fileobj is not self._weck_lesen:
+                        self._lies(schluessel.fileobj)
+                if self._ende is not None and time.monotonic() >= self._ende:
+                    eintrag = self._playlist[self._position]
+                    self._sende_an_alle({
+                        "event": "end-file", "reason": "eof",
+                        "playlist_entry_id": eintrag["id"],
+                    })
+                    self._spiele_ab(self._position + 1)
+        finally:
+            for client in list(self._clients):
+                client.close()
+            self._server.close()
+            self._weck_lesen.close()
+            self._selektor.close()
+            if os.path.exists(self.socket_pfad):
+                os.unlink(self.socket_pfad)
+
+    def _lies(self, client: socket.socket) -> None:
+        try:
+            daten = client.recv(65536)
+        except OSError:
+            daten = b""
+        if not daten:
+            self._selektor.unregister(client)
+            del self._clients[client]
+            client.close()
+            return
+        *zeilen, self._clients[client] = (self._clients[client] + daten).split(b"\n")
+        for zeile in zeilen:
+            if zeile.strip():
+                self._befehl(client, json.loads(zeile))
+
+    def _befehl(self, client: socket.socket, nachricht: dict) -> None:
+        befehl = nachricht["command"]
+        self.befehle.append(befehl)
+        antwort: dict = {"request_id": nachricht.get("request_id", 0), "error": "success"}
+        if befehl[0] == "loadfile":
+            modus = befehl[2] if len(befehl) > 2 else "replace"
+            eintrag = {"id": self._naechste_id, "datei": befehl[1]}
+            self._naechste_id += 1
+            antwort["data"] = {"playlist_entry_id": eintrag["id"]}
+            self._schreibe(client, antwort)
+            if modus == "replace":
+                self._stoppe_aktuelle()
+                self._playlist = [eintrag]
+                self._spiele_ab(0)
+            else:
+                self._playlist.append(eintrag)
+                if modus == "append-play" and self._position is None:
+                    self._spiele_ab(len(self._playlist) - 1)
+            return
+        if befehl[0] == "stop":
+            self._stoppe_aktuelle()
+            self._playlist = []
+            self._spiele_ab(None)
+        elif befehl[0] == "quit":
+            self._schreibe(client, antwort)
+            self._laeuft = False
+            return
+        elif befehl[:2] == ["get_property", "pid"]:
+            antwort["data"] = os.getpid()
+        else:
+            antwort["error"] = "property unavailable" if befehl[0] == "get_property" else "invalid parameter"
+        self._schreibe(client, antwort)
+
+    def _stoppe_aktuelle(self) -> None:
+        if self._position is not None:
+            self._sende_an_alle({
+                "event": "end-file", "reason": "stop",
+                "playlist_entry_id": self._playlist[self._position]["id"],
+            })
+
+    def _spiele_ab(self, position: int | None) -> None:
+        while position is not None and position < len(self._playlist):
+            eintrag = self._playlist[position]
+            self._sende_an_alle({"event": "start-file", "playlist_entry_id": eintrag["id"]})
+            self._protokolliere(eintrag["datei"])
+            name = os.path.basename(eintrag["datei"])
+            if "sendesignal" in name and self.signal_ziel is not None:
+                os.kill(self.signal_ziel, signal.SIGINT)
+            if "kaputt" in name or not os.path.exists(eintrag["datei"]):
+                self._sende_an_alle({
+                    "event": "end-file", "reason": "error", "file_error": "loading failed",
+                    "playlist_entry_id": eintrag["id"],
+                })
+                position += 1
+                continue
+            self._position = position
+            self._ende = time.monotonic() + self.dauer_s
+            return
+        self._position = None
+        self._ende = None
+        self._sende_an_alle({"event": "idle"})
+
+    def _protokolliere(self, datei: str) -> None:
+        if self.player_log is None:
+            return
+        with open(self.player_log, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"datei": datei, "argv": self.argv, "pid": os.getpid()}) + "\n")
+
+    def _sende_an_alle(self, ereignis: dict) -> None:
+        for client in list(self._clients):
+            self._schreibe(client, ereignis)
+
+    @staticmethod
+    def _schreibe(client: socket.socket, nachricht: dict) -> None:
+        try:
+            client.sendall((json.dumps(nachricht) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
 
 class FakeUmgebung:
     """Legt fakebin und Protokolldatei an und liefert die Umgebungsvariablen."""
 
-    def __init__(self, wurzel: Path, player_namen: tuple[str, ...] = ("fake-player",)) -> None:
+    def __init__(
+        self,
+        wurzel: Path,
+        player_namen: tuple[str, ...] = ("fake-player",),
+        ipc_namen: tuple[str, ...] = (),
+    ) -> None:
         self.wurzel = wurzel
         self.fakebin = wurzel / "fakebin"
         self.fakebin.mkdir()
         self.player_log = wurzel / "player.log"
         for name in player_namen:
             self._schreibe_skript(self.fakebin / name, FAKE_PLAYER_QUELLTEXT)
+        for name in ipc_namen:
+            self._schreibe_skript(self.fakebin / name, FAKE_MPV_IPC_QUELLTEXT)
 
     @staticmethod
     def _schreibe_skript(pfad: Path, quelltext: str) -> None:
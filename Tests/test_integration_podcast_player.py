@@ -8,14 +8,22 @@ entsprechen den User Stories in Anforderungen/user-stories/R00003.md.
 
 from __future__ import annotations
 
+import gzip
 import json
+import os
+import selectors
+import shutil
 import signal
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 
 import podcast_player as pp
 import pytest
-from fakes import FakeUmgebung
+from conftest import FakePlayerBackend, FakeUhr
+from fakes import FakeMpvServer, FakeUmgebung
 
 
 @pytest.fixture
@@ -85,6 +93,21 @@ class TestPlaylistAbspielen:
             "Eins.mp3", "zwei.mp3",
         ]
 
+    def test_rekursiver_ordner_und_m3u(self, umgebung, tmp_path, mp3s):
+        mp3s("archiv/2026/b.mp3", "archiv/a.mp3", "extra.mp3")
+        (tmp_path / "heute.m3u").write_text("#EXTM3U\nextra.mp3\n", encoding="utf-8")
+        backend = str(umgebung.fakebin / "fake-player")
+
+        exit_code, _log = starte_main(
+            umgebung, tmp_path,
+            ["-r", str(tmp_path / "archiv"), str(tmp_path / "heute.m3u"), "--backend", backend],
+        )
+
+        assert exit_code == 0
+        assert [Path(e["datei"]).name for e in umgebung.abgespielte_dateien()] == [
+            "b.mp3", "a.mp3", "extra.mp3",
+        ]
+
     def test_fehlendes_argument_ergibt_exit_2_ohne_wiedergabe(
         self, umgebung, tmp_path, capsys
     ):
@@ -253,6 +276,292 @@ class TestCommandPlayerBackend:
         assert backend.poll() is not None  # via SIGKILL beendet
 
 
+# --- MpvIpcBackend gegen den FakeMpvServer (Thread, kein Prozess) -------------
+
+@pytest.fixture
+def mpv_server(tmp_path):
+    """Startet FakeMpvServer-Instanzen im Thread; Socket in kurzem Pfad (AF_UNIX-Limit)."""
+    verzeichnis = Path(tempfile.mkdtemp(prefix="fake-mpv-"))
+    server_liste = []
+
+    def starte(dauer_s: float = 0.0) -> FakeMpvServer:
+        server = FakeMpvServer(
+            verzeichnis / "mpv.sock", dauer_s=dauer_s, player_log=tmp_path / "player.log"
+        )
+        server.starte_im_thread()
+        server_liste.append(server)
+        return server
+
+    yield starte
+    for server in server_liste:
+        server.stoppe()
+    shutil.rmtree(verzeichnis, ignore_errors=True)
+
+
+def warte_auf_ergebnis(backend, timeout_s: float = 5.0) -> int | None:
+    frist = time.monotonic() + timeout_s
+    while (exit_code := backend.poll()) is None and time.monotonic() < frist:
+        time.sleep(0.005)
+    return exit_code
+
+
+class TestMpvIpcBackend:
+    def test_eof_ereignis_liefert_0(self, mpv_server, mp3s):
+        server = mpv_server()
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        (datei,) = mp3s("a.mp3")
+
+        backend.start(Path(datei))
+
+        assert warte_auf_ergebnis(backend) == 0
+        assert server.befehle == [["loadfile", datei, "replace"]]
+        backend.schliesse()
+
+    def test_vorgemerkte_datei_laeuft_ohne_neues_laden_weiter(self, mpv_server, mp3s):
+        server = mpv_server(dauer_s=0.05)
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        a, b = mp3s("a.mp3", "b.mp3")
+
+        backend.start(Path(a))
+        backend.vormerken(Path(b))
+        assert warte_auf_ergebnis(backend) == 0
+        backend.start(Path(b))
+
+        assert warte_auf_ergebnis(backend) == 0
+        assert server.befehle == [
+            ["loadfile", a, "replace"], ["loadfile", b, "append-play"],
+        ]
+        backend.schliesse()
+
+    def test_fehlerhafte_datei_liefert_1_und_vorgemerkte_folgt(self, mpv_server, mp3s):
+        server = mpv_server()
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        kaputt, b = mp3s("kaputt.mp3", "b.mp3")
+
+        backend.start(Path(kaputt))
+        backend.vormerken(Path(b))
+        assert warte_auf_ergebnis(backend) == 1
+        backend.start(Path(b))
+
+        assert warte_auf_ergebnis(backend) == 0
+        assert len(server.befehle) == 2  # b kam aus der Vormerkung
+        backend.schliesse()
+
+    def test_nicht_vorgemerkte_datei_ersetzt_die_playlist(self, mpv_server, mp3s):
+        server = mpv_server()
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        a, b, c = mp3s("a.mp3", "b.mp3", "c.mp3")
+
+        backend.start(Path(a))
+        backend.vormerken(Path(b))
+        assert warte_auf_ergebnis(backend) == 0
+        backend.start(Path(c))
+
+        assert warte_auf_ergebnis(backend) == 0
+        assert server.befehle[-1] == ["loadfile", c, "replace"]
+        backend.schliesse()
+
+    def test_terminate_stoppt_die_wiedergabe(self, mpv_server, mp3s):
+        server = mpv_server(dauer_s=30)
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        (datei,) = mp3s("a.mp3")
+        backend.start(Path(datei))
+        assert backend.poll() is None  # spielt
+
+        backend.terminate()
+        backend.terminate()  # idempotent
+
+        frist = time.monotonic() + 5
+        while ["stop"] not in server.befehle and time.monotonic() < frist:
+            time.sleep(0.005)
+        assert server.befehle.count(["stop"]) == 1
+        backend.schliesse()
+
+    def test_verbindungsabbruch_waehrend_wiedergabe_ist_fehler(self, mpv_server, mp3s):
+        server = mpv_server(dauer_s=30)
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        (datei,) = mp3s("a.mp3")
+        backend.start(Path(datei))
+
+        server.stoppe()
+
+        assert warte_auf_ergebnis(backend) == 1
+        backend.schliesse()
+
+    def test_sofort_beendeter_prozess_ist_startfehler(self):
+        backend = pp.MpvIpcBackend([sys.executable, "-c", "import sys; sys.exit(4)"])
+
+        with pytest.raises(OSError, match="Exit-Code 4"):
+            backend.start(Path("egal.mp3"))
+        backend.schliesse()
+
+    def test_fehlender_socket_ohne_prozess_ist_startfehler(self, tmp_path):
+        backend = pp.MpvIpcBackend(
+            None, socket_pfad=tmp_path / "gibtsnicht.sock", verbinde_timeout_s=0.1
+        )
+
+        with pytest.raises(OSError):
+            backend.start(Path("egal.mp3"))
+
+
+# --- --gapless: ein Fake-mpv-Prozess fuer die ganze Playlist --------------------
+
+@pytest.fixture
+def ipc_umgebung(tmp_path, monkeypatch):
+    """Wie ``umgebung``, aber ``mpv`` im fakebin spricht JSON-IPC."""
+    fake = FakeUmgebung(tmp_path, player_namen=("mplayer",), ipc_namen=("mpv",))
+    for name, wert in fake.umgebungsvariablen().items():
+        monkeypatch.setenv(name, wert)
+    return fake
+
+
+class TestGapless:
+    def test_playlist_laeuft_in_einem_prozess(self, ipc_umgebung, tmp_path, mp3s):
+        dateien = mp3s("a.mp3", "b.mp3", "c.mp3")
+
+        exit_code, log = starte_main(ipc_umgebung, tmp_path, [*dateien, "--gapless"])
+
+        assert exit_code == 0
+        abspielungen = ipc_umgebung.abgespielte_dateien()
+        assert [Path(e["datei"]).name for e in abspielungen] == ["a.mp3", "b.mp3", "c.mp3"]
+        assert len({e["pid"] for e in abspielungen}) == 1
+        assert "--input-ipc-server" in abspielungen[0]["argv"][-1]
+        assert [(e["ereignis"], Path(e["datei"]).name) for e in log] == [
+            ("start", "a.mp3"), ("ende", "a.mp3"),
+            ("start", "b.mp3"), ("ende", "b.mp3"),
+            ("start", "c.mp3"), ("ende", "c.mp3"),
+        ]
+        with pytest.raises(ProcessLookupError):  # mpv am Ende beendet
+            os.kill(abspielungen[0]["pid"], 0)
+
+    def test_kaputte_datei_rest_laeuft_exit_1(self, ipc_umgebung, tmp_path, mp3s):
+        dateien = mp3s("a.mp3", "kaputt.mp3", "c.mp3")
+
+        exit_code, log = starte_main(ipc_umgebung, tmp_path, [*dateien, "--gapless"])
+
+        assert exit_code == 1
+        ereignisse = [(e["ereignis"], Path(e["datei"]).name) for e in log]
+        assert ("fehler", "kaputt.mp3") in ereignisse
+        assert ("ende", "c.mp3") in ereignisse
+
+    def test_sigint_bricht_ab(self, ipc_umgebung, tmp_path, mp3s, monkeypatch):
+        monkeypatch.setenv("FAKE_PLAYER_SLEEP", "5")
+        dateien = mp3s("sendesignal.mp3", "b.mp3")
+
+        exit_code, log = starte_main(ipc_umgebung, tmp_path, [*dateien, "--gapless"])
+
+        assert exit_code == 130
+        assert [e["ereignis"] for e in log] == ["start", "abbruch"]
+
+
+# --- Ereignisgesteuertes Warten (pidfd/SIGCHLD + SignalWecker) ----------------
+
+def kein_polling(_sekunden):
+    pytest.fail("PodcastPlayer hat gepollt statt zu blockieren")
+
+
+@pytest.fixture
+def wecker():
+    signal_wecker = pp.SignalWecker()
+    yield signal_wecker
+    signal_wecker.schliesse()
+
+
+def ereignis_player(tmp_path, playlist, backend, wecker):
+    return pp.PodcastPlayer(
+        playlist=playlist, backend=backend, log=pp.EventLog(tmp_path / "log.jsonl"),
+        sleep=kein_polling, wecker=wecker,
+    )
+
+
+class TestEreignisgesteuertesWarten:
+    def test_pidfd_wird_lesbar_wenn_das_kind_endet(self):
+        backend = python_backend("import time; time.sleep(0.1)")
+        backend.start(Path("egal.mp3"))
+        warte_fd = backend.warte_fd()
+        assert warte_fd is not None
+
+        with selectors.DefaultSelector() as selektor:
+            selektor.register(warte_fd, selectors.EVENT_READ)
+            assert selektor.select(timeout=5)
+
+        assert backend.poll() == 0
+        assert backend.warte_fd() is None  # pidfd nach dem Ende geschlossen
+
+    def test_playlist_laeuft_ohne_polling(self, tmp_path, wecker):
+        backend = python_backend("import time; time.sleep(0.05)")
+        player = ereignis_player(
+            tmp_path, [Path("a.mp3"), Path("b.mp3")], backend, wecker
+        )
+
+        assert player.run() == 0
+        backend.schliesse()
+
+    def test_signal_weckt_das_warten_sofort(self, tmp_path, wecker):
+        backend = python_backend("import time; time.sleep(30)")
+        player = ereignis_player(tmp_path, [Path("a.mp3")], backend, wecker)
+        vorher = signal.signal(signal.SIGINT, lambda n, _f: player.fordere_abbruch_an(n))
+        try:
+            threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGINT)).start()
+            beginn = time.monotonic()
+
+            exit_code = player.run()
+
+            assert exit_code == 130
+            assert time.monotonic() - beginn < 5
+            assert backend.poll() is not None  # Player beendet
+        finally:
+            signal.signal(signal.SIGINT, vorher)
+
+    def test_sigchld_pipe_ersetzt_fehlendes_pidfd(self, tmp_path, wecker, monkeypatch):
+        def kein_pidfd(_pid):
+            raise OSError("pidfd_open nicht verfuegbar")
+
+        monkeypatch.setattr(os, "pidfd_open", kein_pidfd)
+        handler_vorher = signal.getsignal(signal.SIGCHLD)
+        backend = python_backend("import time; time.sleep(0.05)")
+        player = ereignis_player(
+            tmp_path, [Path("a.mp3"), Path("b.mp3")], backend, wecker
+        )
+
+        assert player.run() == 0
+        assert backend.warte_fd() is not None
+
+        backend.schliesse()
+        assert signal.getsignal(signal.SIGCHLD) is handler_vorher
+
+    def test_ipc_backend_wartet_auf_den_socket(self, tmp_path, wecker, mpv_server, mp3s):
+        server = mpv_server(dauer_s=0.05)
+        backend = pp.MpvIpcBackend(None, socket_pfad=Path(server.socket_pfad))
+        player = ereignis_player(
+            tmp_path, [Path(d) for d in mp3s("a.mp3", "b.mp3")], backend, wecker
+        )
+
+        assert player.run() == 0
+        backend.schliesse()
+
+    def test_fake_backend_ohne_warte_fd_pollt_weiter(self, tmp_path, wecker):
+        uhr = FakeUhr()
+        player = pp.PodcastPlayer(
+            playlist=[Path("a.mp3")], backend=FakePlayerBackend(polls_bis_ende=3),
+            log=pp.EventLog(tmp_path / "log.jsonl"), sleep=uhr.sleep,
+            monotonic=uhr.monotonic, wecker=wecker,
+        )
+
+        assert player.run() == 0
+        assert uhr.jetzt == pytest.approx(0.3)
+
+    def test_wecker_stellt_vorherigen_wakeup_fd_wieder_her(self):
+        vorher = signal.set_wakeup_fd(-1)
+        signal.set_wakeup_fd(vorher)
+
+        signal_wecker = pp.SignalWecker()
+        signal_wecker.schliesse()
+        signal_wecker.schliesse()  # idempotent
+
+        assert signal.set_wakeup_fd(vorher) == vorher
+
+
 # --- US-4: Sauberer Abbruch (Signal-Handler von main) -------------------------
 
 class TestSignalHandlerVonMain:
@@ -280,3 +589,24 @@ class TestLogStandardpfad:
     def test_standard_log_pfad_liegt_im_projekt(self):
         erwartet = Path(pp.__file__).resolve().parent.parent / "Logs" / "podcast-player.jsonl"
         assert pp.standard_log_pfad() == erwartet
+
+
+class TestLogRotationUeberCli:
+    def test_rotierte_logs_enthalten_zusammen_alle_ereignisse(self, umgebung, tmp_path, mp3s):
+        dateien = mp3s("a.mp3", "b.mp3", "c.mp3")
+        backend = str(umgebung.fakebin / "fake-player")
+
+        exit_code, log = starte_main(
+            umgebung, tmp_path,
+            [*dateien, "--backend", backend, "--log-max-mb", "0.0003", "--log-komprimieren"],
+        )
+
+        assert exit_code == 0
+        archive = sorted(tmp_path.glob("abspiel-log.jsonl.*.gz"))
+        assert archive
+        ereignisse = [
+            json.loads(z)["ereignis"]
+            for archiv in archive
+            for z in gzip.decompress(archiv.read_bytes()).decode("utf-8").splitlines()
+        ] + [e["ereignis"] for e in log]
+        assert sorted(ereignisse) == sorted(["start", "ende"] * 3)
@@ -0,0 +1,1171 @@
+"""Unit-Tests fuer fruehsport-audio (R00001) — ohne API-Aufrufe; was ffmpeg braucht, laeuft nur, wenn es installiert ist."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import math
+import random
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import PROJEKT_ROOT, FakeUhr
+
+# Der Dateiname enthaelt einen Bindestrich: per Spec laden und unter einem Modulnamen
+# registrieren, damit Prozess-Pools die Funktionen pickeln koennen
+_SPEC = importlib.util.spec_from_file_location("fruehsport_audio", PROJEKT_ROOT / "Apps" / "fruehsport-audio.py")
+fa = importlib.util.module_from_spec(_SPEC)
+sys.modules["fruehsport_audio"] = fa
+_SPEC.loader.exec_module(fa)
+
+
+# --- Chunking ------------------------------------------------------------------
+
+def ist_satzende(text: str) -> bool:
+    """Prueft den ersten Satzende-Kandidaten in ``text``."""
+    return fa._is_sentence_end(text, fa.SENTENCE_END_PATTERN.search(text))
+
+
+class TestSatzende:
+    @pytest.mark.parametrize("text", [
+        "Das geht z. B. so weiter",
+        "Wir machen ca. zehn Wiederholungen",
+        "Arme bzw. Beine strecken",
+        "Das heißt d. h. nichts",
+        "Am 3. Mai geht es los",
+    ])
+    def test_abkuerzungen_und_ordinalzahlen_beenden_keinen_satz(self, text):
+        assert not ist_satzende(text)
+
+    def test_zahl_vor_punkt_ist_nie_satzende(self):
+        # Festgelegt: "10." gilt als Ordinalzahl, auch wenn ein neuer Satz folgt
+        assert not ist_satzende("Zähle bis 10. Dann atme aus.")
+
+    @pytest.mark.parametrize("text", [
+        "Sehr gut. Weiter geht es",
+        "Bist du bereit? Los geht es",
+        "Super! Noch einmal",
+        "Und dann… Stille",
+        "Er sagt „Stopp.“ Dann weiter",
+        "Erster Absatz\n\nzweiter Absatz",
+    ])
+    def test_echte_satzenden(self, text):
+        assert ist_satzende(text)
+
+    def test_auslassung_vor_kleinbuchstabe_ist_kein_satzende(self):
+        assert not ist_satzende("Und dann… weiter geht es")
+
+
+class TestSplitTextIntoChunks:
+    def test_kurzer_text_bleibt_ein_chunk(self):
+        assert fa.split_text_into_chunks("  Ein Satz.  ", max_chars=50) == ["Ein Satz."]
+        assert fa.split_text_into_chunks("   ", max_chars=50) == []
+
+    def test_teilt_an_satzgrenzen_und_packt_moeglichst_voll(self):
+        text = "Wir machen z. B. Kniebeugen. Das ist gut. Und ca. fünf Mal. Fertig!"
+
+        assert fa.split_text_into_chunks(text, max_chars=40) == [
+            "Wir machen z. B. Kniebeugen.", "Das ist gut. Und ca. fünf Mal. Fertig!",
+        ]
+
+    def test_ausrufe_fragen_und_auslassungen(self):
+        assert fa.split_text_into_chunks("Hallo? Ja! Und dann… weiter. Los…", max_chars=12) == [
+            "Hallo? Ja!", "Und dann…", "weiter. Los…",
+        ]
+
+    def test_zahl_mit_punkt_wird_nicht_geteilt(self):
+        chunks = fa.split_text_into_chunks("Zähle bis 10. Dann atme aus. " * 3, max_chars=30)
+
+        assert chunks == ["Zähle bis 10. Dann atme aus."] * 3
+
+    def test_ueberlanger_satz_an_nebensatzgrenze(self):
+        chunks = fa.split_text_into_chunks("eins, zwei, drei, vier, fünf, sechs, sieben, acht", max_chars=20)
+
+        assert chunks == ["eins, zwei, drei,", "vier, fünf, sechs,", "sieben, acht"]
+
+    def test_ohne_nebensatz_an_leerraum(self):
+        chunks = fa.split_text_into_chunks("eins zwei drei vier fünf sechs sieben acht", max_chars=20)
+
+        assert chunks == ["eins zwei drei vier", "fünf sechs sieben", "acht"]
+
+    def test_ohne_leerraum_hart_geteilt(self):
+        assert fa.split_text_into_chunks("a" * 50, max_chars=20) == ["a" * 20, "a" * 20, "a" * 10]
+
+    def test_hard_split_bevorzugt_nebensatz_vor_leerraum_vor_hartem_schnitt(self):
+        assert fa._hard_split("aaaaaaaaaaa, bbb cccccccc", 0, 20, 20) == 12
+        # Nebensatz in der ersten Fensterhaelfte: lieber am Leerraum, keine Mini-Chunks
+        assert fa._hard_split("aaaa, bbbbbbbbbbb cccccccc", 0, 20, 20) == 17
+        assert fa._hard_split("aaaaaaaaa bbbbbbbbbbbb", 0, 20, 20) == 9
+        assert fa._hard_split("a" * 30, 0, 20, 20) == 20
+
+    def test_max_seconds_begrenzt_nach_sprechtempo(self):
+        limit = 2 * fa.SPEECH_CHARS_PER_SECOND
+        chunks = fa.split_text_into_chunks("Kurz. " * 40, max_chars=4000, max_seconds=2)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= limit for chunk in chunks)
+
+    @pytest.mark.parametrize("limit", [1, 7, 25, 80])
+    def test_kein_chunk_ueber_dem_limit_und_nichts_verloren(self, limit):
+        text = (
+            "Guten Morgen! Heute z. B. Dehnen, ca. 3 Min. lang; dann: Kniebeugen… "
+            "Zähle bis 10. Bereit?\n\nNeuer Absatz mit einem sehr-langen-zusammengesetzten-Wort, "
+            "und noch einem — Ende."
+        ) * 3
+
+        chunks = fa.split_text_into_chunks(text, max_chars=limit)
+
+        assert all(0 < len(chunk) <= limit for chunk in chunks)
+        assert "".join("".join(chunks).split()) == "".join(text.split())
+
+
+# --- Skript-Parser ---------------------------------------------------------------
+
+def parse_script_vor_tokenizer(text: str, default_voice: str = fa.DEFAULT_VOICE) -> list:
+    """Referenz: parse_script vor dem ScriptTokenizer (ein Regex je Direktive, Warnungen ohne Ausgabe)."""
+    start_match = re.search(r"^#START\s*$", text, re.MULTILINE | re.IGNORECASE)
+    if start_match:
+        text = text[start_match.end():]
+    muster = {
+        "pause": r"^#PAUSE\s+(\d+)\s*$", "include": r"^#INCLUDE\s+(.+?)\s*$", "voice": r"^#VOICE\s+(\w+)\s*$",
+    }
+    directives = sorted(
+        (m.start(), m.end(), art, m.group(1))
+        for art, regex in muster.items()
+        for m in re.finditer(regex, text, re.MULTILINE | re.IGNORECASE)
+    )
+    segments = []
+    current_voice = default_voice
+    pos = 0
+    for start, end, art, wert in directives:
+        if text_before := text[pos:start].strip():
+            segments.append(fa.Segment(content=text_before, is_pause=False, voice=current_voice))
+        if art == "pause" and int(wert) > 0:
+            segments.append(fa.Segment(content=int(wert), is_pause=True))
+        elif art == "include":
+            segments.append(fa.Segment(content=wert, is_pause=False, is_include=True))
+        elif art == "voice":
+            current_voice = wert.lower() if wert.lower() in fa.VALID_VOICES else default_voice
+        pos = end
+    if remaining := text[pos:].strip():
+        segments.append(fa.Segment(content=remaining, is_pause=False, voice=current_voice))
+    return segments
+
+
+SKRIPTE = {
+    "ohne_direktiven": "Guten Morgen.\nWir beginnen.",
+    "start_verwirft_kopf": "Material: Matte\n#PAUSE 5\n#VOICE onyx\n#START\nLos geht's.\n#PAUSE 3\nWeiter.",
+    "direktiven_vor_start": "#INCLUDE intro.mp3\n#VOICE ash\nKopf\n#START\nNur das hier.",
+    "unbekannte_stimme": "#VOICE robot\nHallo.\n#VOICE Coral\nTschüss.",
+    "pause_null": "Eins.\n#PAUSE 0\nZwei.\n#pause 2\nDrei.",
+    "gemischt": "Vorab.\n#VOICE sage\nText.\n#INCLUDE glocke.mp3\n#PAUSE 10\n\n#VOICE nova\nEnde.",
+    "leerzeilen_zwischen_direktiven": "A\n#PAUSE 1\n\n\n#PAUSE 2\n\nB\n#INCLUDE x.mp3   \nC",
+}
+
+
+def als_tupel(segments) -> list[tuple]:
+    return [(s.content, s.is_pause, s.is_include, s.voice) for s in segments]
+
+
+class TestParseScript:
+    @pytest.mark.parametrize("name", sorted(SKRIPTE))
+    def test_gleiches_ergebnis_wie_vor_dem_tokenizer(self, name):
+        assert als_tupel(fa.parse_script(SKRIPTE[name])) == als_tupel(parse_script_vor_tokenizer(SKRIPTE[name]))
+
+    def test_wiederholtes_start_ist_keine_sprache_mehr(self):
+        # Frueher wurde ein zweites #START als Text vorgelesen
+        segments = fa.parse_script("Kopf\n#START\nEins.\n#START\nZwei.")
+
+        assert als_tupel(segments) == [("Eins.", False, False, "nova"), ("Zwei.", False, False, "nova")]
+        assert "#START" in parse_script_vor_tokenizer("Kopf\n#START\nEins.\n#START\nZwei.")[0].content
+
+    def test_unbekannte_stimme_warnt_und_nimmt_standardstimme(self, capsys):
+        segments = fa.parse_script(SKRIPTE["unbekannte_stimme"])
+
+        assert [s.voice for s in segments] == ["nova", "coral"]
+        assert "Unbekannte Stimme 'robot'" in capsys.readouterr().out
+
+    def test_warnungen_vor_start_entfallen(self):
+        tokenizer = fa.ScriptTokenizer("#VOICE robot\n#START\nText.")
+
+        assert als_tupel(tokenizer) == [("Text.", False, False, "nova")]
+        assert tokenizer.warnings == []
+        assert not tokenizer.has_voice
+
+    @pytest.mark.parametrize(("text", "stimme", "has_voice"), [
+        ("Eins.\n#PAUSE 2\nZwei.", "echo", False),
+        ("Eins.\n#PAUSE 2\n#VOICE ash\nZwei.", "nova", True),
+        ("#VOICE ash\n#START\nEins.", "echo", False),  # #VOICE nur vor dem #START zaehlt nicht
+    ])
+    def test_stimme_ohne_direktive(self, text, stimme, has_voice):
+        tokenizer = fa.ScriptTokenizer(text, fallback_voice="echo")
+        segments = list(tokenizer)
+
+        assert segments[0].voice == stimme
+        assert tokenizer.initial_voice == stimme
+        assert tokenizer.has_voice is has_voice
+
+    @pytest.mark.parametrize("kopf", ["", "Material\n#START\n"])
+    def test_segmente_kommen_vor_dem_ende_des_skripts(self, kopf, monkeypatch):
+        gelesen = []
+        echtes_muster = fa.DIRECTIVE_PATTERN
+
+        class ZaehlendesMuster:
+            @staticmethod
+            def finditer(text):
+                for m in echtes_muster.finditer(text):
+                    gelesen.append(m)
+                    yield m
+
+        monkeypatch.setattr(fa, "DIRECTIVE_PATTERN", ZaehlendesMuster)
+        text = kopf + "".join(f"Absatz {n}.\n#PAUSE 1\n" for n in range(100))
+        segments = iter(fa.ScriptTokenizer(text, fallback_voice="echo"))
+
+        erstes = next(segments)
+
+        assert (erstes.content, erstes.voice) == ("Absatz 0.", "echo")
+        assert len(gelesen) <= 3  # nicht das ganze Skript zerlegt
+
+
+# --- TTSCache --------------------------------------------------------------------
+
+class TestTTSCache:
+    def test_schluessel_normalisiert_text_und_trennt_stimmen(self):
+        key = fa.TTSCache.key("gpt-4o-mini-tts", "nova", "mp3", "Guten  Morgen,\n ihr!")
+
+        assert key == fa.TTSCache.key("gpt-4o-mini-tts", "nova", "mp3", "Guten Morgen, ihr!")
+        assert key != fa.TTSCache.key("gpt-4o-mini-tts", "onyx", "mp3", "Guten Morgen, ihr!")
+        material = json.dumps(["gpt-4o-mini-tts", "nova", "mp3", "Guten Morgen, ihr!"], ensure_ascii=False)
+        assert key == hashlib.sha256(material.encode()).hexdigest()
+
+    def test_treffer_und_fehlschlaege_werden_gezaehlt(self, tmp_path):
+        cache = fa.TTSCache(tmp_path)
+
+        assert cache.get("ab12", "mp3") is None
+        cache.put("ab12", "mp3", b"audio")
+        assert cache.get("ab12", "mp3") == b"audio"
+        assert cache.get("ab12", "pcm") is None
+
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert fa.TTSCache(tmp_path).path("ab12", "mp3").exists()  # Index aus dem Verzeichnis
+
+    def test_schreiben_ist_atomar(self, tmp_path, monkeypatch):
+        cache = fa.TTSCache(tmp_path)
+        cache.put("ab12", "mp3", b"alt")
+
+        def abbruch(*_args):
+            raise OSError("Platte voll")
+
+        monkeypatch.setattr(fa.os, "replace", abbruch)
+        with pytest.raises(OSError):
+            cache.put("ab12", "mp3", b"neu und unvollstaendig")
+
+        assert cache.get("ab12", "mp3") == b"alt"
+        assert [p.name for p in (tmp_path / "ab").iterdir()] == ["ab12.mp3"]  # keine Temp-Reste
+
+    def test_lru_verdraengt_auf_90_prozent(self, tmp_path):
+        cache = fa.TTSCache(tmp_path, max_bytes=1000)
+        for key in ("aa01", "bb02", "cc03"):
+            cache.put(key, "mp3", bytes(300))
+        cache.get("aa01", "mp3")  # zuletzt benutzt: bleibt
+
+        cache.put("dd04", "mp3", bytes(300))
+
+        assert cache.evictions == 1
+        assert not cache.path("bb02", "mp3").exists()
+        assert all(cache.path(key, "mp3").exists() for key in ("aa01", "cc03", "dd04"))
+        assert cache.size <= 900
+        assert fa.TTSCache(tmp_path).size == cache.size
+
+
+# --- Batch-Modus -------------------------------------------------------------------
+
+ohne_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg nicht installiert")
+
+
+class ZaehlendesBackend(fa.OfflineBackend):
+    """OfflineBackend, das die meisten gleichzeitigen Anfragen festhaelt und an einem Stichwort scheitert."""
+
+    def __init__(self, fehler_bei: str) -> None:
+        super().__init__(latency=0.02, jitter=0)
+        self.fehler_bei = fehler_bei
+        self.max_in_flight = 0
+
+    async def stream(self, text, voice, model, response_format):
+        self.max_in_flight = max(self.max_in_flight, self.in_flight + 1)
+        if self.fehler_bei in text:
+            raise fa.TTSError("Offline: Text abgelehnt", 400)  # nicht wiederholbar
+        async for block in super().stream(text, voice, model, response_format):
+            yield block
+
+
+@ohne_ffmpeg
+class TestBatchModus:
+    def test_gemeinsames_budget_und_fehler_bleiben_je_skript(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        monkeypatch.setattr(fa, "TTS_CACHE_DIR", tmp_path / "cache")
+        monkeypatch.setattr(fa, "METRICS_FILE", tmp_path / "metriken.jsonl")
+        backend = ZaehlendesBackend(fehler_bei="Kaputt")
+        monkeypatch.setattr(fa, "create_backend", lambda _args: backend)
+        for name, letzter in (("a", "Ende."), ("b", "Kaputt.")):
+            saetze = [f"Satz {n} von {name}." for n in range(4)] + [letzter]
+            (tmp_path / f"{name}.md").write_text("\n#VOICE nova\n".join(saetze), encoding="utf-8")
+
+        asyncio.run(fa.main(["--parallel-skripte", "2", "--parallele-anfragen", "3"]))
+
+        assert backend.max_in_flight == 3  # beide Skripte zusammen, nicht 3 je Skript
+        assert (tmp_path / "a.mp3").exists()
+        assert not (tmp_path / "b.mp3").exists()
+        assert "Fehlgeschlagen: 1 (b.md)" in capsys.readouterr().out
+
+
+# --- RateLimiter -----------------------------------------------------------------
+
+class TestRateLimiter:
+    def test_aimd_waechst_additiv_und_halbiert_einmal_je_welle(self):
+        uhr = FakeUhr(100.0)
+        limiter = fa.RateLimiter(max_concurrency=5, start_concurrency=4, monotonic=uhr.monotonic)
+
+        limiter.success()
+        assert limiter.limit == pytest.approx(4.25)
+        limiter.throttled(None)
+        uhr.sleep(0.5)
+        limiter.throttled(None)  # dieselbe Drosselungswelle
+        assert limiter.limit == pytest.approx(2.125)
+        assert limiter.throttles == 2
+        uhr.sleep(1.5)
+        limiter.throttled(None)  # neue Welle
+        assert limiter.limit == pytest.approx(1.0625)
+        for _ in range(50):
+            limiter.success()
+        assert limiter.limit == 5  # gedeckelt
+        assert limiter.peak_limit == 5
+
+    def test_limit_faellt_nie_unter_eins(self):
+        limiter = fa.RateLimiter(start_concurrency=1)
+        limiter._last_cut = -math.inf
+
+        limiter.throttled(None)
+
+        assert limiter.limit == 1.0
+
+    def test_retry_after_pausiert_das_budget(self):
+        uhr = FakeUhr(100.0)
+        limiter = fa.RateLimiter(monotonic=uhr.monotonic)
+
+        limiter.throttled(0.2)
+
+        assert limiter._wait_time(uhr.monotonic(), 10) == pytest.approx(0.2)
+        uhr.sleep(0.2)
+        assert limiter._wait_time(uhr.monotonic(), 10) <= 0
+
+    def test_token_bucket_wartet_auf_anfrage_und_zeichen(self):
+        uhr = FakeUhr()
+        anfragen = fa.RateLimiter(requests_per_minute=600, monotonic=uhr.monotonic)
+        anfragen._request_tokens = 0.0
+        zeichen = fa.RateLimiter(chars_per_minute=60000, monotonic=uhr.monotonic)
+        zeichen._char_tokens = 0.0
+
+        assert anfragen._wait_time(uhr.monotonic(), 10) == pytest.approx(0.1)  # 1 Anfrage zu 600/min
+        assert zeichen._wait_time(uhr.monotonic(), 100) == pytest.approx(0.1)  # 100 Zeichen zu 1000/s
+
+        uhr.sleep(0.1)
+        anfragen._refill(uhr.monotonic())
+        assert anfragen._wait_time(uhr.monotonic(), 10) == pytest.approx(0.0)
+
+    def test_nebenlaeufigkeit_begrenzt_bis_release(self):
+        async def ablauf():
+            limiter = fa.RateLimiter(start_concurrency=2)
+            await limiter.acquire(1)
+            await limiter.acquire(1)
+            assert limiter._wait_time(limiter.monotonic(), 1) is None  # wartet auf ein release
+            dritte = asyncio.create_task(limiter.acquire(1))
+            for _ in range(3):
+                await asyncio.sleep(0)
+            assert not dritte.done()
+            limiter.release()
+            await asyncio.wait_for(dritte, 1)
+            return limiter.in_flight
+
+        assert asyncio.run(ablauf()) == 2
+
+    def test_offline_drosselung_wird_abgefangen(self):
+        backend = fa.OfflineBackend(latency=0.01, capacity=2, retry_after=0.01)
+        limiter = fa.RateLimiter(start_concurrency=6)
+
+        async def ablauf():
+            return await asyncio.gather(*(
+                fa.text_to_speech(backend, f"Satz {n}.", limiter=limiter) for n in range(6)
+            ))
+
+        ergebnisse = asyncio.run(ablauf())
+
+        assert all(ergebnisse)
+        assert limiter.throttles > 0
+        assert limiter.limit < 6
+        assert limiter.in_flight == 0
+
+
+# --- MP3-Frames ------------------------------------------------------------------
+
+FORMAT = fa.DEFAULT_MP3_FORMAT
+SEKUNDEN_JE_FRAME = FORMAT.samples / FORMAT.sample_rate
+
+
+def mp3_frame(fuellung: int = 0, fmt: fa.Mp3FrameHeader = FORMAT) -> bytes:
+    """Layer-III-Frame im Format ``fmt``; ``fuellung`` macht Frames unterscheidbar."""
+    return fmt.to_bytes() + bytes([fuellung]) * (fmt.frame_length - 4)
+
+
+def frames(pfad) -> list[bytes]:
+    return [frame for _, frame in fa.iter_mp3_frames(pfad)]
+
+
+class TestMp3Frames:
+    def test_stille_rundreise(self, tmp_path):
+        pfad = tmp_path / "stille.mp3"
+
+        fa.create_silence(3, pfad)
+
+        assert fa.first_mp3_header(pfad).stream_format == FORMAT.stream_format
+        assert len(frames(pfad)) == fa.SILENCE.mp3_frame_count(FORMAT, 3) == 125
+        assert fa.probe_duration(pfad) == pytest.approx(3, abs=SEKUNDEN_JE_FRAME)
+
+    def test_pausen_als_stumme_frames(self, tmp_path):
+        chunk, ausgabe = tmp_path / "chunk.mp3", tmp_path / "folge.mp3"
+        chunk.write_bytes(b"".join(mp3_frame(n) for n in (1, 2, 3)))
+
+        fa.concat_mp3_frames([chunk, fa.Silence(1), chunk], ausgabe, FORMAT)
+
+        stumm = fa.SILENCE.mp3_frame(FORMAT)[1]
+        assert frames(ausgabe) == frames(chunk) + [stumm] * fa.SILENCE.mp3_frame_count(FORMAT, 1) + frames(chunk)
+
+    def test_frames_verlustfrei_verketten(self, tmp_path):
+        erste, zweite, ausgabe = tmp_path / "a.mp3", tmp_path / "b.mp3", tmp_path / "ab.mp3"
+        erste.write_bytes(b"".join(mp3_frame(n) for n in (1, 2, 3)))
+        zweite.write_bytes(b"".join(mp3_frame(n) for n in (4, 5)))
+
+        fa.concat_mp3_frames([erste, zweite], ausgabe, FORMAT)
+
+        assert frames(ausgabe) == frames(erste) + frames(zweite)  # Xing-Frame vorne zaehlt nicht mit
+        xing = ausgabe.read_bytes()[:FORMAT.frame_length]
+        assert FORMAT.is_info_frame(xing)
+        assert int.from_bytes(xing[4 + FORMAT.side_info_length + 8:][:4], "big") == 5
+        assert fa.probe_duration(ausgabe) == pytest.approx(5 * SEKUNDEN_JE_FRAME)
+
+    def test_xing_frame(self, tmp_path):
+        xing = fa._xing_frame(FORMAT, 1234, 99999, vbr=False)
+        header = fa.Mp3FrameHeader.parse(xing)
+        pfad = tmp_path / "nur-xing.mp3"
+        pfad.write_bytes(xing + fa.SILENCE.mp3_frame(FORMAT)[1] * 3)
+
+        assert len(xing) == header.frame_length
+        assert header.stream_format == FORMAT.stream_format
+        assert header.is_info_frame(xing)
+        assert b"Info" in xing and b"Xing" in fa._xing_frame(FORMAT, 1, 1, vbr=True)
+        assert len(frames(pfad)) == 3
+        assert fa.probe_duration(pfad) == pytest.approx(1234 * SEKUNDEN_JE_FRAME)  # Dauer aus dem Kopf
+
+    def test_resync_ueber_muell_zwischen_frames(self, tmp_path):
+        pfad = tmp_path / "muell.mp3"
+        pfad.write_bytes(mp3_frame() * 3 + b"\xff\xfb\x00 Muell \xff" + mp3_frame() * 2)
+
+        assert len(frames(pfad)) == 5
+        assert fa.probe_duration(pfad) == pytest.approx(5 * SEKUNDEN_JE_FRAME)
+
+    def test_resync_ist_begrenzt(self, tmp_path):
+        pfad = tmp_path / "loch.mp3"
+        pfad.write_bytes(mp3_frame() * 2 + bytes(fa.MP3_MAX_RESYNC + 10) + mp3_frame() * 2)
+
+        assert len(frames(pfad)) == 2
+        assert fa.probe_duration(pfad) == pytest.approx(2 * SEKUNDEN_JE_FRAME)
+
+    def test_wav_und_zufalls_pcm_sind_keine_mp3(self, tmp_path):
+        zufall = random.Random(5).randbytes(2 * 1024 * 1024)
+        wav, roh, kurz = tmp_path / "glocke.wav", tmp_path / "zufall.mp3", tmp_path / "kurz.mp3"
+        wav.write_bytes(b"RIFF" + zufall)
+        roh.write_bytes(zufall)
+        kurz.write_bytes(b"\xff\xf3")
+
+        assert fa.first_mp3_header(wav) is None
+        assert fa.first_mp3_header(roh) is None
+        assert fa.first_mp3_header(kurz) is None
+        assert fa.first_mp3_header(fa.AudioBuffer(zufall, "mp3")) is None
+        assert fa.first_mp3_header(fa.AudioBuffer(b"\xff\xf3", "mp3")) is None
+
+    def test_gleiches_format_ohne_ffmpeg(self, tmp_path, monkeypatch):
+        teile = [tmp_path / f"{n}.mp3" for n in range(3)]
+        for n, teil in enumerate(teile):
+            teil.write_bytes(mp3_frame(n + 1) * 2)
+
+        def kein_ffmpeg(*_args, **_kwargs):
+            raise AssertionError("ffmpeg gestartet")
+
+        monkeypatch.setattr(fa.subprocess, "Popen", kein_ffmpeg)
+        fa.combine_audio_files(teile, tmp_path / "ganz.mp3")
+
+        assert frames(tmp_path / "ganz.mp3") == [f for teil in teile for f in frames(teil)]
+        assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".")] == []  # keine Temp-Reste
+
+
+# --- ffmpeg-Pipeline ---------------------------------------------------------------
+
+def mp3_dauer(pfad) -> float:
+    """Spieldauer aus den Frame-Koepfen (Xing-Frame und Tags zaehlen nicht)."""
+    return sum(header.samples / header.sample_rate for header, _ in fa.iter_mp3_frames(pfad))
+
+
+def fremdes_mp3(pfad, sekunden: int = 1) -> None:
+    """MP3 in einem anderen Format als die TTS-Chunks (44,1 kHz, Stereo), wie ein typisches Include."""
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo",
+         "-t", str(sekunden), "-c:a", "libmp3lame", "-b:a", "128k", "-y", str(pfad)],
+        check=True,
+    )
+
+
+def audio_dauer(pfad) -> float:
+    """Dauer beliebiger Audiodateien: mit ffmpeg nach PCM dekodiert und gezaehlt."""
+    pcm = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", str(pfad), "-f", "s16le", "-ac", "1", "-ar", "24000", "pipe:1"],
+        capture_output=True, check=True,
+    ).stdout
+    return len(pcm) / 48000
+
+
+@pytest.fixture
+def prozesse(monkeypatch):
+    """Zeichnet alle gestarteten Prozesse auf (auch die von subprocess.run)."""
+    gestartet = []
+    echtes_popen = subprocess.Popen
+
+    def popen(*args, **kwargs):
+        prozess = echtes_popen(*args, **kwargs)
+        gestartet.append(prozess)
+        return prozess
+
+    monkeypatch.setattr(fa.subprocess, "Popen", popen)
+    return gestartet
+
+
+@ohne_ffmpeg
+class TestFfmpegPipeline:
+    def test_mp3_chunks_teilen_sich_einen_decoder(self, tmp_path, prozesse):
+        chunk, glocke, ausgabe = tmp_path / "chunk.mp3", tmp_path / "glocke.mp3", tmp_path / "folge.mp3"
+        fa.create_silence(1, chunk)
+        fremdes_mp3(glocke)
+        prozesse.clear()
+
+        fa.combine_audio_files([chunk, chunk, fa.Silence(1), chunk, glocke, chunk, chunk], ausgabe)
+
+        # Encoder, ein Decoder je Lauf formatgleicher Chunks, einer fuers Include — nicht einer je Chunk
+        assert len(prozesse) == 4
+        assert all(prozess.returncode == 0 for prozess in prozesse)
+        assert mp3_dauer(ausgabe) == pytest.approx(7, abs=0.2)  # ganze Frames je Teil, Codec-Verzoegerung
+
+    def test_puffer_teilen_sich_einen_decoder(self, tmp_path, prozesse):
+        chunk, glocke, ausgabe = tmp_path / "chunk.mp3", tmp_path / "glocke.mp3", tmp_path / "folge.mp3"
+        fa.create_silence(1, chunk)
+        fremdes_mp3(glocke)
+        puffer = fa.AudioBuffer(chunk.read_bytes(), "mp3")
+        prozesse.clear()
+
+        fa.combine_audio_files([puffer, puffer, fa.Silence(1), puffer, glocke], ausgabe)
+
+        assert len(prozesse) == 3  # Encoder, ein Decoder fuer alle Puffer, einer fuers Include
+        assert mp3_dauer(ausgabe) == pytest.approx(5, abs=0.2)
+
+    def test_pcm_intern_ende_zu_ende(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        monkeypatch.setattr(fa, "TTS_CACHE_DIR", tmp_path / "cache")
+        monkeypatch.setattr(fa, "METRICS_FILE", tmp_path / "metriken.jsonl")
+        (tmp_path / "kurz.md").write_text("#VOICE nova\nEins.\n#PAUSE 2\nZwei.", encoding="utf-8")
+
+        # Offline-Backend: je kurzem Satz ein Block von einer Sekunde
+        asyncio.run(fa.main(["--backend", "offline", "--offline-latenz", "0", "--offline-jitter", "0",
+                             "--intern-format", "pcm"]))
+
+        assert mp3_dauer(tmp_path / "kurz.mp3") == pytest.approx(4, abs=0.1)  # 1 s + 2 s Pause + 1 s
+
+    def test_pcm_chunks_und_include(self, tmp_path):
+        chunk, glocke, ausgabe = tmp_path / "chunk.pcm", tmp_path / "glocke.mp3", tmp_path / "folge.mp3"
+        chunk.write_bytes(bytes(2 * fa.PCM_SAMPLE_RATE))
+        fremdes_mp3(glocke, 2)
+
+        fa.combine_audio_files([chunk, fa.Silence(1), glocke, chunk], ausgabe, fa.AudioSettings(internal_format="pcm"))
+
+        assert mp3_dauer(ausgabe) == pytest.approx(5, abs=0.1)
+
+    def test_encoder_fehler_meldet_exit_code(self, tmp_path, prozesse):
+        with pytest.raises(RuntimeError, match="Exit-Code [1-9]"):
+            fa.encode_via_ffmpeg([fa.Silence(30)], [(tmp_path / "fehlt" / "folge.mp3", "mp3", "96k")], fa.PCM_SAMPLE_RATE, 1)
+
+        assert [prozess.returncode for prozess in prozesse] != [None]
+
+    def test_decoder_fehler_raeumt_prozesse_ab(self, tmp_path, prozesse):
+        chunk, kaputt = tmp_path / "chunk.mp3", tmp_path / "kaputt.wav"
+        fa.create_silence(1, chunk)
+        kaputt.write_bytes(b"RIFF" + random.Random(1).randbytes(4096))
+
+        with pytest.raises(RuntimeError, match="kaputt.wav"):
+            fa.combine_audio_files([chunk, kaputt, chunk], tmp_path / "folge.mp3")
+
+        assert len(prozesse) == 3  # Encoder, Decoder fuer den Chunk, Decoder fuer die kaputte Datei
+        assert all(prozess.returncode is not None for prozess in prozesse)
+        assert not (tmp_path / "folge.mp3").exists()
+
+    def test_mehrere_formate_aus_einem_lauf(self, tmp_path, prozesse):
+        chunk, ausgabe = tmp_path / "chunk.mp3", tmp_path / "folge.mp3"
+        fa.create_silence(1, chunk)
+        prozesse.clear()
+        settings = fa.AudioSettings(extra_outputs=(("opus", "48k"), ("aac", "64k")))
+
+        fa.combine_audio_files([chunk, fa.Silence(2), chunk], ausgabe, settings)
+
+        # MP3 per Frame-Kopie, Opus und AAC aus einem Encoder, der den Frame-Strom selbst dekodiert
+        assert len(prozesse) == 1
+        assert mp3_dauer(ausgabe) == pytest.approx(4, abs=0.1)
+        assert audio_dauer(tmp_path / "folge.opus") == pytest.approx(4, abs=0.1)
+        assert audio_dauer(tmp_path / "folge.m4a") == pytest.approx(4, abs=0.1)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["chunk.mp3", "folge.m4a", "folge.mp3", "folge.opus"]
+
+    def test_reencode_file(self, tmp_path):
+        quelle = tmp_path / "folge.mp3"
+        fremdes_mp3(quelle, 2)
+        ziele = [(tmp_path / "folge.opus", "opus", "32k"), (tmp_path / "folge.m4a", "aac", "64k")]
+
+        groesse = fa.reencode_file(quelle, ziele)
+
+        assert groesse == sum(pfad.stat().st_size for pfad, _, _ in ziele)
+        assert all(audio_dauer(pfad) == pytest.approx(2, abs=0.1) for pfad, _, _ in ziele)
+
+    def test_reencode_file_fehler_hinterlaesst_nichts(self, tmp_path):
+        quelle = tmp_path / "kaputt.mp3"
+        quelle.write_bytes(random.Random(1).randbytes(4096))
+
+        with pytest.raises(RuntimeError, match="kaputt.mp3"):
+            fa.reencode_file(quelle, [(tmp_path / "kaputt.opus", "opus", "32k")])
+
+        assert [p.name for p in tmp_path.iterdir()] == ["kaputt.mp3"]
+
+    def test_reencode_library_nur_fehlende_und_veraltete(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.md").write_text("Hallo.", encoding="utf-8")
+        fremdes_mp3(tmp_path / "a.mp3", 2)
+        fremdes_mp3(tmp_path / "b.mp3", 1)
+        settings = fa.AudioSettings(extra_outputs=(("opus", "32k"),))
+
+        asyncio.run(fa.reencode_library(settings, workers=2))
+        asyncio.run(fa.reencode_library(settings, workers=2))  # alles aktuell: nichts zu tun
+
+        ausgabe = capsys.readouterr().out
+        assert "2 Datei(en)" in ausgabe and "0 Datei(en)" in ausgabe
+        assert audio_dauer(tmp_path / "a.opus") == pytest.approx(2, abs=0.1)
+        assert audio_dauer(tmp_path / "b.opus") == pytest.approx(1, abs=0.1)
+        assert not (tmp_path / "c.opus").exists()  # ohne Ausgabe keine Quelle
+
+
+
+class TestIncludeCache:
+    def test_copy_mapped(self, tmp_path):
+        leer, voll, ziel = tmp_path / "leer.pcm", tmp_path / "voll.pcm", tmp_path / "ziel"
+        leer.write_bytes(b"")
+        voll.write_bytes(bytes(range(256)) * 100)
+
+        with open(ziel, "wb") as out:
+            fa.copy_mapped(leer, out)
+            fa.copy_mapped(voll, out)
+
+        assert ziel.read_bytes() == voll.read_bytes()
+
+    @ohne_ffmpeg
+    def test_dekodiert_nur_beim_ersten_mal(self, tmp_path, prozesse):
+        glocke = tmp_path / "glocke.mp3"
+        fremdes_mp3(glocke, 2)
+        cache = fa.IncludeCache(tmp_path / "includes")
+        prozesse.clear()
+
+        eintrag = cache.pcm(glocke, fa.PCM_SAMPLE_RATE, 1)  # Miss: ein Decoder
+        assert cache.pcm(glocke, fa.PCM_SAMPLE_RATE, 1) == eintrag  # Treffer: kein Prozess
+        assert len(prozesse) == 1
+        assert eintrag.stat().st_size == 2 * 2 * fa.PCM_SAMPLE_RATE
+
+        stereo = cache.pcm(glocke, 44100, 2)  # anderes Zielformat: eigener Eintrag
+        assert stereo != eintrag and len(prozesse) == 2
+
+    @ohne_ffmpeg
+    def test_geaenderte_datei_bekommt_neuen_eintrag(self, tmp_path):
+        glocke = tmp_path / "glocke.mp3"
+        fremdes_mp3(glocke, 1)
+        cache = fa.IncludeCache(tmp_path / "includes")
+        alt = cache.pcm(glocke, fa.PCM_SAMPLE_RATE, 1)
+
+        fremdes_mp3(glocke, 3)
+
+        neu = cache.pcm(glocke, fa.PCM_SAMPLE_RATE, 1)
+        assert neu != alt
+        assert neu.stat().st_size == 3 * 2 * fa.PCM_SAMPLE_RATE
+
+    @ohne_ffmpeg
+    def test_zusammenfuegen_mit_cache(self, tmp_path, prozesse):
+        chunk, glocke, ausgabe = tmp_path / "chunk.pcm", tmp_path / "glocke.mp3", tmp_path / "folge.mp3"
+        chunk.write_bytes(bytes(2 * fa.PCM_SAMPLE_RATE))
+        fremdes_mp3(glocke, 2)
+        cache = fa.IncludeCache(tmp_path / "includes")
+        settings = fa.AudioSettings(internal_format="pcm")
+        prozesse.clear()
+
+        fa.combine_audio_files([chunk, glocke, chunk, glocke], ausgabe, settings, cache)
+        assert len(prozesse) == 2  # Encoder und ein Decoder fuers Include, obwohl es zweimal vorkommt
+        assert mp3_dauer(ausgabe) == pytest.approx(6, abs=0.1)
+
+        prozesse.clear()
+        fa.combine_audio_files([chunk, glocke, chunk, glocke], ausgabe, settings, cache)
+        assert len(prozesse) == 1  # nur noch der Encoder
+        assert mp3_dauer(ausgabe) == pytest.approx(6, abs=0.1)
+
+
+# --- Dauer aus Kopfdaten -------------------------------------------------------------
+
+def xing_frame(flags: int, anzahl: int, lame: bytes = b"") -> bytes:
+    """Xing-Frame im Standardformat: Kopf, Side-Info, Tag (Frames, Bytes, TOC, Qualitaet), LAME-Tag."""
+    felder = {1: anzahl.to_bytes(4, "big"), 2: (9999).to_bytes(4, "big"), 4: bytes(100), 8: (50).to_bytes(4, "big")}
+    tag = b"Xing" + flags.to_bytes(4, "big") + b"".join(wert for bit, wert in felder.items() if flags & bit)
+    frame = FORMAT.to_bytes() + bytes(FORMAT.side_info_length) + tag + lame
+    return frame + bytes(FORMAT.frame_length - len(frame))
+
+
+def lame_tag(delay: int, padding: int) -> bytes:
+    return b"LAME3.100" + bytes(12) + (delay << 12 | padding).to_bytes(3, "big")
+
+
+def ogg_seite(granule: int, inhalt: bytes) -> bytes:
+    return (b"OggS\x00\x02" + granule.to_bytes(8, "little") + bytes(12)
+            + bytes((1, len(inhalt))) + inhalt)
+
+
+def mp4_box(typ: bytes, inhalt: bytes) -> bytes:
+    return (8 + len(inhalt)).to_bytes(4, "big") + typ + inhalt
+
+
+def dauer(tmp_path, daten: bytes, name: str = "datei") -> float | None:
+    pfad = tmp_path / name
+    pfad.write_bytes(daten)
+    return fa.probe_duration(pfad)
+
+
+class TestProbeDuration:
+    def test_mp3_xing_mit_lame_delay_und_padding(self, tmp_path):
+        daten = xing_frame(0x0F, 1000, lame_tag(576, 1000)) + fa.SILENCE.mp3_frame(FORMAT)[1] * 5
+
+        assert dauer(tmp_path, daten) == pytest.approx((1000 * 576 - 576 - 1000) / 24000)
+
+    def test_mp3_xing_ohne_lame_tag(self, tmp_path):
+        assert dauer(tmp_path, xing_frame(0x01, 250)) == pytest.approx(250 * SEKUNDEN_JE_FRAME)
+
+    def test_mp3_xing_ohne_frameanzahl_zaehlt_frames(self, tmp_path):
+        daten = xing_frame(0x02, 0) + fa.SILENCE.mp3_frame(FORMAT)[1] * 7
+
+        assert dauer(tmp_path, daten) == pytest.approx(7 * SEKUNDEN_JE_FRAME)
+
+    def test_mp3_vbri(self, tmp_path):
+        frame = bytearray(FORMAT.to_bytes() + bytes(FORMAT.frame_length - 4))
+        frame[36:40] = b"VBRI"
+        frame[50:54] = (321).to_bytes(4, "big")
+
+        assert dauer(tmp_path, bytes(frame)) == pytest.approx(321 * SEKUNDEN_JE_FRAME)
+
+    def test_mp3_abgeschnittener_letzter_frame_und_id3(self, tmp_path):
+        stumm = fa.SILENCE.mp3_frame(FORMAT)[1]
+        id3 = b"ID3\x04\x00\x00" + bytes((0, 0, 0, 20)) + bytes(20)
+        daten = id3 + stumm * 4 + stumm[:len(stumm) // 2]
+
+        assert dauer(tmp_path, daten) == pytest.approx(4 * SEKUNDEN_JE_FRAME)
+        assert dauer(tmp_path, b"kein Audio" * 100) is None
+
+    def test_ogg_opus_mit_pre_skip(self, tmp_path):
+        kopf = b"OpusHead" + bytes((1, 1)) + (312).to_bytes(2, "little") + (24000).to_bytes(4, "little") + bytes(3)
+        daten = ogg_seite(0, kopf) + ogg_seite(1000, b"x" * 50) + ogg_seite(2 * 48000 + 312, b"y" * 50)
+
+        assert dauer(tmp_path, daten) == pytest.approx(2.0)
+
+    def test_ogg_vorbis(self, tmp_path):
+        kopf = b"\x01vorbis" + bytes(4) + b"\x02" + (44100).to_bytes(4, "little") + bytes(10)
+        daten = ogg_seite(0, kopf) + ogg_seite(3 * 44100, b"z" * 50)
+
+        assert dauer(tmp_path, daten) == pytest.approx(3.0)
+
+    def test_ogg_ohne_bekannten_codec(self, tmp_path):
+        assert dauer(tmp_path, ogg_seite(0, b"FLAC") + ogg_seite(99, b"")) is None
+
+    @pytest.mark.parametrize("version", [0, 1])
+    def test_mp4_mvhd(self, tmp_path, version):
+        if version == 0:
+            mvhd = bytes(4) + bytes(8) + (1000).to_bytes(4, "big") + (61500).to_bytes(4, "big")
+        else:
+            mvhd = b"\x01" + bytes(3) + bytes(16) + (44100).to_bytes(4, "big") + (44100 * 90).to_bytes(8, "big")
+        mdat_gross = (1).to_bytes(4, "big") + b"mdat" + (16 + 10).to_bytes(8, "big") + bytes(10)  # 64-bit-Groesse
+        daten = (mp4_box(b"ftyp", b"M4A \x00\x00\x00\x00") + mdat_gross
+                 + mp4_box(b"moov", mp4_box(b"udta", b"") + mp4_box(b"mvhd", mvhd + bytes(80))))
+
+        assert dauer(tmp_path, daten) == pytest.approx(61.5 if version == 0 else 90.0)
+
+    def test_mp4_ohne_moov(self, tmp_path):
+        assert dauer(tmp_path, mp4_box(b"ftyp", b"M4A ") + mp4_box(b"mdat", bytes(10))) is None
+
+
+# --- Manifeste ---------------------------------------------------------------------
+
+class TestManifest:
+    SKRIPT = "Material: Matte\n#START\nGuten Morgen.\n#PAUSE 2\nArme kreisen.\n#INCLUDE glocke.mp3\nDanke."
+
+    @pytest.fixture
+    def skript(self, tmp_path, monkeypatch):
+        """Skript mit Include und einer (vorgetaeuschten) Ausgabe samt Manifest."""
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        (tmp_path / "glocke.mp3").write_bytes(b"bim")
+        md_file = tmp_path / "morgen.md"
+        md_file.write_text(self.SKRIPT, encoding="utf-8")
+        md_file.with_suffix(".mp3").write_bytes(b"audio")
+        fa.write_manifest(md_file.with_suffix(".mp3"), self.aktuelles_manifest(md_file)[1])
+        return md_file
+
+    @staticmethod
+    def aktuelles_manifest(md_file):
+        text = md_file.read_text(encoding="utf-8")
+        previous = fa.load_manifest(md_file.with_suffix(".mp3"))
+        # Zufallsstimme der ersten Generierung
+        tokenizer = fa.ScriptTokenizer(text, fallback_voice=fa.manifest_default_voice(previous) or "echo")
+        segments = list(tokenizer)
+        return previous, fa.build_manifest(segments, tokenizer.initial_voice, fa.AudioSettings())
+
+    def test_frisch_erzeugt_ist_aktuell(self, skript):
+        previous, current = self.aktuelles_manifest(skript)
+
+        assert previous == current
+        assert previous["default_voice"] == "echo"  # Zufallsstimme, festgehalten
+        assert [e["kind"] for e in previous["segments"]] == ["text", "pause", "text", "include", "text"]
+        assert not fa.is_output_outdated(skript, fa.AudioSettings())
+
+    def test_textaenderung_macht_genau_ein_segment_ungueltig(self, skript):
+        skript.write_text(self.SKRIPT.replace("Arme kreisen.", "Arme weit kreisen."), encoding="utf-8")
+
+        assert fa.is_output_outdated(skript, fa.AudioSettings())
+        assert fa.changed_segments(*self.aktuelles_manifest(skript)) == 1
+
+    def test_geaendertes_include_macht_ausgabe_ungueltig(self, skript, tmp_path):
+        (tmp_path / "glocke.mp3").write_bytes(b"bimbam")
+
+        assert fa.is_output_outdated(skript, fa.AudioSettings())
+        assert fa.changed_segments(*self.aktuelles_manifest(skript)) == 1
+
+    def test_text_vor_start_aendert_nichts(self, skript):
+        skript.write_text("Material: Hanteln\n" + self.SKRIPT.split("\n", 1)[1], encoding="utf-8")
+
+        assert not fa.is_output_outdated(skript, fa.AudioSettings())
+
+    def test_andere_einstellungen_machen_ausgabe_ungueltig(self, skript):
+        assert fa.is_output_outdated(skript, fa.AudioSettings(internal_format="pcm"))
+
+    def test_file_hash_merkt_je_datei_nur_den_letzten_stand(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(fa, "_file_hashes", {})
+        glocke = tmp_path / "glocke.mp3"
+        for n in range(1, 6):  # ein Watch-Modus sieht dieselbe Datei in vielen Staenden
+            glocke.write_bytes(b"bim" * n)
+            assert fa.file_hash(glocke) == hashlib.sha256(b"bim" * n).hexdigest()
+
+        monkeypatch.setattr(fa, "open", lambda *_args: pytest.fail("unveraenderte Datei neu gelesen"), raising=False)
+        assert fa.file_hash(tmp_path / "." / "glocke.mp3") == hashlib.sha256(b"bim" * 5).hexdigest()
+        assert list(fa._file_hashes) == [glocke.resolve()]
+
+    def test_ausgabe_ohne_manifest_gilt_als_aktuell(self, skript):
+        fa.manifest_path(skript.with_suffix(".mp3")).unlink()
+        skript.write_text("#START\nGanz neuer Text.", encoding="utf-8")
+
+        assert not fa.is_output_outdated(skript, fa.AudioSettings())
+
+    def test_neubau_holt_unveraenderte_abschnitte_aus_dem_cache(self, skript, tmp_path):
+        fa.create_silence(1, tmp_path / "glocke.mp3")
+        backend, cache = fa.OfflineBackend(latency=0), fa.TTSCache(tmp_path / "cache")
+        assert asyncio.run(fa.convert_script_to_mp3(backend, skript, cache=cache))
+        assert not fa.is_output_outdated(skript, fa.AudioSettings(), "offline-tone")
+        aufrufe = backend.calls
+
+        skript.write_text(self.SKRIPT.replace("Arme kreisen.", "Arme weit kreisen."), encoding="utf-8")
+        assert fa.is_output_outdated(skript, fa.AudioSettings(), "offline-tone")
+        assert asyncio.run(fa.convert_script_to_mp3(backend, skript, cache=cache))
+
+        assert backend.calls - aufrufe == 1  # der Rest kommt aus dem Cache
+        assert not fa.is_output_outdated(skript, fa.AudioSettings(), "offline-tone")
+
+
+# --- Zusammenfuegen ----------------------------------------------------------------
+
+class ZaehlenderPool(ThreadPoolExecutor):
+    """Steht fuer den Prozess-Pool; zaehlt, was hineingereicht wird."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.auftraege = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.auftraege.append(args)
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestZusammenfuegen:
+    @pytest.mark.parametrize(("max_memory", "im_pool"), [(64 * 1024 * 1024, False), (0, True)])
+    def test_puffer_gehen_nicht_in_den_prozess_pool(self, tmp_path, monkeypatch, max_memory, im_pool):
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        md_file = tmp_path / "kurz.md"
+        md_file.write_text("#VOICE nova\nEins.\n#PAUSE 1\nZwei.", encoding="utf-8")
+
+        async def erzeuge(pool, workspace):
+            return await fa.convert_script_to_mp3(fa.OfflineBackend(), md_file, pool=pool, workspace=workspace)
+
+        with ZaehlenderPool() as pool, fa.Workspace(max_memory=max_memory, base=tmp_path) as workspace:
+            assert asyncio.run(erzeuge(pool, workspace))
+
+        teile = [teil for auftrag in pool.auftraege for teil in auftrag[0]]
+        assert bool(pool.auftraege) is im_pool
+        assert not any(isinstance(teil, fa.AudioBuffer) for teil in teile)
+        assert workspace.in_memory == 0
+        assert fa.probe_duration(md_file.with_suffix(".mp3")) > 1
+
+
+# --- Watch-Modus -------------------------------------------------------------------
+
+class TestWatchModus:
+    @pytest.fixture
+    def skripte(self, tmp_path, monkeypatch):
+        """Zwei generierte Skripte, eines mit Include in einem Unterordner."""
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        (tmp_path / "jingles").mkdir()
+        fa.create_silence(1, tmp_path / "jingles" / "glocke.mp3")
+        (tmp_path / "a.md").write_text("Hallo.\n#INCLUDE jingles/glocke.mp3\nTschuess.", encoding="utf-8")
+        (tmp_path / "b.md").write_text("Guten Morgen.", encoding="utf-8")
+        backend = fa.OfflineBackend(latency=0)
+        for md_file in fa.get_md_files():
+            assert asyncio.run(fa.convert_script_to_mp3(backend, md_file))
+        return {md_file: fa.script_includes(md_file) for md_file in fa.get_md_files()}
+
+    @staticmethod
+    def betroffen(geaendert, includes) -> list[str]:
+        return [p.name for p in fa.affected_scripts(set(geaendert), includes, fa.AudioSettings(), "offline-tone")]
+
+    def test_betroffene_skripte(self, skripte, tmp_path):
+        a, b, glocke = tmp_path / "a.md", tmp_path / "b.md", tmp_path / "jingles" / "glocke.mp3"
+
+        assert self.betroffen({a.with_suffix(".mp3"), b.with_suffix(".mp3")}, skripte) == []  # eigene Ausgaben
+        assert self.betroffen({a, b, glocke}, skripte) == []  # gespeichert, aber unveraendert
+
+        fa.create_silence(2, glocke)
+        b.write_text("Guten Abend.", encoding="utf-8")
+        assert self.betroffen({glocke}, skripte) == ["a.md"]
+        assert self.betroffen({b}, skripte) == ["b.md"]
+
+        b.unlink()
+        assert self.betroffen({b}, skripte) == []
+
+    def test_refresh_includes_liest_nur_geaenderte_skripte(self, skripte, tmp_path, monkeypatch):
+        a, b, c = tmp_path / "a.md", tmp_path / "b.md", tmp_path / "c.md"
+        a.write_text("Ohne Include.", encoding="utf-8")
+        b.unlink()
+        c.write_text("#INCLUDE glocke.mp3", encoding="utf-8")
+        gelesen = []
+        echtes_skript_includes = fa.script_includes
+        monkeypatch.setattr(fa, "script_includes", lambda md: gelesen.append(md.name) or echtes_skript_includes(md))
+
+        fa.refresh_includes(skripte, {b, c, tmp_path / "jingles" / "glocke.mp3", a.with_suffix(".mp3")})
+
+        assert sorted(gelesen) == ["b.md", "c.md"]  # a.md war nicht als geaendert gemeldet
+        assert skripte == {a: {tmp_path / "jingles" / "glocke.mp3"}, c: {tmp_path / "glocke.mp3"}}
+
+    @staticmethod
+    async def warte_auf(beobachter, erwartet: set) -> set:
+        gesehen = set()
+        async with asyncio.timeout(5):
+            while not erwartet <= gesehen:
+                gesehen |= await beobachter.changes(0.05)
+        return gesehen
+
+    def test_polling_meldet_neue_und_geaenderte_dateien(self, tmp_path):
+        extern = tmp_path / "extern"
+        extern.mkdir()
+        (extern / "glocke.mp3").write_bytes(b"bim")
+        (tmp_path / "skripte").mkdir()
+
+        async def lauf():
+            async with fa.PollingWatcher(tmp_path / "skripte", interval=0.01) as beobachter:
+                beobachter.watch({extern / "glocke.mp3", extern / "spaeter.mp3"})
+                await asyncio.sleep(0.05)
+                (tmp_path / "skripte" / "neu.md").write_text("Hallo.", encoding="utf-8")
+                (extern / "glocke.mp3").write_bytes(b"bimbam")
+                (extern / "spaeter.mp3").write_bytes(b"bam")
+                (extern / "anderes.mp3").write_bytes(b"nicht beobachtet")
+                return await self.warte_auf(beobachter, {tmp_path / "skripte" / "neu.md", extern / "glocke.mp3"})
+
+        gesehen = asyncio.run(lauf())
+        assert extern / "anderes.mp3" not in gesehen
+        assert extern / "spaeter.mp3" in gesehen
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="inotify nur unter Linux")
+    def test_inotify_beobachtet_spaeter_angelegte_ordner(self, tmp_path):
+        glocke = tmp_path / "jingles" / "neu" / "glocke.mp3"
+
+        async def lauf():
+            async with fa.create_watcher(tmp_path) as beobachter:
+                assert isinstance(beobachter, fa.InotifyWatcher)
+                beobachter.watch({glocke})
+                glocke.parent.mkdir(parents=True)
+                glocke.write_bytes(b"bim")  # womoeglich, bevor der Ordner selbst beobachtet wird
+                await self.warte_auf(beobachter, {glocke})
+                glocke.write_bytes(b"bimbam")
+                return await self.warte_auf(beobachter, {glocke})
+
+        assert glocke in asyncio.run(lauf())
+
+
+# --- Metriken ----------------------------------------------------------------------
+
+class TestMetriken:
+    def test_perzentil_nearest_rank(self):
+        werte = list(range(1, 101))
+
+        assert [fa.percentile(werte, p) for p in (50, 95, 99, 100)] == [50, 95, 99, 100]
+        assert fa.percentile([7.0], 99) == 7.0
+
+    def test_zusammenfassung_ohne_cache_treffer(self):
+        metriken = fa.Metrics(None)
+        for i in range(1, 101):
+            metriken.record("chunk", latency_s=i / 10, queue_wait_s=0.0, bytes=1000, cache_hit=False)
+        metriken.record("chunk", latency_s=99.0, queue_wait_s=0.0, bytes=1000, cache_hit=True)
+        metriken.record("script", tts_s=2.0, silence_s=0.5, merge_s=1.0, encode_s=0.0)
+        metriken.record("script", tts_s=3.0, silence_s=0.5, merge_s=1.0, encode_s=0.0)
+
+        zeilen = metriken.summary()
+
+        assert zeilen[0] == "TTS-Latenz:    p50 5.00s │ p95 9.50s │ p99 9.90s │ max 10.00s (n=100)"
+        assert zeilen[2].endswith("(n=101)")  # Chunk-Groesse zaehlt auch Cache-Treffer
+        assert zeilen[3] == "Phasen:        TTS 5.0s │ Stille 1.0s │ Zusammenfügen 2.0s │ Kodieren 0.0s"
+
+    def test_jsonl_datensaetze(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        md_file = tmp_path / "kurz.md"
+        md_file.write_text("#VOICE nova\nEins.\n#PAUSE 1\nZwei.", encoding="utf-8")
+        metriken = fa.Metrics(tmp_path / "logs" / "metriken.jsonl")
+        backend, cache = fa.OfflineBackend(latency=0), fa.TTSCache(tmp_path / "cache")
+
+        for _ in range(2):  # zweiter Lauf komplett aus dem Cache
+            assert asyncio.run(fa.convert_script_to_mp3(backend, md_file, cache=cache, metrics=metriken))
+        metriken.close()
+
+        saetze = [json.loads(zeile) for zeile in (tmp_path / "logs" / "metriken.jsonl").read_text().splitlines()]
+        chunks = [s for s in saetze if s["type"] == "chunk"]
+        skripte = [s for s in saetze if s["type"] == "script"]
+        assert {s["run"] for s in saetze} == {metriken.run_id}
+        assert len(chunks) == 4 and len(skripte) == 2
+        assert set(chunks[0]) == {"ts", "run", "type", "script", "segment", "chunk", "voice", "model", "chars",
+                                  "bytes", "cache_hit", "latency_s", "queue_wait_s", "backoff_s", "retries"}
+        assert [c["cache_hit"] for c in chunks] == [False, False, True, True]
+        assert {c["voice"] for c in chunks} == {"nova"}
+        assert set(skripte[0]) == {"ts", "run", "type", "script", "ok", "total_s", "tts_s", "silence_s", "merge_s",
+                                   "encode_s", "assemble_s", "segments", "tts_calls", "chars", "output_bytes",
+                                   "audio_s"}
+        assert skripte[0]["ok"] and skripte[0]["segments"] == 3 and skripte[0]["tts_calls"] == 2
+        assert skripte[0]["chars"] == len("Eins.") + len("Zwei.")
+
+
+# --- Trockenlauf -------------------------------------------------------------------
+
+class TestTrockenlauf:
+    @pytest.fixture
+    def skripte(self, tmp_path, monkeypatch):
+        """Zwei fehlende Skripte mit einem gemeinsamen Satz, eines ohne #VOICE, eines schon generiert."""
+        monkeypatch.setattr(fa, "SKRIPTE_DIR", tmp_path)
+        monkeypatch.setattr(fa, "TTS_CACHE_DIR", tmp_path / "cache")
+        (tmp_path / "a.md").write_text("#VOICE nova\nEins zwei drei.\n#PAUSE 1\nVier fuenf.", encoding="utf-8")
+        (tmp_path / "b.md").write_text("#VOICE nova\nEins zwei drei.\n#PAUSE 2\nSechs sieben.", encoding="utf-8")
+        (tmp_path / "c.md").write_text("Ohne Stimme.", encoding="utf-8")
+        (tmp_path / "fertig.md").write_text("#VOICE nova\nSchon da.", encoding="utf-8")
+        assert asyncio.run(fa.convert_script_to_mp3(fa.OfflineBackend(latency=0), tmp_path / "fertig.md"))
+        return tmp_path
+
+    def test_plane_skripte(self, skripte):
+        plaene = {p.md_file.name: p for p in fa.plan_scripts(fa.get_md_files(), fa.AudioSettings(), "offline-tone")}
+
+        assert sorted(plaene) == ["a.md", "b.md", "c.md"]  # fertig.md ist laut Manifest aktuell
+        assert [z for _, z in plaene["a.md"].chunks] == [len("Eins zwei drei."), len("Vier fuenf.")]
+        assert plaene["a.md"].chunks[0][0] == plaene["b.md"].chunks[0][0]  # gleicher Satz, gleiche Stimme
+        assert {p.reason for p in plaene.values()} == {"fehlt"}
+        assert [p.random_voice for p in plaene.values()] == [False, False, True]
+
+        (skripte / "fertig.md").write_text("#VOICE nova\nSchon lange da.", encoding="utf-8")
+        plaene = fa.plan_scripts(fa.get_md_files(), fa.AudioSettings(), "offline-tone")
+        assert [(p.md_file.name, p.reason) for p in plaene if p.md_file.name == "fertig.md"] == [("fertig.md", "veraltet")]
+
+    def test_print_plan_zaehlt_aufrufe_und_kosten(self, skripte, capsys):
+        cache = fa.TTSCache(skripte / "cache")
+        cache.put(fa.TTSCache.key("offline-tone", "nova", "mp3", "Vier fuenf."), "mp3", b"audio")
+        args = fa.parse_args(["--trockenlauf", "--keine-metriken", "--kosten-pro-minute", "600"])
+
+        fa.print_plan(args, fa.AudioSettings(), "offline-tone")
+
+        ausgabe = capsys.readouterr().out
+        # a: Aufruf + Treffer, b: Duplikat + Aufruf, c: Aufruf (Zufallsstimme, nie im Cache)
+        api_zeichen = len("Eins zwei drei.") + len("Sechs sieben.") + len("Ohne Stimme.")
+        assert "Skripte zu generieren: 3 (3 fehlen, 0 veraltet)" in ausgabe
+        assert "TTS-Aufrufe:           3 (außerdem 1 Cache-Treffer, 1 Duplikate)" in ausgabe
+        assert f"Zu synthetisieren:     {api_zeichen:,} Zeichen" in ausgabe
+        kosten = api_zeichen / fa.SPEECH_CHARS_PER_SECOND / 60 * 600
+        assert f"Geschätzte Kosten:     ${kosten:,.2f} (600 $/Audio-Minute)" in ausgabe
+        assert "keine Messwerte" in ausgabe
+
+
+class TestSchaetzeLatenz:
+    @staticmethod
+    def schreibe(pfad, saetze) -> None:
+        pfad.write_text("".join(json.dumps(s) + "\n" for s in saetze), encoding="utf-8")
+
+    def test_regression_ueber_echte_api_aufrufe(self, tmp_path):
+        chunk = {"type": "chunk", "model": "m", "cache_hit": False, "retries": 0}
+        metriken = tmp_path / "metriken.jsonl"
+        self.schreibe(metriken, [
+            chunk | {"chars": 100, "latency_s": 1.5},
+            chunk | {"chars": 200, "latency_s": 2.5},
+            chunk | {"chars": 300, "latency_s": 3.5},
+            chunk | {"chars": 300, "latency_s": 0.0, "cache_hit": True},
+            chunk | {"chars": 300, "latency_s": 60.0, "retries": 2},
+            chunk | {"chars": 300, "latency_s": 9.0, "model": "anderes"},
+            {"type": "script", "model": "m", "chars": 600, "latency_s": 99.0},
+        ])
+        with open(metriken, "a", encoding="utf-8") as f:
+            f.write('{"type": "chunk", kaputt\n')
+
+        fix, je_zeichen, n = fa.estimate_latency(metriken, "m")
+
+        assert (fix, je_zeichen, n) == (pytest.approx(0.5), pytest.approx(0.01), 3)
+
+    def test_liest_nur_das_ende(self, tmp_path):
+        chunk = {"type": "chunk", "model": "m", "cache_hit": False, "retries": 0}
+        metriken = tmp_path / "metriken.jsonl"
+        self.schreibe(metriken, [chunk | {"chars": 100, "latency_s": 50.0}] * 50
+                      + [chunk | {"chars": 100, "latency_s": 1.0}, chunk | {"chars": 200, "latency_s": 2.0}])
+
+        fix, je_zeichen, n = fa.estimate_latency(metriken, "m", max_bytes=200)
+
+        assert n == 2 and fix == pytest.approx(0.0) and je_zeichen == pytest.approx(0.01)
+
+    def test_ohne_messwerte(self, tmp_path):
+        metriken = tmp_path / "metriken.jsonl"
+        assert fa.estimate_latency(None, "m") is None
+        assert fa.estimate_latency(metriken, "m") is None
+        self.schreibe(metriken, [{"type": "chunk", "model": "m", "chars": 100, "latency_s": 1.0}])
+        assert fa.estimate_latency(metriken, "m") is None  # ein Punkt ergibt keine Gerade
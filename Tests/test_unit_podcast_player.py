@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import datetime as dt
+import gzip
 import inspect
 import json
+import os
 import signal
+import threading
+import time
 from pathlib import Path
 
 import podcast_player as pp
@@ -70,6 +74,119 @@ class TestBauePlaylist:
             pp.baue_playlist([str(tmp_path)])
 
 
+class TestBauePlaylistSkalierung:
+    @staticmethod
+    def baum(wurzel, *namen):
+        for name in namen:
+            pfad = wurzel / name
+            pfad.parent.mkdir(parents=True, exist_ok=True)
+            pfad.touch()
+
+    def test_rekursiv_sortiert_nach_relativem_pfad(self, tmp_path):
+        self.baum(
+            tmp_path, "a.mp3", "Zeta.mp3", "Mitte/z.mp3", "Mitte/A.mp3",
+            "mitte2/tief/x.mp3", "mitte2/notiz.txt",
+        )
+
+        playlist = pp.baue_playlist([str(tmp_path)], rekursiv=True)
+
+        assert [p.relative_to(tmp_path).as_posix() for p in playlist] == [
+            "a.mp3", "Mitte/A.mp3", "Mitte/z.mp3", "mitte2/tief/x.mp3", "Zeta.mp3",
+        ]
+
+    def test_ohne_rekursion_bleiben_unterordner_aussen_vor(self, tmp_path):
+        self.baum(tmp_path, "a.mp3", "unter/b.mp3")
+
+        assert [p.name for p in pp.baue_playlist([str(tmp_path)])] == ["a.mp3"]
+
+    def test_parallele_scans_liefern_dieselbe_reihenfolge(self, tmp_path):
+        self.baum(tmp_path, *(f"s{n % 7}/t{n % 3}/f{n:03d}.mp3" for n in range(200)))
+
+        seriell = pp.baue_playlist([str(tmp_path)], rekursiv=True, scan_threads=1)
+        parallel = pp.baue_playlist([str(tmp_path)], rekursiv=True, scan_threads=8)
+
+        assert parallel == seriell
+        assert len(seriell) == 200
+
+    def test_symlink_auf_ordner_wird_nicht_verfolgt(self, tmp_path):
+        self.baum(tmp_path, "echt/a.mp3")
+        (tmp_path / "echt" / "schleife").symlink_to(tmp_path)
+
+        playlist = pp.baue_playlist([str(tmp_path)], rekursiv=True)
+
+        assert [p.name for p in playlist] == ["a.mp3"]
+
+    def test_kein_stat_je_ordnereintrag(self, tmp_path, monkeypatch):
+        self.baum(tmp_path, *(f"f{n:03d}.mp3" for n in range(100)), "notiz.txt")
+        stat_aufrufe = []
+        echtes_stat = os.stat
+
+        def zaehlendes_stat(*args, **kwargs):
+            stat_aufrufe.append(args[0])
+            return echtes_stat(*args, **kwargs)
+
+        monkeypatch.setattr(pp.os, "stat", zaehlendes_stat)
+
+        playlist = pp.baue_playlist([str(tmp_path)])
+
+        assert len(playlist) == 100
+        assert stat_aufrufe == [tmp_path]  # nur das Argument selbst
+
+    def test_ein_stat_je_glob_treffer_und_m3u_eintrag(self, tmp_path, monkeypatch):
+        self.baum(tmp_path, *(f"f{n:02d}.mp3" for n in range(20)), "notiz.txt", "ordner/x.mp3", "liste/b.mp3")
+        (tmp_path / "liste" / "abend.m3u").write_text("b.mp3\n../ordner\n../f00.mp3\n", encoding="utf-8")
+        stat_aufrufe = []
+        echtes_stat = os.stat
+
+        def zaehlendes_stat(*args, **kwargs):
+            stat_aufrufe.append(str(args[0]))
+            return echtes_stat(*args, **kwargs)
+
+        monkeypatch.setattr(pp.os, "stat", zaehlendes_stat)
+
+        playlist = pp.baue_playlist([str(tmp_path / "*"), str(tmp_path / "liste" / "abend.m3u")])
+
+        assert len(playlist) == 20 + 2 + 3  # Glob: Dateien, ordner/ und liste/; M3U: drei Eintraege
+        doppelt = {pfad for pfad in stat_aufrufe if stat_aufrufe.count(pfad) > 1}
+        assert doppelt == set()  # je Treffer und je Eintrag genau ein stat
+
+    def test_glob_muster_liefert_mp3s_und_ordner(self, tmp_path):
+        self.baum(tmp_path, "folge-2.mp3", "Folge-1.mp3", "folge-x.txt", "folgen/c.mp3")
+
+        playlist = pp.baue_playlist([str(tmp_path / "[Ff]olge*")])
+
+        assert [p.name for p in playlist] == ["Folge-1.mp3", "folge-2.mp3", "c.mp3"]
+
+    def test_glob_ohne_treffer_ist_playlistfehler(self, tmp_path):
+        with pytest.raises(pp.PlaylistFehler, match="Muster"):
+            pp.baue_playlist([str(tmp_path / "*.mp3")])
+
+    def test_m3u_mit_kommentaren_relativen_und_absoluten_eintraegen(self, tmp_path):
+        self.baum(tmp_path, "liste/b.mp3", "liste/ordner/x.mp3", "absolut ä.mp3")
+        (tmp_path / "liste" / "abend.m3u8").write_text(
+            "#EXTM3U\n#EXTINF:60,Folge B\nb.mp3\n\nordner\n"
+            f"{tmp_path / 'absolut ä.mp3'}\n"
+            f"file://{(tmp_path / 'liste' / 'b.mp3').as_posix().replace(' ', '%20')}\n",
+            encoding="utf-8",
+        )
+
+        playlist = pp.baue_playlist([str(tmp_path / "liste" / "abend.m3u8")])
+
+        assert [p.name for p in playlist] == ["b.mp3", "x.mp3", "absolut ä.mp3", "b.mp3"]
+
+    def test_m3u_mit_fehlendem_eintrag_ist_playlistfehler(self, tmp_path):
+        (tmp_path / "liste.m3u").write_text("gibtsnicht.mp3\n", encoding="utf-8")
+
+        with pytest.raises(pp.PlaylistFehler, match="nicht gefunden"):
+            pp.baue_playlist([str(tmp_path / "liste.m3u")])
+
+    def test_m3u_mit_url_ist_playlistfehler(self, tmp_path):
+        (tmp_path / "liste.m3u").write_text("https://example.org/a.mp3\n", encoding="utf-8")
+
+        with pytest.raises(pp.PlaylistFehler, match="URL"):
+            pp.baue_playlist([str(tmp_path / "liste.m3u")])
+
+
 # --- finde_player_backend -----------------------------------------------------
 
 class TestFindePlayerBackend:
@@ -95,6 +212,29 @@ class TestFindePlayerBackend:
         )
         assert backend.basis_befehl == ["/opt/fake-player"]
 
+    def test_gapless_nutzt_mpv_ueber_ipc(self):
+        backend = pp.finde_player_backend(
+            which=lambda name: f"/usr/bin/{name}", gapless=True
+        )
+        assert isinstance(backend, pp.MpvIpcBackend)
+        assert backend.basis_befehl == ["/usr/bin/mpv", *pp.MPV_IPC_OPTIONEN]
+        assert backend.socket_pfad is None  # kein Prozess, kein Socket vor dem ersten start
+
+    def test_gapless_mit_override_steuert_override_per_ipc(self):
+        backend = pp.finde_player_backend(
+            which=lambda name: None, override="/opt/fake-mpv", gapless=True
+        )
+        assert isinstance(backend, pp.MpvIpcBackend)
+        assert backend.basis_befehl[0] == "/opt/fake-mpv"
+
+    def test_gapless_ohne_mpv_faellt_auf_mplayer_zurueck(self):
+        backend = pp.finde_player_backend(
+            which=lambda name: f"/usr/bin/{name}" if name == "mplayer" else None,
+            gapless=True,
+        )
+        assert isinstance(backend, pp.CommandPlayerBackend)
+        assert backend.basis_befehl == ["/usr/bin/mplayer", "-really-quiet"]
+
 
 # --- EventLog -----------------------------------------------------------------
 
@@ -135,6 +275,316 @@ class TestEventLog:
         assert json.loads(zeilen[0]) == {"alt": True}
 
 
+class TestEventLogPufferUndRotation:
+    @staticmethod
+    def zeilen(pfad):
+        if not pfad.exists():
+            return []
+        return [json.loads(z)["datei"] for z in pfad.read_text(encoding="utf-8").splitlines()]
+
+    def test_flush_alle_n_ereignisse_und_beim_schliessen(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        log = pp.EventLog(pfad, flush_alle=3)
+
+        log.schreibe("start", "a.mp3")
+        log.schreibe("ende", "a.mp3")
+        assert self.zeilen(pfad) == []  # noch gepuffert
+        log.schreibe("start", "b.mp3")
+        assert self.zeilen(pfad) == ["a.mp3", "a.mp3", "b.mp3"]
+        log.schreibe("ende", "b.mp3")
+        log.schliesse()
+
+        assert self.zeilen(pfad) == ["a.mp3", "a.mp3", "b.mp3", "b.mp3"]
+
+    def test_abbruch_wird_sofort_geflusht(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        log = pp.EventLog(pfad, flush_alle=100)
+
+        log.schreibe("start", "a.mp3")
+        log.schreibe("abbruch", "a.mp3", detail="Signal 15")
+
+        assert self.zeilen(pfad) == ["a.mp3", "a.mp3"]
+        log.schliesse()
+
+    def test_rotation_nach_groesse(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        log = pp.EventLog(pfad, max_bytes=300)
+
+        for nummer in range(6):
+            log.schreibe("start", f"{nummer}.mp3")
+        log.schliesse()
+
+        rotiert = sorted(tmp_path.glob("log.jsonl.*"))
+        assert rotiert
+        alle = [d for p in [*rotiert, pfad] for d in self.zeilen(p)]
+        assert sorted(alle) == [f"{n}.mp3" for n in range(6)]
+        assert all(p.stat().st_size <= 300 for p in [*rotiert, pfad])
+
+    def test_taegliche_rotation_mit_kompression(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        tage = iter([8, 8, 9])
+        log = pp.EventLog(
+            pfad, uhr=lambda: dt.datetime(2026, 8, next(tage), tzinfo=dt.timezone.utc),
+            taeglich=True, komprimieren=True,
+        )
+
+        log.schreibe("start", "a.mp3")
+        log.schreibe("ende", "a.mp3")
+        log.schreibe("start", "b.mp3")
+        log.schliesse()
+
+        archiv = tmp_path / "log.jsonl.2026-08-08.gz"
+        with gzip.open(archiv, "rt", encoding="utf-8") as gz:
+            assert [json.loads(z)["ereignis"] for z in gz] == ["start", "ende"]
+        assert self.zeilen(pfad) == ["b.mp3"]
+
+    def test_behalte_begrenzt_rotierte_dateien(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        log = pp.EventLog(pfad, max_bytes=1, behalte=2)
+
+        for nummer in range(5):
+            log.schreibe("start", f"{nummer}.mp3")
+        log.schliesse()
+
+        assert len(list(tmp_path.glob("log.jsonl.*"))) == 2
+        assert self.zeilen(pfad) == ["4.mp3"]
+
+    def test_asynchron_verliert_nichts_und_haelt_reihenfolge(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        log = pp.EventLog(pfad, flush_alle=50, asynchron=True, queue_groesse=16)
+
+        for nummer in range(500):
+            log.schreibe("start", f"{nummer}.mp3")
+        log.schliesse()
+        log.schliesse()  # idempotent
+
+        assert self.zeilen(pfad) == [f"{n}.mp3" for n in range(500)]
+
+    def test_asynchron_flusht_nach_flush_alle(self, tmp_path, monkeypatch):
+        fsyncs = []
+        monkeypatch.setattr(pp.os, "fsync", fsyncs.append)
+        log = pp.EventLog(tmp_path / "log.jsonl", flush_alle=4, asynchron=True)
+
+        for nummer in range(10):
+            log.schreibe("start", f"{nummer}.mp3")
+        log._queue.join()
+        assert len(fsyncs) == 2  # nach dem 4. und 8. Ereignis
+        log.schreibe("abbruch", "9.mp3")
+        log._queue.join()
+        assert len(fsyncs) == 3
+        log.schliesse()
+
+        assert len(fsyncs) == 3  # nichts mehr offen
+        assert len(self.zeilen(tmp_path / "log.jsonl")) == 11
+
+    def test_asynchron_wartet_nicht_auf_die_platte(self, tmp_path, monkeypatch):
+        langsam = threading.Event()
+        monkeypatch.setattr(pp.os, "fsync", lambda _fd: langsam.wait(5))
+        log = pp.EventLog(tmp_path / "log.jsonl", asynchron=True)
+
+        beginn = time.monotonic()
+        for nummer in range(5):
+            log.schreibe("start", f"{nummer}.mp3")
+        dauer = time.monotonic() - beginn
+
+        langsam.set()
+        log.schliesse()
+        assert dauer < 1.0
+        assert len(self.zeilen(tmp_path / "log.jsonl")) == 5
+
+    def test_asynchron_schreibt_nach_fehler_weiter(self, tmp_path, monkeypatch, capsys):
+        log = pp.EventLog(tmp_path / "log.jsonl", asynchron=True)
+        echtes_verarbeite = log._verarbeite
+
+        def verarbeite(eintrag, zeit):
+            if eintrag["datei"] == "kaputt.mp3":
+                raise ValueError("nicht serialisierbar")
+            echtes_verarbeite(eintrag, zeit)
+
+        monkeypatch.setattr(log, "_verarbeite", verarbeite)
+        for datei in ("a.mp3", "kaputt.mp3", "kaputt.mp3", "b.mp3"):
+            log.schreibe("start", datei)
+        log.schliesse()
+
+        assert self.zeilen(tmp_path / "log.jsonl") == ["a.mp3", "b.mp3"]
+        assert capsys.readouterr().err.count("nicht serialisierbar") == 1  # einmal gewarnt
+
+    def test_schliesse_wartet_nicht_auf_toten_thread(self, tmp_path):
+        log = pp.EventLog(tmp_path / "log.jsonl", asynchron=True, queue_groesse=1)
+        log._queue.put(None)  # Schreib-Thread beendet sich
+        log._thread.join(5)
+        log._queue.put(("voll", None))  # ein weiteres put() wuerde blockieren
+
+        fertig = threading.Thread(target=log.schliesse, daemon=True)
+        fertig.start()
+        fertig.join(5)
+
+        assert not fertig.is_alive()
+
+
+# --- LogStatistik -------------------------------------------------------------
+
+def log_zeile(tag: int, stunde: int, ereignis: str, datei: str, dauer_s=None) -> str:
+    zeit = dt.datetime(2026, 8, tag, stunde, tzinfo=dt.timezone.utc).isoformat()
+    return json.dumps({
+        "zeit": zeit, "ereignis": ereignis, "datei": datei,
+        "dauer_s": dauer_s, "detail": None,
+    }) + "\n"
+
+
+def haenge_an(pfad, *zeilen):
+    with pfad.open("a", encoding="utf-8") as datei:
+        datei.writelines(zeilen)
+
+
+class TestLogStatistik:
+    def test_aggregate_je_datei_und_woche(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        haenge_an(
+            pfad,
+            log_zeile(3, 6, "start", "a.mp3"), log_zeile(3, 7, "ende", "a.mp3", 600.0),
+            log_zeile(10, 6, "start", "a.mp3"), log_zeile(10, 6, "abbruch", "a.mp3", 60.0),
+            log_zeile(10, 7, "start", "b.mp3"), log_zeile(10, 7, "fehler", "b.mp3", 0.0),
+        )
+        statistik = pp.LogStatistik(pfad)
+
+        assert statistik.aktualisiere() == 6
+
+        assert statistik.pro_datei()["a.mp3"] == {
+            "start": 2, "ende": 1, "abbruch": 1, "hoerzeit_s": 660.0,
+        }
+        assert statistik.pro_datei()["b.mp3"] == {"start": 1, "fehler": 1}
+        wochen = statistik.pro_woche()
+        assert wochen["2026-W32"]["hoerzeit_s"] == 600.0
+        assert wochen["2026-W33"]["hoerzeit_s"] == 60.0
+
+    def test_checkpoint_liest_nur_neue_zeilen(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        haenge_an(pfad, log_zeile(3, 6, "ende", "a.mp3", 10.0))
+        erste = pp.LogStatistik(pfad)
+        erste.aktualisiere()
+        erste.speichere()
+
+        haenge_an(pfad, log_zeile(3, 7, "ende", "a.mp3", 5.0))
+        zweite = pp.LogStatistik(pfad)
+
+        assert zweite.aktualisiere() == 1
+        assert zweite.pro_datei()["a.mp3"] == {"ende": 2, "hoerzeit_s": 15.0}
+        assert (tmp_path / "log.stats.json").exists()
+
+    def test_unvollstaendige_letzte_zeile_wartet(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        zeile = log_zeile(3, 6, "ende", "a.mp3", 10.0)
+        haenge_an(pfad, zeile[:20])
+        statistik = pp.LogStatistik(pfad)
+
+        assert statistik.aktualisiere() == 0
+        haenge_an(pfad, zeile[20:])
+        assert statistik.aktualisiere() == 1
+        assert statistik.zustand["ungueltig"] == 0
+
+    def test_rotation_behaelt_aggregate(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        haenge_an(pfad, log_zeile(3, 6, "ende", "a.mp3", 10.0))
+        statistik = pp.LogStatistik(pfad)
+        statistik.aktualisiere()
+
+        pfad.rename(tmp_path / "log.jsonl.2026-08-03")
+        haenge_an(pfad, log_zeile(4, 6, "ende", "a.mp3", 20.0))
+
+        assert statistik.aktualisiere() == 1
+        assert statistik.pro_datei()["a.mp3"] == {"ende": 2, "hoerzeit_s": 30.0}
+
+    @pytest.mark.parametrize("komprimieren", [False, True])
+    def test_rotation_holt_rest_des_archivs_nach(self, tmp_path, komprimieren):
+        pfad = tmp_path / "log.jsonl"
+        tage = iter([8, 8, 9])
+        log = pp.EventLog(
+            pfad, uhr=lambda: dt.datetime(2026, 8, next(tage), 6, tzinfo=dt.timezone.utc),
+            taeglich=True, komprimieren=komprimieren,
+        )
+        statistik = pp.LogStatistik(pfad)
+        log.schreibe("ende", "a.mp3", dauer_s=10.0)
+        assert statistik.aktualisiere() == 1
+        statistik.speichere()
+
+        log.schreibe("ende", "a.mp3", dauer_s=10.0)  # nach dem Checkpoint, vor der Rotation
+        log.schreibe("ende", "a.mp3", dauer_s=10.0)  # neuer Tag: rotiert
+        log.schliesse()
+        statistik = pp.LogStatistik(pfad)
+
+        assert statistik.aktualisiere() == 2
+        assert statistik.pro_datei()["a.mp3"] == {"ende": 3, "hoerzeit_s": 30.0}
+        assert statistik.zustand["offset"] == pfad.stat().st_size
+        assert statistik.zeitraum_unvollstaendig(None)
+        beginn = dt.datetime(2026, 8, 9, tzinfo=dt.timezone.utc).timestamp()
+        assert not statistik.zeitraum_unvollstaendig(beginn)
+
+    def test_gekuerztes_log_wird_neu_aufgebaut(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        erste = log_zeile(3, 6, "ende", "a.mp3", 10.0)
+        haenge_an(pfad, erste, log_zeile(3, 7, "ende", "b.mp3", 10.0))
+        statistik = pp.LogStatistik(pfad)
+        statistik.aktualisiere()
+
+        pfad.write_text(erste, encoding="utf-8")
+        statistik.aktualisiere()
+
+        assert set(statistik.pro_datei()) == {"a.mp3"}
+
+    def test_ungueltige_zeilen_werden_gezaehlt_und_uebersprungen(self, tmp_path):
+        pfad = tmp_path / "log.jsonl"
+        haenge_an(pfad, '{"alt": true}\n', "kaputt\n", log_zeile(3, 6, "start", "a.mp3"))
+        statistik = pp.LogStatistik(pfad)
+
+        statistik.aktualisiere()
+
+        assert statistik.zustand["ungueltig"] == 2
+        assert statistik.zustand["ereignisse"] == 1
+
+    def test_zeitraum_per_index_gleich_vollem_scan(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pp.LogStatistik, "BLOCK_ZEILEN", 4)
+        pfad = tmp_path / "log.jsonl"
+        zeilen = [
+            log_zeile(tag, stunde, "ende", f"{tag % 3}.mp3", 1.0)
+            for tag in range(1, 29) for stunde in (6, 18)
+        ]
+        zeilen[30] = log_zeile(2, 0, "ende", "zurueckgestellt.mp3", 1.0)  # Uhr sprang zurueck
+        haenge_an(pfad, *zeilen)
+        statistik = pp.LogStatistik(pfad)
+        statistik.aktualisiere()
+        von = dt.datetime(2026, 8, 2, tzinfo=dt.timezone.utc).timestamp()
+        bis = dt.datetime(2026, 8, 5, 23, tzinfo=dt.timezone.utc).timestamp()
+
+        erwartet: dict = {}
+        for zeile in zeilen:
+            eintrag = json.loads(zeile)
+            if von <= dt.datetime.fromisoformat(eintrag["zeit"]).timestamp() <= bis:
+                pp._buche(erwartet.setdefault(eintrag["datei"], {}), "ende", 1.0)
+
+        assert statistik.pro_datei(von, bis) == erwartet
+        assert "zurueckgestellt.mp3" in erwartet
+        anfang, ende = statistik._bereich(von, bis)
+        assert ende - anfang < pfad.stat().st_size  # nicht das ganze Log gelesen
+
+    def test_stats_unterbefehl_gibt_json_aus(self, tmp_path, capsys):
+        pfad = tmp_path / "log.jsonl"
+        haenge_an(
+            pfad, log_zeile(3, 6, "ende", "Folge-A.mp3", 30.0),
+            log_zeile(4, 6, "ende", "folge-b.mp3", 60.0),
+        )
+
+        exit_code = pp.main([
+            "stats", "--log-datei", str(pfad), "--json",
+            "--von", "2026-08-04", "--datei", "FOLGE",
+        ])
+
+        assert exit_code == 0
+        ausgabe = json.loads(capsys.readouterr().out)
+        assert ausgabe["dateien"] == {"folge-b.mp3": {"ende": 1, "hoerzeit_s": 60.0}}
+        assert ausgabe["neu"] == 2
+
+
 # --- parse_argumente ----------------------------------------------------------
 
 class TestParseArgumente:
@@ -143,6 +593,7 @@ class TestParseArgumente:
         assert argumente.eingaben == ["a.mp3"]
         assert argumente.backend is None
         assert argumente.log_datei is None
+        assert argumente.gapless is False
 
     def test_level_wird_als_unbekanntes_argument_abgewiesen(self):
         with pytest.raises(SystemExit) as abbruch:
@@ -200,6 +651,15 @@ class TestPodcastPlayer:
             ("start", "c.mp3"), ("ende", "c.mp3"),
         ]
 
+    def test_merkt_jeweils_die_naechste_datei_vor(self, tmp_path):
+        playlist = [Path("a.mp3"), Path("b.mp3"), Path("c.mp3")]
+        backend = FakePlayerBackend()
+        player, _log = baue_player(tmp_path, playlist, backend)
+
+        player.run()
+
+        assert backend.vorgemerkte_dateien == [Path("b.mp3"), Path("c.mp3")]
+
     def test_fehlerhafte_datei_setzt_playlist_fort_und_exit_1(self, tmp_path):
         playlist = [Path("a.mp3"), Path("kaputt.mp3"), Path("c.mp3")]
         backend = FakePlayerBackend(exit_codes={"kaputt.mp3": 2})